@@ -0,0 +1,235 @@
+"""
+Hot reload of the processed datasets without restarting workers.
+
+A reload builds a complete new ``ClimateDataset`` and prebuilds its response
+caches in a background thread while requests keep being served from the current
+one. Only then is the active reference swapped, so there is neither downtime nor
+a cold-cache period after a data refresh.
+
+Reloads are triggered either by ``POST /api/admin/reload`` or by a watcher that
+polls the fingerprint of ``CLIMATE_PROCESSED_DIR``. The watcher waits until the
+fingerprint has been stable for two polls, so it does not pick up files that an
+import is still writing.
+
+Every worker process holds its own dataset. The admin endpoint reloads the
+worker that received it and writes a reload request file; the watchers of the
+other workers see the new request on their next poll and reload as well. Without
+the watcher only the receiving worker reloads (gunicorn.conf.py enables it).
+
+Configuration (environment variables):
+    CLIMATE_DATA_WATCH_INTERVAL  seconds between fingerprint polls (0 disables; default 0)
+    CLIMATE_RELOAD_REQUEST_PATH  reload request file (default: <processed dir>/.reload_request)
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from app.services.real_climate import (
+    activate_dataset,
+    build_dataset,
+    compute_dataset_version,
+    get_dataset_version,
+    get_processed_dir,
+    use_dataset,
+)
+from app.services.response_cache import discard_stale_entries
+from app.services.vector_tiles import discard_stale_tiles
+from app.warmup import prebuild_responses
+
+_reload_lock = threading.Lock()
+_status_lock = threading.Lock()
+_status: dict[str, Any] = {"state": "idle", "last_reload": None, "last_error": None}
+_watcher_stop = threading.Event()
+_watcher_thread: threading.Thread | None = None
+# Id of the last reload request this process has acted on.
+_seen_request_id: str | None = None
+
+RELOAD_REQUEST_NAME = ".reload_request"
+
+
+def get_watch_interval() -> float:
+    configured = os.getenv("CLIMATE_DATA_WATCH_INTERVAL")
+    if configured:
+        try:
+            return max(float(configured), 0.0)
+        except ValueError:
+            pass
+    return 0.0
+
+
+def get_reload_request_path() -> Path:
+    configured = os.getenv("CLIMATE_RELOAD_REQUEST_PATH")
+    if configured:
+        return Path(configured)
+    return get_processed_dir() / RELOAD_REQUEST_NAME
+
+
+def is_watcher_running() -> bool:
+    return _watcher_thread is not None and _watcher_thread.is_alive()
+
+
+def get_reload_status() -> dict[str, Any]:
+    with _status_lock:
+        status = dict(_status)
+    status["active_version"] = get_dataset_version()
+    status["watch_interval"] = get_watch_interval()
+    status["watcher_running"] = is_watcher_running()
+    return status
+
+
+def _read_reload_request() -> dict[str, Any] | None:
+    try:
+        request = json.loads(get_reload_request_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return request if isinstance(request, dict) else None
+
+
+def _write_reload_request(request_id: str, force: bool) -> None:
+    """Publish a reload request for the other workers' watchers."""
+    path = get_reload_request_path()
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(json.dumps({"id": request_id, "force": force, "at": time.time()}), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def _update_status(**changes: Any) -> None:
+    with _status_lock:
+        _status.update(changes)
+
+
+def _fingerprint(version: str) -> str:
+    """The file fingerprint part of a dataset version (without a forced-reload suffix)."""
+    return version.split("+", 1)[0]
+
+
+def reload_datasets(force: bool = False) -> bool:
+    """
+    Build and activate a new dataset if the processed files changed (or ``force``).
+    Returns True when a new dataset was activated.
+    """
+    with _reload_lock:
+        return _reload(force)
+
+
+def _reload(force: bool) -> bool:
+    """Body of ``reload_datasets``; the caller holds ``_reload_lock``."""
+    version = compute_dataset_version()
+    previous_version = get_dataset_version()
+    if version == _fingerprint(previous_version):
+        if not force:
+            return False
+        # Same files: a new suffix keeps responses and tiles cached under the old
+        # version from being reused (e.g. after changing a file outside the fingerprint).
+        version = f"{version}+{uuid.uuid4().hex[:8]}"
+
+    _update_status(state="building")
+    started = time.perf_counter()
+    try:
+        dataset = build_dataset(version)
+        with use_dataset(dataset):
+            responses = prebuild_responses()
+    except Exception as exc:
+        # Keep serving the current dataset; a broken refresh must not take the API down.
+        _update_status(state="idle", last_error={"at": time.time(), "version": version, "error": repr(exc)})
+        return False
+
+    activate_dataset(dataset)
+    discard_stale_entries(dataset.version)
+    discard_stale_tiles(dataset.version)
+    _update_status(
+        state="idle",
+        last_error=None,
+        last_reload={
+            "at": time.time(),
+            "previous_version": previous_version,
+            "version": dataset.version,
+            "seconds": round(time.perf_counter() - started, 3),
+            "prebuilt_responses": responses,
+        },
+    )
+    return True
+
+
+def trigger_reload(force: bool = False) -> bool:
+    """
+    Start a reload in a background thread and ask the other workers to reload too.
+    Returns False if a reload is already running in this worker.
+    """
+    global _seen_request_id
+    # Taken here and released by the thread, so concurrent calls cannot both start one.
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    # Marked as seen before publishing, so this worker's own watcher never acts on it.
+    request_id = uuid.uuid4().hex
+    _seen_request_id = request_id
+    try:
+        _write_reload_request(request_id, force)
+    except OSError as exc:
+        # Still reload this worker; the status shows why the others were not asked.
+        _update_status(last_error={"at": time.time(), "version": None, "error": f"reload request not written: {exc!r}"})
+
+    def run() -> None:
+        try:
+            _reload(force)
+        finally:
+            _reload_lock.release()
+
+    try:
+        threading.Thread(target=run, name="dataset-reload", daemon=True).start()
+    except BaseException:
+        _reload_lock.release()
+        raise
+    return True
+
+
+def _watch(interval: float) -> None:
+    global _seen_request_id
+    candidate: str | None = None
+    while not _watcher_stop.wait(interval):
+        request = _read_reload_request()
+        if request is not None and request.get("id") != _seen_request_id:
+            # Another worker received POST /api/admin/reload.
+            _seen_request_id = request.get("id")
+            reload_datasets(force=bool(request.get("force")))
+            candidate = None
+            continue
+
+        try:
+            version = compute_dataset_version()
+        except OSError:
+            continue
+        if version == _fingerprint(get_dataset_version()):
+            candidate = None
+        elif version != candidate:
+            # Changed since the last poll; wait for the files to settle.
+            candidate = version
+        else:
+            with _status_lock:
+                last_error = _status["last_error"]
+            # Do not rebuild a version that already failed; wait for the files to change again.
+            if last_error is None or last_error["version"] != version:
+                reload_datasets()
+            candidate = None
+
+
+def start_dataset_watcher() -> None:
+    global _watcher_thread, _seen_request_id
+    interval = get_watch_interval()
+    if not interval or is_watcher_running():
+        return
+    # Requests made before this worker started are already reflected in the data it loaded.
+    _seen_request_id = (_read_reload_request() or {}).get("id")
+    _watcher_stop.clear()
+    _watcher_thread = threading.Thread(target=_watch, args=(interval,), name="dataset-watcher", daemon=True)
+    _watcher_thread.start()
+
+
+def stop_dataset_watcher() -> None:
+    _watcher_stop.set()
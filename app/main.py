@@ -7,23 +7,25 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.gzip import GZipMiddleware
 
-from app.routers import climate, districts
-from app.services.real_climate import (
-    load_districts_geojson,
-    load_period_values,
-    _period_values_index,
-)
+from app.dataset_manager import start_dataset_watcher, stop_dataset_watcher
+from app.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.routers import admin, climate, districts, tiles
+from app.services.metrics import render_prometheus
+from app.warmup import get_warmup_state, is_ready, start_warmup
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Preload data at startup so first requests are fast
-    load_period_values()
-    _period_values_index()  # pre-build the lookup index
-    load_districts_geojson()
+    # Preload data, timeseries files and response caches so first requests are fast.
+    # With WARMUP_MODE=background this returns immediately and /api/ready gates traffic.
+    start_warmup()
+    # Picks up re-imported data without a restart when CLIMATE_DATA_WATCH_INTERVAL is set.
+    start_dataset_watcher()
     yield
+    stop_dataset_watcher()
 
 
 app = FastAPI(
@@ -61,6 +63,9 @@ def _parse_cors_origins() -> list[str]:
     return parsed_origins or default_cors_origins
 
 
+# Large cached payloads (GeoJSON, climate responses) are served precompressed by
+# app.services.response_cache with a Content-Encoding already set, which this
+# middleware passes through; it only compresses the remaining dynamic responses.
 app.add_middleware(GZipMiddleware, minimum_size=500)
 
 cors_origins = _parse_cors_origins()
@@ -72,9 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing breakdown of service calls and sampled profiles of slow requests.
+app.add_middleware(ProfilingMiddleware)
+
+# Added last so it wraps everything else and sees total latency and on-the-wire sizes.
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(districts.router, prefix="/api/districts", tags=["districts"])
 app.include_router(climate.router, prefix="/api/climate", tags=["climate"])
+app.include_router(tiles.router, prefix="/api/tiles", tags=["tiles"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -89,3 +102,13 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    return JSONResponse(get_warmup_state(), status_code=200 if is_ready() else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
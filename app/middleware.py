@@ -0,0 +1,142 @@
+"""
+ASGI middleware for request instrumentation
+"""
+from __future__ import annotations
+
+import cProfile
+import random
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import record_request
+from app.services.profiling import (
+    debug_headers_enabled,
+    format_server_timing,
+    get_profile_dir,
+    get_sample_rate,
+    get_threshold_ms,
+    save_profile,
+    start_request_timings,
+    stop_request_timings,
+    top_functions,
+)
+
+
+class MetricsMiddleware:
+    """Record per-route latency, response size and status for every HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; use its path template
+            # (e.g. /api/climate/{variable}) so label cardinality stays bounded.
+            route = scope.get("route")
+            record_request(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status,
+                time.perf_counter() - started,
+                size,
+            )
+
+
+class ProfilingMiddleware:
+    """
+    Time service calls per request and capture sampled profiles of slow requests.
+
+    Outside production every response carries a ``Server-Timing`` header with the
+    time spent in each ``@timed`` service function. A sampled fraction of requests
+    runs under cProfile; if such a request exceeds ``PROFILE_THRESHOLD_MS`` its
+    profile is written to ``PROFILE_DIR`` and/or summarised in the header.
+
+    cProfile traces the whole event-loop thread, so only one request is profiled
+    at a time and work interleaved from concurrent requests can appear in it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._profiler_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        send_headers = debug_headers_enabled()
+        threshold_ms = get_threshold_ms()
+        profile_dir = get_profile_dir()
+        if scope["type"] != "http" or not (send_headers or threshold_ms):
+            await self.app(scope, receive, send)
+            return
+
+        profiler: cProfile.Profile | None = None
+        if (
+            threshold_ms
+            and (profile_dir is not None or send_headers)
+            and random.random() < get_sample_rate()
+            and self._profiler_lock.acquire(blocking=False)
+        ):
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        timings, token = start_request_timings()
+        started = time.perf_counter()
+        profile_result: tuple[str | None, list[tuple[str, float]]] = (None, [])
+
+        def finish_profile(elapsed: float) -> None:
+            nonlocal profiler, profile_result
+            if profiler is None:
+                return
+            active, profiler = profiler, None
+            active.disable()
+            self._profiler_lock.release()
+            if elapsed * 1000 < threshold_ms:
+                return
+            profile_id = None
+            if profile_dir is not None:
+                profile_id = save_profile(
+                    active,
+                    profile_dir,
+                    method=scope["method"],
+                    path=scope["path"],
+                    elapsed_seconds=elapsed,
+                    timings=timings,
+                )
+            profile_result = (profile_id, top_functions(active) if send_headers else [])
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                finish_profile(elapsed)
+                if send_headers:
+                    profile_id, hotspots = profile_result
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", format_server_timing(timings, elapsed, hotspots))
+                    if profile_id:
+                        headers.append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish_profile(time.perf_counter() - started)
+            stop_request_timings(token)
@@ -0,0 +1,35 @@
+"""
+Fork-friendly data preload for gunicorn ``--preload`` deployments.
+
+Loading the processed data inside the ASGI lifespan gives every worker its own
+private copy. Instead, the gunicorn master runs the warm-up once before forking
+and moves the resulting objects into the permanent GC generation, so workers
+share those memory pages copy-on-write.
+
+The recipe follows the ``gc.freeze`` documentation: disable collection early in
+the master (avoids leaving freed holes in pages that will be shared), freeze
+right before forking, and re-enable collection in each worker.
+"""
+from __future__ import annotations
+
+import gc
+
+from app.warmup import get_warmup_mode, run_warmup
+
+
+def prepare_master() -> None:
+    """Call as early as possible in the master, before the application is imported."""
+    gc.disable()
+
+
+def preload_shared_data() -> None:
+    """Warm every cache in the master and freeze it for copy-on-write sharing."""
+    if get_warmup_mode() != "off":
+        # Always synchronous here: threads do not survive fork().
+        run_warmup()
+    gc.freeze()
+
+
+def prepare_worker() -> None:
+    """Call in each worker right after fork."""
+    gc.enable()
@@ -0,0 +1,59 @@
+"""
+Admin API endpoints
+Operational endpoints guarded by the ADMIN_TOKEN environment variable
+"""
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.dataset_manager import get_reload_status, is_watcher_running, trigger_reload
+from app.services.memory import memory_report
+
+router = APIRouter()
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Reject the request unless X-Admin-Token matches ADMIN_TOKEN. The API is disabled when it is unset."""
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/dataset", dependencies=[Depends(require_admin_token)])
+async def get_dataset_status():
+    """
+    Get the active dataset version and the outcome of the last reload.
+    """
+    return get_reload_status()
+
+
+@router.get("/memory", dependencies=[Depends(require_admin_token)])
+def get_memory_usage():
+    """
+    Get the approximate retained size of each loaded dataset structure and cache, and the process RSS.
+    """
+    # Sync handler: walking the loaded data takes a while, so it runs in the threadpool.
+    return memory_report()
+
+
+@router.post("/reload", status_code=202, dependencies=[Depends(require_admin_token)])
+async def reload_dataset(
+    force: bool = Query(False, description="Rebuild even if the processed files are unchanged"),
+):
+    """
+    Rebuild the processed datasets in the background and swap them in once ready.
+    Other workers pick the request up through their dataset watcher.
+    """
+    if not trigger_reload(force=force):
+        return JSONResponse({"started": False, **get_reload_status()}, status_code=409)
+    response = {"started": True, **get_reload_status()}
+    if not is_watcher_running():
+        response["warning"] = (
+            "CLIMATE_DATA_WATCH_INTERVAL is 0, so only the worker that handled this request reloads."
+        )
+    return response
@@ -4,7 +4,7 @@ Serves climate projection data for Ghana districts
 """
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from app.models.schemas import (
     ClimateVariable,
@@ -28,7 +28,9 @@ from app.services.real_climate import (
     get_supported_variables,
     has_real_climate_data,
     normalize_percentile,
+    VALID_PERCENTILES,
 )
+from app.services.response_cache import cached_response, get_cached_payload
 
 router = APIRouter()
 
@@ -76,24 +78,13 @@ async def get_climate_variable(variable_id: str):
     raise HTTPException(status_code=404, detail=f"Variable {variable_id} not found")
 
 
-@router.get("/{variable}", response_model=ClimateResponse)
-async def get_climate_data(
+def _validate_climate_query(
     variable: str,
-    response: Response,
-    period: str = Query(
-        "baseline",
-        description="Time period: baseline, 2030 (2021-2040), 2050 (2041-2060), or 2080 (2081-2100)",
-    ),
-    scenario: str = Query("rcp45", description="Emission scenario: historical, rcp26, rcp45, or rcp85"),
-    percentile: str = Query("p50", description="Ensemble percentile: p10, p50, or p90"),
-):
-    """
-    Get climate values for all districts for a specific variable, period, and scenario.
-
-    - **variable**: Climate variable ID (e.g., annual_max_temp, annual_precipitation)
-    - **period**: Time period (baseline, 2030/2021-2040, 2050/2041-2060, 2080/2081-2100)
-    - **scenario**: Emission scenario (historical, rcp26, rcp45, rcp85)
-    """
+    period: str,
+    scenario: str,
+    percentile: str,
+) -> tuple[dict, str, str]:
+    """Validate a climate data query and return (variable info, effective scenario, percentile)."""
     # Validate variable
     var_info = _resolve_variable(variable)
     if not var_info:
@@ -118,12 +109,21 @@ async def get_climate_data(
         )
 
     normalized_percentile = normalize_percentile(percentile)
-    response.headers["Cache-Control"] = "public, max-age=3600"
 
     # Handle baseline period
     if period == "baseline":
         scenario = "historical"
 
+    return var_info, scenario, normalized_percentile
+
+
+def _build_climate_data(
+    variable: str,
+    var_info: dict,
+    period: str,
+    scenario: str,
+    normalized_percentile: str,
+) -> ClimateResponse:
     real_response = build_real_climate_response(variable, period, scenario, normalized_percentile)
     if real_response is not None:
         return real_response
@@ -190,22 +190,35 @@ async def get_climate_data(
     )
 
 
-@router.get("/{variable}/compare", response_model=ClimateComparisonResponse)
-async def compare_climate_data(
+@router.get("/{variable}", response_model=ClimateResponse)
+async def get_climate_data(
     variable: str,
-    response: Response,
-    period: str = Query("2050", description="Future time period to compare against baseline"),
-    scenario: str = Query("rcp45", description="Emission scenario: rcp26, rcp45, or rcp85"),
+    request: Request,
+    period: str = Query(
+        "baseline",
+        description="Time period: baseline, 2030 (2021-2040), 2050 (2041-2060), or 2080 (2081-2100)",
+    ),
+    scenario: str = Query("rcp45", description="Emission scenario: historical, rcp26, rcp45, or rcp85"),
     percentile: str = Query("p50", description="Ensemble percentile: p10, p50, or p90"),
 ):
     """
-    Compare baseline climate values with future projections.
-    Returns change amounts and percentages for each district.
+    Get climate values for all districts for a specific variable, period, and scenario.
 
-    - **variable**: Climate variable ID
-    - **period**: Future time period (2030/2021-2040, 2050/2041-2060, 2080/2081-2100)
-    - **scenario**: Emission scenario (rcp26, rcp45, rcp85)
+    - **variable**: Climate variable ID (e.g., annual_max_temp, annual_precipitation)
+    - **period**: Time period (baseline, 2030/2021-2040, 2050/2041-2060, 2080/2081-2100)
+    - **scenario**: Emission scenario (historical, rcp26, rcp45, rcp85)
     """
+    var_info, scenario, normalized_percentile = _validate_climate_query(variable, period, scenario, percentile)
+    return cached_response(
+        request,
+        ("climate", variable, period, scenario, normalized_percentile),
+        lambda: _build_climate_data(variable, var_info, period, scenario, normalized_percentile),
+        ClimateResponse,
+    )
+
+
+def _validate_comparison_query(variable: str, period: str, scenario: str, percentile: str) -> tuple[dict, str]:
+    """Validate a comparison query and return (variable info, normalized percentile)."""
     # Validate variable
     var_info = _resolve_variable(variable)
     if not var_info:
@@ -231,9 +244,16 @@ async def compare_climate_data(
             detail=f"Invalid scenario '{scenario}'. Valid scenarios: {valid_comparison_scenarios}"
         )
 
-    normalized_percentile = normalize_percentile(percentile)
-    response.headers["Cache-Control"] = "public, max-age=3600"
+    return var_info, normalize_percentile(percentile)
+
 
+def _build_climate_comparison(
+    variable: str,
+    var_info: dict,
+    period: str,
+    scenario: str,
+    normalized_percentile: str,
+) -> ClimateComparisonResponse:
     real_response = build_real_climate_comparison(variable, period, scenario, normalized_percentile)
     if real_response is not None:
         return real_response
@@ -319,10 +339,49 @@ async def compare_climate_data(
     )
 
 
+@router.get("/{variable}/compare", response_model=ClimateComparisonResponse)
+async def compare_climate_data(
+    variable: str,
+    request: Request,
+    period: str = Query("2050", description="Future time period to compare against baseline"),
+    scenario: str = Query("rcp45", description="Emission scenario: rcp26, rcp45, or rcp85"),
+    percentile: str = Query("p50", description="Ensemble percentile: p10, p50, or p90"),
+):
+    """
+    Compare baseline climate values with future projections.
+    Returns change amounts and percentages for each district.
+
+    - **variable**: Climate variable ID
+    - **period**: Future time period (2030/2021-2040, 2050/2041-2060, 2080/2081-2100)
+    - **scenario**: Emission scenario (rcp26, rcp45, rcp85)
+    """
+    var_info, normalized_percentile = _validate_comparison_query(variable, period, scenario, percentile)
+    return cached_response(
+        request,
+        ("compare", variable, period, scenario, normalized_percentile),
+        lambda: _build_climate_comparison(variable, var_info, period, scenario, normalized_percentile),
+        ClimateComparisonResponse,
+    )
+
+
+def _build_climate_timeseries(variable: str, district_id: str, scenario: str) -> ClimateTimeSeriesResponse:
+    real_response = build_real_climate_timeseries(variable, district_id, scenario)
+    if real_response is not None:
+        return real_response
+
+    raise HTTPException(
+        status_code=404,
+        detail=(
+            f"Yearly climate time series is unavailable for variable='{variable}', "
+            f"district_id='{district_id}', scenario='{scenario}'."
+        ),
+    )
+
+
 @router.get("/{variable}/timeseries", response_model=ClimateTimeSeriesResponse)
 async def get_climate_timeseries(
     variable: str,
-    response: Response,
+    request: Request,
     district_id: str = Query(..., description="District ID"),
     scenario: str = Query("rcp45", description="Scenario for future years"),
 ):
@@ -338,18 +397,11 @@ async def get_climate_timeseries(
             detail=f"Invalid scenario '{scenario}'. Valid scenarios: {valid_scenarios}"
         )
 
-    response.headers["Cache-Control"] = "public, max-age=3600"
-
-    real_response = build_real_climate_timeseries(variable, district_id, scenario)
-    if real_response is not None:
-        return real_response
-
-    raise HTTPException(
-        status_code=404,
-        detail=(
-            f"Yearly climate time series is unavailable for variable='{variable}', "
-            f"district_id='{district_id}', scenario='{scenario}'."
-        ),
+    return cached_response(
+        request,
+        ("timeseries", variable, district_id, scenario),
+        lambda: _build_climate_timeseries(variable, district_id, scenario),
+        ClimateTimeSeriesResponse,
     )
 
 
@@ -367,7 +419,10 @@ async def get_variable_range(
     """
     response.headers["Cache-Control"] = "public, max-age=3600"
     # Get the full climate data
-    climate_response = await get_climate_data(variable, response, period, scenario, percentile)
+    var_info, effective_scenario, normalized_percentile = _validate_climate_query(
+        variable, period, scenario, percentile
+    )
+    climate_response = _build_climate_data(variable, var_info, period, effective_scenario, normalized_percentile)
 
     values = [d.value for d in climate_response.data]
 
@@ -380,3 +435,42 @@ async def get_variable_range(
         "max": max(values),
         "mean": round(sum(values) / len(values), 1),
     }
+
+
+def prebuild_responses() -> int:
+    """
+    Populate the response cache for every map and comparison query the UI can issue.
+    Returns the number of cached responses.
+    """
+    built = 0
+    for var_info in _get_available_variables():
+        variable = var_info["id"]
+        future_scenarios = [item for item in _get_valid_scenarios(variable) if item != "historical"]
+        for percentile in sorted(VALID_PERCENTILES):
+            for period in VALID_PERIODS:
+                for scenario in (["historical"] if period == "baseline" else future_scenarios):
+                    try:
+                        get_cached_payload(
+                            ("climate", variable, period, scenario, percentile),
+                            lambda: _build_climate_data(variable, var_info, period, scenario, percentile),
+                            ClimateResponse,
+                            thorough=True,
+                        )
+                    except HTTPException:
+                        continue
+                    built += 1
+
+                if period == "baseline":
+                    continue
+                for scenario in future_scenarios:
+                    try:
+                        get_cached_payload(
+                            ("compare", variable, period, scenario, percentile),
+                            lambda: _build_climate_comparison(variable, var_info, period, scenario, percentile),
+                            ClimateComparisonResponse,
+                            thorough=True,
+                        )
+                    except HTTPException:
+                        continue
+                    built += 1
+    return built
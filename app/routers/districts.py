@@ -2,7 +2,7 @@
 Districts API endpoints
 Serves Ghana district boundaries and metadata
 """
-from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional, List
 import json
 from pathlib import Path
@@ -27,8 +27,12 @@ from app.services.real_climate import (
     get_real_map_district_feature_collection,
     get_real_district_list,
     GRID_RESOLUTION_KM,
+    MAP_LEVELS,
     has_real_climate_data,
+    load_districts_topojson,
+    map_level_for_zoom,
 )
+from app.services.response_cache import cached_response, get_cached_payload
 
 router = APIRouter()
 
@@ -106,16 +110,7 @@ def generate_district_geometry(region: str, district_index: int, total_in_region
     }
 
 
-@router.get("", response_model=DistrictFeatureCollection)
-async def get_all_districts(
-    response: Response,
-    region: Optional[str] = Query(None, description="Filter by region name"),
-):
-    """
-    Get all Ghana districts as GeoJSON FeatureCollection.
-    Optionally filter by region.
-    """
-    response.headers["Cache-Control"] = "public, max-age=3600"
+def _build_all_districts(region: Optional[str]) -> dict:
     real_payload = get_real_district_feature_collection(region)
     if real_payload is not None:
         return real_payload
@@ -146,21 +141,91 @@ async def get_all_districts(
     return {"type": "FeatureCollection", "features": features}
 
 
+def _build_map_districts(region: Optional[str], level: str = "district") -> dict:
+    real_payload = get_real_map_district_feature_collection(region, level)
+    if real_payload is not None:
+        return real_payload
+
+    return _build_all_districts(region)
+
+
+def _build_districts_topojson() -> dict:
+    topology = load_districts_topojson()
+    if topology is None:
+        raise HTTPException(status_code=404, detail="District TopoJSON has not been built")
+    return topology
+
+
+def prebuild_responses() -> int:
+    """
+    Populate the response cache for the unfiltered district layers.
+    Returns the number of cached responses.
+    """
+    get_cached_payload(
+        ("districts", ""), lambda: _build_all_districts(None), DistrictFeatureCollection, thorough=True
+    )
+    for level, _ in MAP_LEVELS:
+        get_cached_payload(
+            ("districts_map", "", level),
+            lambda level=level: _build_map_districts(None, level),
+            DistrictFeatureCollection,
+            thorough=True,
+        )
+    prebuilt = 1 + len(MAP_LEVELS)
+    if load_districts_topojson() is not None:
+        get_cached_payload(("districts_topojson",), _build_districts_topojson, thorough=True)
+        prebuilt += 1
+    return prebuilt
+
+
+@router.get("", response_model=DistrictFeatureCollection)
+async def get_all_districts(
+    request: Request,
+    region: Optional[str] = Query(None, description="Filter by region name"),
+):
+    """
+    Get all Ghana districts as GeoJSON FeatureCollection.
+    Optionally filter by region.
+    """
+    return cached_response(
+        request,
+        ("districts", (region or "").lower()),
+        lambda: _build_all_districts(region),
+        DistrictFeatureCollection,
+    )
+
+
 @router.get("/map", response_model=DistrictFeatureCollection)
 async def get_map_districts(
-    response: Response,
+    request: Request,
     region: Optional[str] = Query(None, description="Filter by region name"),
+    zoom: Optional[int] = Query(
+        None,
+        ge=0,
+        le=24,
+        description="Map zoom level; selects the lightest geometry that renders cleanly at it",
+    ),
 ):
     """
     Get Ghana districts as GeoJSON optimized for map rendering.
     Falls back to the full district payload when the simplified artifact is unavailable.
     """
-    response.headers["Cache-Control"] = "public, max-age=3600"
-    real_payload = get_real_map_district_feature_collection(region)
-    if real_payload is not None:
-        return real_payload
+    level = map_level_for_zoom(zoom)
+    return cached_response(
+        request,
+        ("districts_map", (region or "").lower(), level),
+        lambda: _build_map_districts(region, level),
+        DistrictFeatureCollection,
+    )
+
 
-    return await get_all_districts(response, region)
+@router.get("/topojson")
+async def get_districts_topojson(request: Request):
+    """
+    Get all districts as TopoJSON: shared borders stored once as quantized,
+    delta-encoded arcs (built by scripts/build_topojson.py).
+    """
+    return cached_response(request, ("districts_topojson",), _build_districts_topojson)
 
 
 @router.get("/list", response_model=List[District])
@@ -0,0 +1,67 @@
+"""
+Vector tile endpoints
+Serves the district layer as Mapbox Vector Tiles, optionally with climate values
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+
+from app.routers.climate import _build_climate_data, _resolve_variable, _validate_climate_query
+from app.services.lru import lru_cache
+from app.services.metrics import register_cache_collector
+from app.services.real_climate import get_dataset_version
+from app.services.response_cache import precompressed_response
+from app.services.vector_tiles import MVT_MEDIA_TYPE, get_tile_payload
+
+router = APIRouter()
+
+
+@lru_cache(maxsize=32)
+def _district_values(version: str, variable: str, period: str, scenario: str, percentile: str) -> dict[str, float]:
+    """
+    Values of one query by district id, shared by every tile of a viewport.
+    ``version`` only keys the cache so a reload rebuilds them.
+    """
+    response = _build_climate_data(variable, _resolve_variable(variable), period, scenario, percentile)
+    return {item.district_id: item.value for item in response.data}
+
+
+def _district_values_cache_stats() -> dict[str, tuple[int, int, int, int | None]]:
+    info = _district_values.cache_info()
+    return {"tile_values": (info.hits, info.misses, info.currsize, info.maxsize)}
+
+
+register_cache_collector(_district_values_cache_stats)
+
+
+@router.get("/{z}/{x}/{y}")
+async def get_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=24),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    variable: Optional[str] = Query(None, description="Climate variable whose values are added as the 'value' property"),
+    period: str = Query("baseline", description="Time period: baseline, 2030, 2050, or 2080"),
+    scenario: str = Query("rcp45", description="Emission scenario: historical, rcp26, rcp45, or rcp85"),
+    percentile: str = Query("p50", description="Ensemble percentile: p10, p50, or p90"),
+):
+    """
+    Get one district vector tile (layer "districts") built by scripts/build_vector_tiles.py.
+    Returns 204 for tiles without districts, including zooms beyond the pre-generated range.
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=404, detail=f"Tile {z}/{x}/{y} is outside the tile grid")
+
+    values_key = None
+    build_values = None
+    if variable:
+        _, scenario, normalized_percentile = _validate_climate_query(variable, period, scenario, percentile)
+        values_key = (variable, period, scenario, normalized_percentile)
+
+        def build_values() -> dict[str, float]:
+            return _district_values(get_dataset_version(), *values_key)
+
+    payload = get_tile_payload(z, x, y, values_key, build_values)
+    if payload is None:
+        return Response(status_code=204)
+    return precompressed_response(request, payload, media_type=MVT_MEDIA_TYPE)
@@ -0,0 +1,62 @@
+"""
+Drop-in replacement for ``functools.lru_cache`` whose cached values can be inspected.
+
+``functools.lru_cache`` keeps its entries private, so the memory accounting in
+app/services/memory.py could not see what the dataset caches retain. This
+version supports the subset of the interface the app uses (positional/keyword
+arguments, ``cache_info()``, ``cache_clear()``) and adds ``cache_values()``.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def lru_cache(maxsize: int = 128) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        entries: OrderedDict[Hashable, Any] = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            with lock:
+                if key in entries:
+                    stats["hits"] += 1
+                    entries.move_to_end(key)
+                    return entries[key]
+                stats["misses"] += 1
+
+            # Computed outside the lock, like functools.lru_cache: concurrent misses may both build.
+            value = func(*args, **kwargs)
+            with lock:
+                entries[key] = value
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(stats["hits"], stats["misses"], maxsize, len(entries))
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+                stats["hits"] = stats["misses"] = 0
+
+        def cache_values() -> list[Any]:
+            with lock:
+                return list(entries.values())
+
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_values = cache_values  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
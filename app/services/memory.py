@@ -0,0 +1,153 @@
+"""
+Approximate retained memory of the loaded datasets and caches.
+
+Sizes are estimates from ``sys.getsizeof`` over the object graph, so they omit
+allocator overhead and are meant for spotting growth (new variables, scenarios,
+larger caches), not for exact accounting. Compare them with the process RSS.
+
+The structures are JSON-like trees, so the walk does not track visited objects
+(which would itself cost memory proportional to the data). Dict keys, which
+``json.load`` and ``csv.DictReader`` share between records, are counted once,
+and very long lists are estimated from an evenly spaced sample.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services import real_climate
+from app.services.response_cache import get_cached_payloads, get_max_entries
+
+# Lists longer than this are estimated from SAMPLE_SIZE evenly spaced items.
+SAMPLE_THRESHOLD = 20_000
+SAMPLE_SIZE = 2_000
+
+
+def deep_sizeof(obj: Any, counted_keys: set[int] | None = None) -> int:
+    """Approximate bytes retained by ``obj`` and everything it contains."""
+    counted_keys = set() if counted_keys is None else counted_keys
+    total = 0.0
+    stack: list[tuple[Any, float]] = [(obj, 1.0)]
+    while stack:
+        item, weight = stack.pop()
+        total += sys.getsizeof(item) * weight
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if id(key) not in counted_keys:
+                    counted_keys.add(id(key))
+                    total += sys.getsizeof(key)
+                stack.append((value, weight))
+        elif isinstance(item, (list, tuple)) and len(item) > SAMPLE_THRESHOLD:
+            step = len(item) / SAMPLE_SIZE
+            scale = weight * len(item) / SAMPLE_SIZE
+            stack.extend((item[int(index * step)], scale) for index in range(SAMPLE_SIZE))
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend((child, weight) for child in item)
+        elif is_dataclass(item) and not isinstance(item, type):
+            stack.extend((getattr(item, field.name), weight) for field in fields(item))
+    return int(total)
+
+
+def index_overhead(index: dict[Any, list[Any]] | None) -> int:
+    """Bytes an index adds on top of the rows it points to (its dict, key tuples and row lists)."""
+    if not index:
+        return 0
+    # Key parts are the rows' own value objects, so they are attributed to the rows.
+    return sys.getsizeof(index) + sum(sys.getsizeof(key) + sys.getsizeof(rows) for key, rows in index.items())
+
+
+def process_memory() -> dict[str, int | None]:
+    """Current and peak resident set size of this process, from /proc (None elsewhere)."""
+    values: dict[str, int | None] = {"rss_bytes": None, "peak_rss_bytes": None}
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return values
+    for line in status.splitlines():
+        name, _, value = line.partition(":")
+        if name in ("VmRSS", "VmHWM"):
+            # Reported in kB.
+            values["rss_bytes" if name == "VmRSS" else "peak_rss_bytes"] = int(value.split()[0]) * 1024
+    return values
+
+
+def _cache_entry(func: Any, counted_keys: set[int], exclude: tuple[Any, ...] = ()) -> dict[str, Any]:
+    info = func.cache_info()
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "bytes": sum(
+            deep_sizeof(value, counted_keys)
+            for value in func.cache_values()
+            if not any(value is excluded for excluded in exclude)
+        ),
+    }
+
+
+def memory_report() -> dict[str, Any]:
+    """Estimated size of each loaded structure plus the process RSS."""
+    started = time.perf_counter()
+    counted_keys: set[int] = set()
+    structures: dict[str, dict[str, Any]] = {}
+
+    dataset = real_climate.get_loaded_dataset()
+    if dataset is not None:
+        structures["period_rows"] = {
+            "entries": len(dataset.period_values or []),
+            "bytes": deep_sizeof(dataset.period_values, counted_keys),
+        }
+        structures["period_index"] = {
+            "entries": len(dataset.period_index or {}),
+            "bytes": index_overhead(dataset.period_index),
+        }
+        structures["districts_geojson"] = {
+            "entries": len((dataset.districts_geojson or {}).get("features", [])),
+            "bytes": deep_sizeof(dataset.districts_geojson, counted_keys),
+        }
+        # Without a separate map file both names refer to the same object.
+        map_shared = dataset.map_districts_geojson is dataset.districts_geojson
+        structures["map_districts_geojson"] = {
+            "entries": len((dataset.map_districts_geojson or {}).get("features", [])),
+            "bytes": 0 if map_shared else deep_sizeof(dataset.map_districts_geojson, counted_keys),
+        }
+        structures["map_level_geojsons"] = {
+            "entries": len(dataset.map_level_geojsons),
+            "bytes": deep_sizeof(dataset.map_level_geojsons, counted_keys),
+        }
+        structures["districts_topojson"] = {
+            "entries": len(dataset.districts_topojson.get("arcs", [])) if dataset.districts_topojson else 0,
+            "bytes": deep_sizeof(dataset.districts_topojson, counted_keys),
+        }
+
+    structures["district_timeseries_cache"] = _cache_entry(real_climate._load_district_timeseries_file, counted_keys)
+    structures["yearly_rows_cache"] = _cache_entry(real_climate.load_yearly_values, counted_keys)
+    yearly_index = real_climate._yearly_values_index
+    structures["yearly_index_cache"] = {
+        "entries": yearly_index.cache_info().currsize,
+        "max_entries": yearly_index.cache_info().maxsize,
+        "bytes": sum(index_overhead(index) for index in yearly_index.cache_values()),
+    }
+    # Without districts.geojson the dataset holds the shapefile conversion itself.
+    structures["shapefile_districts_cache"] = _cache_entry(
+        real_climate.load_districts_from_shapefile,
+        counted_keys,
+        exclude=(dataset.districts_geojson,) if dataset is not None else (),
+    )
+
+    payloads = get_cached_payloads()
+    structures["response_cache"] = {
+        "entries": len(payloads),
+        "max_entries": get_max_entries(),
+        "bytes": sum(deep_sizeof(payload) for payload in payloads),
+    }
+
+    return {
+        "dataset_version": dataset.version if dataset is not None else None,
+        "process": process_memory(),
+        "structures": structures,
+        "total_bytes": sum(entry["bytes"] for entry in structures.values()),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
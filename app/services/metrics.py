@@ -0,0 +1,146 @@
+"""
+In-process request and cache metrics rendered in the Prometheus text format.
+
+Metrics are per process: under gunicorn every worker reports its own counters,
+so scrape the workers individually or aggregate by instance.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = defaultdict(float)
+
+    def observe(self, labels: Labels, value: float) -> None:
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                # One slot per bucket plus the implicit +Inf bucket.
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[labels] += value
+
+    def snapshot(self) -> list[tuple[Labels, list[int], float]]:
+        with self._lock:
+            return [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[Labels, float] = defaultdict(float)
+
+    def inc(self, labels: Labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] += amount
+
+    def snapshot(self) -> list[tuple[Labels, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+http_requests = Counter()
+http_request_duration = Histogram(LATENCY_BUCKETS)
+http_response_size = Histogram(SIZE_BUCKETS)
+cache_requests = Counter()
+
+# Caches that keep their own statistics (e.g. functools.lru_cache) register a
+# collector returning {cache_name: (hits, misses, current_size, max_size)}.
+CacheStats = dict[str, tuple[int, int, int, int | None]]
+_cache_collectors: list[Callable[[], CacheStats]] = []
+
+
+def record_request(method: str, route: str, status: int, duration: float, size: int) -> None:
+    labels = (("method", method), ("route", route))
+    http_requests.inc((*labels, ("status", str(status))))
+    http_request_duration.observe(labels, duration)
+    http_response_size.observe(labels, size)
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    cache_requests.inc((("cache", cache), ("result", "hit" if hit else "miss")))
+
+
+def register_cache_collector(collector: Callable[[], CacheStats]) -> None:
+    _cache_collectors.append(collector)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render_histogram(name: str, help_text: str, histogram: Histogram) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, counts, total in sorted(histogram.snapshot()):
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, float("inf")), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_number(bound)
+            lines.append(f"{name}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return lines
+
+
+def render_prometheus() -> str:
+    lines = ["# HELP http_requests_total HTTP requests by route and status.", "# TYPE http_requests_total counter"]
+    for labels, value in sorted(http_requests.snapshot()):
+        lines.append(f"http_requests_total{_format_labels(labels)} {_format_number(value)}")
+
+    lines += _render_histogram(
+        "http_request_duration_seconds",
+        "Time from request start to the last response byte.",
+        http_request_duration,
+    )
+    lines += _render_histogram(
+        "http_response_size_bytes",
+        "Response body size as sent on the wire (after compression).",
+        http_response_size,
+    )
+
+    cache_counts = dict(cache_requests.snapshot())
+    cache_sizes: list[tuple[Labels, int | None, int]] = []
+    for collector in _cache_collectors:
+        for cache, (hits, misses, current, maximum) in collector().items():
+            cache_counts[(("cache", cache), ("result", "hit"))] = hits
+            cache_counts[(("cache", cache), ("result", "miss"))] = misses
+            cache_sizes.append(((("cache", cache),), maximum, current))
+
+    lines += ["# HELP cache_requests_total Cache lookups by cache layer and result.", "# TYPE cache_requests_total counter"]
+    for labels, value in sorted(cache_counts.items()):
+        lines.append(f"cache_requests_total{_format_labels(labels)} {_format_number(value)}")
+
+    lines += ["# HELP cache_entries Entries currently held by a cache layer.", "# TYPE cache_entries gauge"]
+    for labels, _, current in sorted(cache_sizes, key=lambda item: item[0]):
+        lines.append(f"cache_entries{_format_labels(labels)} {current}")
+
+    lines += ["# HELP cache_capacity Maximum entries a cache layer holds.", "# TYPE cache_capacity gauge"]
+    for labels, maximum, _ in sorted(cache_sizes, key=lambda item: item[0]):
+        if maximum is not None:
+            lines.append(f"cache_capacity{_format_labels(labels)} {maximum}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+"""
+Per-request timing of service calls and profile capture for slow requests.
+
+Service functions decorated with ``timed`` add their wall time to the timings of
+the request being served (tracked in a context variable, so concurrent requests
+do not mix). ``ProfilingMiddleware`` in app/middleware.py turns these into a
+``Server-Timing`` header and, for sampled requests above the threshold, writes a
+cProfile dump to a rotating directory.
+
+Configuration (environment variables):
+    PROFILE_THRESHOLD_MS  requests slower than this are profiled (0 disables; default 0)
+    PROFILE_SAMPLE_RATE   fraction of requests run under cProfile (default 0.1)
+    PROFILE_DIR           directory for .prof dumps (no dumps when unset)
+    PROFILE_KEEP          number of dumps kept in PROFILE_DIR (default 50)
+    PROFILE_DEBUG_HEADERS set to 1 to send the debug headers (off by default)
+    APP_ENV               "development" also sends the debug headers
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import re
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_KEEP = 50
+
+# function name -> [call count, total seconds]
+_request_timings: ContextVar[dict[str, list[float]] | None] = ContextVar("request_timings", default=None)
+
+
+def _float_env(name: str, default: float) -> float:
+    configured = os.getenv(name)
+    if configured:
+        try:
+            return float(configured)
+        except ValueError:
+            pass
+    return default
+
+
+def get_threshold_ms() -> float:
+    return max(_float_env("PROFILE_THRESHOLD_MS", 0.0), 0.0)
+
+
+def get_sample_rate() -> float:
+    return min(max(_float_env("PROFILE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE), 0.0), 1.0)
+
+
+def get_profile_dir() -> Path | None:
+    configured = os.getenv("PROFILE_DIR")
+    return Path(configured) if configured else None
+
+
+def get_profile_keep() -> int:
+    return max(int(_float_env("PROFILE_KEEP", DEFAULT_KEEP)), 1)
+
+
+def debug_headers_enabled() -> bool:
+    """Server-Timing exposes internal function names, so it is opt-in."""
+    if (os.getenv("PROFILE_DEBUG_HEADERS") or "").strip().lower() in ("1", "true", "yes"):
+        return True
+    return (os.getenv("APP_ENV") or "").strip().lower() == "development"
+
+
+def timed(func: F) -> F:
+    """Accumulate the call count and wall time of ``func`` into the current request's timings."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = _request_timings.get()
+        if timings is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            entry = timings.setdefault(func.__name__, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - started
+
+    return wrapper  # type: ignore[return-value]
+
+
+def start_request_timings() -> tuple[dict[str, list[float]], Any]:
+    """Begin collecting service timings for the current context. Returns (timings, reset token)."""
+    timings: dict[str, list[float]] = {}
+    return timings, _request_timings.set(timings)
+
+
+def stop_request_timings(token: Any) -> None:
+    _request_timings.reset(token)
+
+
+def format_server_timing(
+    timings: dict[str, list[float]],
+    total_seconds: float,
+    hotspots: list[tuple[str, float]] | None = None,
+) -> str:
+    entries = [
+        f'{name};dur={seconds * 1000:.2f};desc="{int(calls)} call{"s" if calls != 1 else ""}"'
+        for name, (calls, seconds) in sorted(timings.items(), key=lambda item: -item[1][1])
+    ]
+    for rank, (label, seconds) in enumerate(hotspots or [], start=1):
+        description = label.replace('"', "'")
+        entries.append(f'prof{rank};dur={seconds * 1000:.2f};desc="{description}"')
+    entries.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def top_functions(profiler: Any, limit: int = 5) -> list[tuple[str, float]]:
+    """Return the ``limit`` functions with the highest cumulative time as (label, seconds)."""
+    import pstats
+
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    ranked = sorted(stats.items(), key=lambda item: -item[1][3])[:limit]
+    return [
+        (f"{Path(filename).name}:{line}({function})", cumulative)
+        for (filename, line, function), (_, _, _, cumulative, _) in ranked
+    ]
+
+
+def save_profile(
+    profiler: Any,
+    directory: Path,
+    *,
+    method: str,
+    path: str,
+    elapsed_seconds: float,
+    timings: dict[str, list[float]],
+) -> str:
+    """Write a cProfile dump plus a JSON summary, prune old dumps, and return the profile id."""
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:60] or "root"
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000:06d}-{method.lower()}-{slug}"
+
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    summary = {
+        "method": method,
+        "path": path,
+        "elapsed_ms": round(elapsed_seconds * 1000, 2),
+        "service_calls": {
+            name: {"calls": int(calls), "ms": round(seconds * 1000, 2)}
+            for name, (calls, seconds) in timings.items()
+        },
+    }
+    (directory / f"{profile_id}.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    dumps = sorted(directory.glob("*.prof"), key=lambda item: item.stat().st_mtime)
+    for stale in dumps[: max(len(dumps) - get_profile_keep(), 0)]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".json").unlink(missing_ok=True)
+    return profile_id
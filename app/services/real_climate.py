@@ -2,19 +2,36 @@ from __future__ import annotations
 
 import csv
 import gzip
+import hashlib
 import json
 import os
+import threading
 from collections import defaultdict
-from functools import lru_cache
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from app.data.mock_data import CLIMATE_VARIABLES, generate_district_id
 from app.models.schemas import ClimateComparisonResponse, ClimateResponse, ClimateTimeSeriesResponse
+from app.services.lru import lru_cache
+from app.services.metrics import record_cache_access, register_cache_collector
+from app.services.profiling import timed
+
+try:
+    import pyarrow.dataset as pa_dataset
+except ImportError:  # pyarrow is optional; the CSV tables are read otherwise
+    pa_dataset = None
 
 DEFAULT_PROCESSED_DIR = Path(__file__).resolve().parents[1] / "data" / "processed"
 DEFAULT_DISTRICTS_PATH = DEFAULT_PROCESSED_DIR / "districts.geojson"
 DEFAULT_MAP_DISTRICTS_PATH = DEFAULT_PROCESSED_DIR / "districts_map.geojson"
+DEFAULT_DISTRICTS_TOPOJSON_PATH = DEFAULT_PROCESSED_DIR / "districts.topojson"
+DEFAULT_TILES_DIR = DEFAULT_PROCESSED_DIR / "tiles"
+# Simplification levels written by scripts/simplify_geojson.py, lightest first, with the
+# highest web-map zoom each one still renders cleanly at. "district" is districts_map.geojson.
+MAP_LEVELS: tuple[tuple[str, int | None], ...] = (("national", 6), ("region", 8), ("district", None))
 DEFAULT_PERIOD_VALUES_PATH = DEFAULT_PROCESSED_DIR / "climate_period_values.csv"
 DEFAULT_YEARLY_VALUES_PATH = DEFAULT_PROCESSED_DIR / "climate_yearly_values.csv.gz"
 DEFAULT_DISTRICT_TIMESERIES_DIR = DEFAULT_PROCESSED_DIR / "district_timeseries"
@@ -41,6 +58,25 @@ def _read_csv_records(path: Path, required_columns: set[str]) -> list[dict[str,
         return list(reader)
 
 
+def _read_parquet_records(
+    path: Path,
+    required_columns: set[str],
+    variables: set[str] | None,
+) -> list[dict[str, Any]]:
+    """
+    Read a Parquet dataset written by the importer (hive-partitioned by variable and
+    scenario). A ``variables`` filter is pushed down, so other partitions are never opened.
+    """
+    dataset = pa_dataset.dataset(path, format="parquet", partitioning="hive")
+    fieldnames = set(dataset.schema.names)
+    if not required_columns.issubset(fieldnames):
+        missing = sorted(required_columns - fieldnames)
+        raise ValueError(f"Processed climate data is missing required columns: {missing}")
+
+    expression = pa_dataset.field("variable").isin(sorted(variables)) if variables is not None else None
+    return dataset.to_table(filter=expression).to_pylist()
+
+
 def _read_csv_records_allowing_missing(
     path: Path,
     required_columns: set[str],
@@ -137,6 +173,34 @@ def get_map_districts_path() -> Path:
     return get_processed_dir() / DEFAULT_MAP_DISTRICTS_PATH.name
 
 
+def get_districts_topojson_path() -> Path:
+    configured = os.getenv("CLIMATE_DISTRICTS_TOPOJSON_PATH")
+    if configured:
+        return Path(configured)
+    return get_processed_dir() / DEFAULT_DISTRICTS_TOPOJSON_PATH.name
+
+
+def get_tiles_dir() -> Path:
+    configured = os.getenv("CLIMATE_TILES_DIR")
+    if configured:
+        return Path(configured)
+    return get_processed_dir() / DEFAULT_TILES_DIR.name
+
+
+def get_map_level_path(level: str) -> Path:
+    path = get_map_districts_path()
+    if level == "district":
+        return path
+    return path.with_name(f"{path.stem}_{level}{path.suffix}")
+
+
+def map_level_for_zoom(zoom: int | None) -> str:
+    """Lightest simplification level that renders cleanly at ``zoom`` (full map detail when unknown)."""
+    if zoom is None:
+        return "district"
+    return next(level for level, max_zoom in MAP_LEVELS if max_zoom is None or zoom <= max_zoom)
+
+
 def get_fallback_shapefile_path() -> Path:
     configured = os.getenv("CLIMATE_DISTRICTS_SHAPEFILE")
     if configured:
@@ -144,6 +208,13 @@ def get_fallback_shapefile_path() -> Path:
     return DEFAULT_SHAPEFILE_PATH
 
 
+def get_district_timeseries_dir() -> Path:
+    configured = os.getenv("CLIMATE_DISTRICT_TIMESERIES_DIR")
+    if configured:
+        return Path(configured)
+    return get_processed_dir() / DEFAULT_DISTRICT_TIMESERIES_DIR.name
+
+
 def get_period_values_path() -> Path:
     configured = os.getenv("CLIMATE_PERIOD_VALUES_PATH")
     if configured:
@@ -158,6 +229,48 @@ def get_yearly_values_path() -> Path:
     return get_processed_dir() / DEFAULT_YEARLY_VALUES_PATH.name
 
 
+def get_loaded_variables() -> set[str] | None:
+    """Variables to load from the processed tables (``CLIMATE_LOAD_VARIABLES``, comma-separated; default all)."""
+    configured = os.getenv("CLIMATE_LOAD_VARIABLES")
+    if not configured:
+        return None
+    return {variable.strip() for variable in configured.split(",") if variable.strip()}
+
+
+def get_parquet_dataset_path(path: Path) -> Path:
+    """Directory of the Parquet dataset the importer writes alongside ``path``."""
+    return path.with_name(path.name.split(".", 1)[0])
+
+
+def resolve_values_source(path: Path) -> Path | None:
+    """Prefer the Parquet dataset next to a CSV table when pyarrow can read it."""
+    dataset_path = get_parquet_dataset_path(path)
+    if pa_dataset is not None and dataset_path.is_dir():
+        return dataset_path
+    if path.exists():
+        return path
+    return None
+
+
+def _read_table_records(
+    path: Path,
+    required_columns: set[str],
+    optional_columns: set[str],
+) -> list[dict[str, Any]]:
+    variables = get_loaded_variables()
+    if path.is_dir():
+        records = _read_parquet_records(path, required_columns, variables)
+        for row in records:
+            for column in optional_columns:
+                row.setdefault(column, None)
+        return records
+
+    records = _read_csv_records_allowing_missing(path, required_columns, optional_columns)
+    if variables is not None:
+        records = [row for row in records if row["variable"] in variables]
+    return records
+
+
 def normalize_percentile(percentile: str | None) -> str:
     value = (percentile or "p50").lower()
     if value not in VALID_PERCENTILES:
@@ -165,10 +278,9 @@ def normalize_percentile(percentile: str | None) -> str:
     return value
 
 
-@lru_cache(maxsize=1)
-def load_period_values():
-    path = get_period_values_path()
-    if not path.exists():
+def _read_period_values() -> list[dict[str, Any]] | None:
+    path = resolve_values_source(get_period_values_path())
+    if path is None:
         return None
 
     required_columns = {
@@ -183,15 +295,13 @@ def load_period_values():
         "unit",
     }
     optional_columns = {"grid_point_count"}
-    return _normalize_period_records(
-        _read_csv_records_allowing_missing(path, required_columns, optional_columns)
-    )
+    return _normalize_period_records(_read_table_records(path, required_columns, optional_columns))
 
 
-@lru_cache(maxsize=1)
-def _period_values_index() -> dict[tuple[str, str, str, str], list[dict[str, Any]]] | None:
+def _build_period_values_index(
+    rows: list[dict[str, Any]] | None,
+) -> dict[tuple[str, str, str, str], list[dict[str, Any]]] | None:
     """Build a dict index over period values for O(1) lookup by (variable, period, scenario, percentile)."""
-    rows = load_period_values()
     if rows is None:
         return None
     index: dict[tuple[str, str, str, str], list[dict[str, Any]]] = defaultdict(list)
@@ -203,8 +313,8 @@ def _period_values_index() -> dict[tuple[str, str, str, str], list[dict[str, Any
 
 @lru_cache(maxsize=1)
 def load_yearly_values():
-    path = get_yearly_values_path()
-    if not path.exists():
+    path = resolve_values_source(get_yearly_values_path())
+    if path is None:
         return None
 
     required_columns = {
@@ -219,9 +329,7 @@ def load_yearly_values():
         "unit",
     }
     optional_columns = {"grid_point_count"}
-    return _normalize_yearly_records(
-        _read_csv_records_allowing_missing(path, required_columns, optional_columns)
-    )
+    return _normalize_yearly_records(_read_table_records(path, required_columns, optional_columns))
 
 
 @lru_cache(maxsize=1)
@@ -242,8 +350,7 @@ def _yearly_values_index() -> dict[tuple[str, str, str, str], list[dict[str, Any
     return dict(index)
 
 
-@lru_cache(maxsize=1)
-def load_districts_geojson() -> dict[str, Any] | None:
+def _read_districts_geojson() -> dict[str, Any] | None:
     path = get_districts_path()
     if not path.exists():
         return load_districts_from_shapefile()
@@ -252,16 +359,175 @@ def load_districts_geojson() -> dict[str, Any] | None:
         return json.load(handle)
 
 
-@lru_cache(maxsize=1)
-def load_map_districts_geojson() -> dict[str, Any] | None:
+def _read_map_districts_geojson(districts_geojson: dict[str, Any] | None) -> dict[str, Any] | None:
     path = get_map_districts_path()
     if not path.exists():
-        return load_districts_geojson()
+        return districts_geojson
+
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _read_map_level_geojsons() -> dict[str, dict[str, Any]]:
+    """The coarser map levels that exist on disk; the district level is ``map_districts_geojson``."""
+    levels: dict[str, dict[str, Any]] = {}
+    for level, _ in MAP_LEVELS:
+        path = get_map_level_path(level)
+        if level == "district" or not path.exists():
+            continue
+        with path.open("r", encoding="utf-8") as handle:
+            levels[level] = json.load(handle)
+    return levels
+
+
+def _read_districts_topojson() -> dict[str, Any] | None:
+    path = get_districts_topojson_path()
+    if not path.exists():
+        return None
 
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
 
 
+@dataclass(frozen=True)
+class ClimateDataset:
+    """An immutable snapshot of the processed artifacts served by the API."""
+
+    version: str
+    period_values: list[dict[str, Any]] | None
+    period_index: dict[tuple[str, str, str, str], list[dict[str, Any]]] | None
+    districts_geojson: dict[str, Any] | None
+    map_districts_geojson: dict[str, Any] | None
+    map_level_geojsons: dict[str, dict[str, Any]] = field(default_factory=dict)
+    districts_topojson: dict[str, Any] | None = None
+
+
+def get_dataset_source_paths() -> list[Path]:
+    paths = [
+        get_period_values_path(),
+        get_yearly_values_path(),
+        get_districts_path(),
+        get_map_districts_path(),
+        *(get_map_level_path(level) for level, _ in MAP_LEVELS if level != "district"),
+        get_districts_topojson_path(),
+        # Rewritten on every tile build, so it stands in for the tile files themselves.
+        get_tiles_dir() / "metadata.json",
+    ]
+    for table_path in (get_period_values_path(), get_yearly_values_path()):
+        dataset_path = get_parquet_dataset_path(table_path)
+        if dataset_path.is_dir():
+            paths.extend(sorted(dataset_path.rglob("*.parquet")))
+    timeseries_dir = get_district_timeseries_dir()
+    if timeseries_dir.exists():
+        paths.extend(sorted(timeseries_dir.glob("*.json.gz")))
+    return paths
+
+
+def compute_dataset_version() -> str:
+    """Fingerprint the processed artifacts from their paths, sizes and modification times."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in get_dataset_source_paths():
+        try:
+            stat = path.stat()
+        except OSError:
+            digest.update(f"{path}:missing\n".encode("utf-8"))
+            continue
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_dataset(version: str | None = None) -> ClimateDataset:
+    # Fingerprint before reading, so files replaced mid-build show up as a newer version.
+    version = version or compute_dataset_version()
+    period_values = _read_period_values()
+    districts_geojson = _read_districts_geojson()
+    return ClimateDataset(
+        version=version,
+        period_values=period_values,
+        period_index=_build_period_values_index(period_values),
+        districts_geojson=districts_geojson,
+        map_districts_geojson=_read_map_districts_geojson(districts_geojson),
+        map_level_geojsons=_read_map_level_geojsons(),
+        districts_topojson=_read_districts_topojson(),
+    )
+
+
+_active_dataset: ClimateDataset | None = None
+_active_dataset_lock = threading.Lock()
+_dataset_override: ContextVar[ClimateDataset | None] = ContextVar("climate_dataset_override", default=None)
+
+
+def get_dataset() -> ClimateDataset:
+    """Return the dataset serving the current request, loading it on first use."""
+    override = _dataset_override.get()
+    if override is not None:
+        return override
+
+    global _active_dataset
+    dataset = _active_dataset
+    if dataset is None:
+        with _active_dataset_lock:
+            if _active_dataset is None:
+                _active_dataset = build_dataset()
+            dataset = _active_dataset
+    return dataset
+
+
+def get_loaded_dataset() -> ClimateDataset | None:
+    """Return the active dataset without loading it (``None`` before first use)."""
+    return _active_dataset
+
+
+def get_dataset_version() -> str:
+    return get_dataset().version
+
+
+def activate_dataset(dataset: ClimateDataset) -> None:
+    """Atomically serve ``dataset`` to new requests and drop caches derived from the previous one."""
+    global _active_dataset
+    with _active_dataset_lock:
+        _active_dataset = dataset
+    _load_district_timeseries_file.cache_clear()
+    load_yearly_values.cache_clear()
+    _yearly_values_index.cache_clear()
+
+
+@contextmanager
+def use_dataset(dataset: ClimateDataset) -> Iterator[ClimateDataset]:
+    """Serve ``dataset`` within the current context only, e.g. to prebuild caches before activation."""
+    token = _dataset_override.set(dataset)
+    try:
+        yield dataset
+    finally:
+        _dataset_override.reset(token)
+
+
+def load_period_values() -> list[dict[str, Any]] | None:
+    return get_dataset().period_values
+
+
+def _period_values_index() -> dict[tuple[str, str, str, str], list[dict[str, Any]]] | None:
+    return get_dataset().period_index
+
+
+def load_districts_geojson() -> dict[str, Any] | None:
+    return get_dataset().districts_geojson
+
+
+def load_map_districts_geojson(level: str = "district") -> dict[str, Any] | None:
+    """Map geometry at ``level``, or the next finer level available when that file is missing."""
+    dataset = get_dataset()
+    names = [name for name, _ in MAP_LEVELS]
+    for name in names[names.index(level):]:
+        if name in dataset.map_level_geojsons:
+            return dataset.map_level_geojsons[name]
+    return dataset.map_districts_geojson
+
+
+def load_districts_topojson() -> dict[str, Any] | None:
+    return get_dataset().districts_topojson
+
+
 @lru_cache(maxsize=1)
 def load_districts_from_shapefile() -> dict[str, Any] | None:
     path = get_fallback_shapefile_path()
@@ -323,7 +589,7 @@ def load_districts_from_shapefile() -> dict[str, Any] | None:
 
 
 def has_real_climate_data() -> bool:
-    return get_period_values_path().exists()
+    return resolve_values_source(get_period_values_path()) is not None
 
 
 def has_real_districts() -> bool:
@@ -348,6 +614,7 @@ def get_supported_yearly_variables() -> set[str]:
     return {row["variable"] for row in rows if row.get("variable")}
 
 
+@timed
 def get_real_district_feature_collection(region: str | None = None) -> dict[str, Any] | None:
     payload = load_districts_geojson()
     if payload is None:
@@ -364,8 +631,12 @@ def get_real_district_feature_collection(region: str | None = None) -> dict[str,
     return {"type": "FeatureCollection", "features": filtered}
 
 
-def get_real_map_district_feature_collection(region: str | None = None) -> dict[str, Any] | None:
-    payload = load_map_districts_geojson()
+@timed
+def get_real_map_district_feature_collection(
+    region: str | None = None,
+    level: str = "district",
+) -> dict[str, Any] | None:
+    payload = load_map_districts_geojson(level)
     if payload is None:
         return None
 
@@ -380,6 +651,7 @@ def get_real_map_district_feature_collection(region: str | None = None) -> dict[
     return {"type": "FeatureCollection", "features": filtered}
 
 
+@timed
 def get_real_district(district_id: str) -> dict[str, Any] | None:
     payload = load_districts_geojson()
     if payload is None:
@@ -395,6 +667,7 @@ def get_real_district(district_id: str) -> dict[str, Any] | None:
     )
 
 
+@timed
 def get_real_district_list(region: str | None = None) -> list[dict[str, Any]] | None:
     payload = get_real_district_feature_collection(region)
     if payload is None:
@@ -413,6 +686,7 @@ def get_real_district_list(region: str | None = None) -> list[dict[str, Any]] |
     return districts
 
 
+@timed
 def build_real_climate_response(
     variable: str,
     period: str,
@@ -422,13 +696,17 @@ def build_real_climate_response(
     index = _period_values_index()
     meta = get_variable_meta(variable)
     if index is None or meta is None:
+        record_cache_access("period_index", False)
         return None
 
     normalized_percentile = normalize_percentile(percentile)
     period_key = period.lower()
     scenario_key = ("historical" if period_key == "baseline" else scenario).lower()
 
-    subset = list(index.get((variable, period_key, scenario_key, normalized_percentile), []))
+    rows = index.get((variable, period_key, scenario_key, normalized_percentile))
+    # A miss is a query the loaded data has no rows for (the caller falls back or 404s).
+    record_cache_access("period_index", rows is not None)
+    subset = list(rows or [])
     subset = _dedupe_rows(
         subset,
         ("district_id", "variable", "period", "scenario", "percentile"),
@@ -463,6 +741,7 @@ def build_real_climate_response(
     )
 
 
+@timed
 def build_real_climate_comparison(
     variable: str,
     period: str,
@@ -518,13 +797,29 @@ def _normalize_timeseries_unit_and_value(variable: str, unit: str, value: float)
 @lru_cache(maxsize=64)
 def _load_district_timeseries_file(district_id: str) -> dict[str, Any] | None:
     """Load a single district's precomputed timeseries JSON (gzipped)."""
-    path = DEFAULT_DISTRICT_TIMESERIES_DIR / f"{district_id}.json.gz"
+    path = get_district_timeseries_dir() / f"{district_id}.json.gz"
     if not path.exists():
         return None
     with gzip.open(path, "rt", encoding="utf-8") as handle:
         return json.load(handle)
 
 
+def _timeseries_cache_stats() -> dict[str, tuple[int, int, int, int | None]]:
+    info = _load_district_timeseries_file.cache_info()
+    return {"district_timeseries": (info.hits, info.misses, info.currsize, info.maxsize)}
+
+
+register_cache_collector(_timeseries_cache_stats)
+
+
+def list_district_timeseries_ids() -> list[str]:
+    directory = get_district_timeseries_dir()
+    if not directory.exists():
+        return []
+    return sorted(path.name.removesuffix(".json.gz") for path in directory.glob("*.json.gz"))
+
+
+@timed
 def build_real_climate_timeseries(
     variable: str,
     district_id: str,
@@ -613,6 +908,7 @@ def build_real_climate_timeseries(
     )
 
 
+@timed
 def build_real_district_climate(district_id: str) -> dict[str, dict[str, float]] | None:
     rows = load_period_values()
     if rows is None:
@@ -642,6 +938,7 @@ def build_real_district_climate(district_id: str) -> dict[str, dict[str, float]]
     return payload
 
 
+@timed
 def get_real_grid_point_count(
     district_id: str,
     variable: str,
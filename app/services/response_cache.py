@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.services.metrics import register_cache_collector
+from app.services.real_climate import get_dataset_version
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always available
+    brotli = None
+
+CACHE_CONTROL = "public, max-age=3600"
+DEFAULT_MAX_ENTRIES = 1024
+# Bodies smaller than this are served as-is, mirroring GZipMiddleware(minimum_size=500).
+MIN_COMPRESS_SIZE = 500
+# Warm-up prebuilds compress once, off the request path, so the best settings are affordable.
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# Cache misses are compressed inside the request on the event loop; quality 11 Brotli
+# takes hundreds of milliseconds on large bodies, these stay within a few.
+ON_DEMAND_GZIP_LEVEL = 6
+ON_DEMAND_BROTLI_QUALITY = 5
+# Server preference when the client weights several encodings equally.
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """A serialized response body together with its precompressed variants."""
+
+    body: bytes
+    etag: str
+    encoded: dict[str, bytes]
+
+
+_cache: OrderedDict[Hashable, CachedPayload] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def get_max_entries() -> int:
+    configured = os.getenv("RESPONSE_CACHE_MAX_ENTRIES")
+    if configured:
+        try:
+            return max(int(configured), 0)
+        except ValueError:
+            pass
+    return DEFAULT_MAX_ENTRIES
+
+
+def encode_payload(
+    content: Any,
+    model: type[BaseModel] | None = None,
+    *,
+    thorough: bool = False,
+) -> CachedPayload:
+    """Serialize ``content`` the way FastAPI's JSONResponse would and precompress it."""
+    if model is not None and not isinstance(content, BaseModel):
+        # Run the same validation/filtering FastAPI applies for ``response_model``.
+        content = model.model_validate(content)
+
+    body = json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return compress_body(body, thorough=thorough)
+
+
+def compress_body(body: bytes, *, thorough: bool = False) -> CachedPayload:
+    """
+    Precompress an already serialized ``body`` and compute its ETag.
+    ``thorough`` selects the slow, best compression used for warm-up prebuilds.
+    """
+    encoded: dict[str, bytes] = {}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        gzip_level = GZIP_LEVEL if thorough else ON_DEMAND_GZIP_LEVEL
+        brotli_quality = BROTLI_QUALITY if thorough else ON_DEMAND_BROTLI_QUALITY
+        encoded["gzip"] = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=brotli_quality)
+
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return CachedPayload(body=body, etag=etag, encoded=encoded)
+
+
+def get_cached_payload(
+    key: Hashable,
+    build: Callable[[], Any],
+    model: type[BaseModel] | None = None,
+    *,
+    thorough: bool = False,
+) -> CachedPayload:
+    """Return the cached payload for ``key``, building and encoding it on a miss.
+
+    Prebuilds pass ``thorough=True`` for the best (slow) compression; misses on the
+    request path use faster settings.
+
+    Entries are namespaced by the dataset version, so a dataset reload never serves
+    (or revalidates ETags against) bodies built from the previous data.
+    Exceptions raised by ``build`` (e.g. ``HTTPException``) propagate and nothing is cached.
+    """
+    global _cache_hits, _cache_misses
+    cache_key = (get_dataset_version(), key)
+    with _cache_lock:
+        payload = _cache.get(cache_key)
+        if payload is not None:
+            _cache_hits += 1
+            _cache.move_to_end(cache_key)
+            return payload
+        _cache_misses += 1
+
+    payload = encode_payload(build(), model, thorough=thorough)
+
+    max_entries = get_max_entries()
+    if max_entries:
+        with _cache_lock:
+            _cache[cache_key] = payload
+            _cache.move_to_end(cache_key)
+            while len(_cache) > max_entries:
+                _cache.popitem(last=False)
+    return payload
+
+
+def clear_response_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def get_cached_payloads() -> list[CachedPayload]:
+    """Snapshot of the cached payloads, most recently used last."""
+    with _cache_lock:
+        return list(_cache.values())
+
+
+def discard_stale_entries(version: str) -> int:
+    """Drop entries built for any dataset version other than ``version``."""
+    with _cache_lock:
+        stale = [cache_key for cache_key in _cache if cache_key[0] != version]
+        for cache_key in stale:
+            del _cache[cache_key]
+    return len(stale)
+
+
+def _response_cache_stats() -> dict[str, tuple[int, int, int, int | None]]:
+    with _cache_lock:
+        return {"response": (_cache_hits, _cache_misses, len(_cache), get_max_entries())}
+
+
+register_cache_collector(_response_cache_stats)
+
+
+def negotiate_encoding(accept_encoding: str | None, available: dict[str, bytes]) -> str | None:
+    """Pick the best precompressed variant for an ``Accept-Encoding`` header, or ``None`` for identity."""
+    if not accept_encoding or not available:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def precompressed_response(
+    request: Request,
+    payload: CachedPayload,
+    *,
+    cache_control: str = CACHE_CONTROL,
+    media_type: str = "application/json",
+) -> Response:
+    headers = {
+        "Cache-Control": cache_control,
+        "ETag": payload.etag,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), payload.encoded)
+    if encoding is None:
+        return Response(payload.body, media_type=media_type, headers=headers)
+
+    # A preset Content-Encoding makes GZipMiddleware pass the body through untouched.
+    headers["Content-Encoding"] = encoding
+    return Response(payload.encoded[encoding], media_type=media_type, headers=headers)
+
+
+def cached_response(
+    request: Request,
+    key: Hashable,
+    build: Callable[[], Any],
+    model: type[BaseModel] | None = None,
+    *,
+    cache_control: str = CACHE_CONTROL,
+) -> Response:
+    """Serve ``build()`` from the precompressed response cache."""
+    return precompressed_response(
+        request,
+        get_cached_payload(key, build, model),
+        cache_control=cache_control,
+    )
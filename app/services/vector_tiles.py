@@ -0,0 +1,240 @@
+"""
+Mapbox Vector Tiles of the district layer.
+
+scripts/build_vector_tiles.py pre-generates each tile's clipped and simplified
+geometry as integer tile coordinates under ``processed/tiles/{z}/{x}/{y}.json.gz``.
+Here a tile is read (parsed tiles are kept in an LRU), the selected variable's
+district values are attached as a ``value`` property, and the result is encoded
+to the MVT protobuf format (spec v2.1) without a protobuf dependency. Encoded
+tiles are cached in memory, namespaced by dataset version like the response cache.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.services.lru import lru_cache
+from app.services.metrics import register_cache_collector
+from app.services.real_climate import get_dataset_version, get_tiles_dir
+from app.services.response_cache import CachedPayload, compress_body
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+LAYER_NAME = "districts"
+DEFAULT_EXTENT = 4096
+DEFAULT_MAX_ENTRIES = 2048
+
+# Geometry command ids and the polygon geometry type from the MVT spec.
+MOVE_TO = 1
+LINE_TO = 2
+CLOSE_PATH = 7
+POLYGON = 3
+
+_cache: OrderedDict[Hashable, CachedPayload | None] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def get_max_entries() -> int:
+    configured = os.getenv("VECTOR_TILE_CACHE_MAX_ENTRIES")
+    if configured:
+        try:
+            return max(int(configured), 0)
+        except ValueError:
+            pass
+    return DEFAULT_MAX_ENTRIES
+
+
+def _varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(out: bytearray, number: int, wire_type: int) -> None:
+    _varint(out, (number << 3) | wire_type)
+
+
+def _bytes_field(out: bytearray, number: int, data: bytes | bytearray) -> None:
+    _field(out, number, 2)
+    _varint(out, len(data))
+    out += data
+
+
+def _packed_field(out: bytearray, number: int, values: list[int]) -> None:
+    packed = bytearray()
+    for value in values:
+        _varint(packed, value)
+    _bytes_field(out, number, packed)
+
+
+def _encode_value(value: Any) -> bytes:
+    out = bytearray()
+    if isinstance(value, bool):
+        _field(out, 7, 0)
+        _varint(out, int(value))
+    elif isinstance(value, int):
+        _field(out, 6, 0)
+        _varint(out, _zigzag(value))
+    elif isinstance(value, float):
+        _field(out, 3, 1)
+        out += struct.pack("<d", value)
+    else:
+        _bytes_field(out, 1, str(value).encode("utf-8"))
+    return bytes(out)
+
+
+def _ring_area(ring: list[list[int]]) -> int:
+    """Twice the signed area; positive for rings that are clockwise on screen (y down)."""
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))
+
+
+def _polygon_geometry(polygons: list[list[list[list[int]]]]) -> list[int]:
+    """Command integers for polygons of integer rings (exterior first, unclosed)."""
+    commands: list[int] = []
+    cursor_x = cursor_y = 0
+    for rings in polygons:
+        for index, ring in enumerate(rings):
+            area = _ring_area(ring)
+            if area == 0:
+                if index == 0:
+                    break  # a degenerate exterior drops its holes as well
+                continue
+            # The spec requires exteriors with positive area and interiors with negative area.
+            if (area > 0) != (index == 0):
+                ring = ring[::-1]
+            commands.append(MOVE_TO | (1 << 3))
+            for position, (x, y) in enumerate(ring):
+                if position == 1:
+                    commands.append(LINE_TO | ((len(ring) - 1) << 3))
+                commands.extend((_zigzag(x - cursor_x), _zigzag(y - cursor_y)))
+                cursor_x, cursor_y = x, y
+            commands.append(CLOSE_PATH | (1 << 3))
+    return commands
+
+
+def encode_tile(tile: dict[str, Any], values: dict[str, float] | None = None) -> bytes:
+    """Encode a pre-generated tile as a single-layer MVT, adding ``value`` from ``values`` by district id."""
+    keys: dict[str, int] = {}
+    layer_values: dict[tuple[str, Any], int] = {}
+    layer = bytearray()
+    _field(layer, 15, 0)
+    _varint(layer, 2)
+    _bytes_field(layer, 1, LAYER_NAME.encode("utf-8"))
+
+    for feature in tile.get("features", []):
+        geometry = _polygon_geometry(feature["polygons"])
+        if not geometry:
+            continue
+        properties = {
+            name: value
+            for name, value in feature.get("properties", {}).items()
+            if isinstance(value, (str, int, float, bool))
+        }
+        if values is not None and properties.get("id") in values:
+            properties["value"] = float(values[properties["id"]])
+
+        tags: list[int] = []
+        for name, value in properties.items():
+            tags.append(keys.setdefault(name, len(keys)))
+            tags.append(layer_values.setdefault((type(value).__name__, value), len(layer_values)))
+
+        encoded = bytearray()
+        _field(encoded, 1, 0)
+        _varint(encoded, feature["id"])
+        if tags:
+            _packed_field(encoded, 2, tags)
+        _field(encoded, 3, 0)
+        _varint(encoded, POLYGON)
+        _packed_field(encoded, 4, geometry)
+        _bytes_field(layer, 2, encoded)
+
+    for name in keys:
+        _bytes_field(layer, 3, name.encode("utf-8"))
+    for _, value in layer_values:
+        _bytes_field(layer, 4, _encode_value(value))
+    _field(layer, 5, 0)
+    _varint(layer, tile.get("extent", DEFAULT_EXTENT))
+
+    out = bytearray()
+    _bytes_field(out, 3, layer)
+    return bytes(out)
+
+
+@lru_cache(maxsize=512)
+def _load_tile_geometry(version: str, z: int, x: int, y: int) -> dict[str, Any] | None:
+    """Parsed tile geometry; ``version`` only keys the cache so a rebuilt pyramid is re-read."""
+    path = get_tiles_dir() / str(z) / str(x) / f"{y}.json.gz"
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def get_tile_payload(
+    z: int,
+    x: int,
+    y: int,
+    values_key: Hashable = None,
+    build_values: Callable[[], dict[str, float]] | None = None,
+) -> CachedPayload | None:
+    """
+    Return the encoded tile, or ``None`` where no district intersects it.
+
+    ``values_key`` identifies the values ``build_values`` returns (e.g. variable,
+    period, scenario and percentile); they are only built on a cache miss.
+    """
+    global _cache_hits, _cache_misses
+    version = get_dataset_version()
+    cache_key = (version, z, x, y, values_key)
+    with _cache_lock:
+        if cache_key in _cache:
+            _cache_hits += 1
+            _cache.move_to_end(cache_key)
+            return _cache[cache_key]
+        _cache_misses += 1
+
+    tile = _load_tile_geometry(version, z, x, y)
+    payload = None
+    if tile is not None:
+        payload = compress_body(encode_tile(tile, build_values() if build_values is not None else None))
+
+    max_entries = get_max_entries()
+    if max_entries:
+        with _cache_lock:
+            _cache[cache_key] = payload
+            _cache.move_to_end(cache_key)
+            while len(_cache) > max_entries:
+                _cache.popitem(last=False)
+    return payload
+
+
+def discard_stale_tiles(version: str) -> int:
+    """Drop encoded tiles built for any dataset version other than ``version``."""
+    with _cache_lock:
+        stale = [cache_key for cache_key in _cache if cache_key[0] != version]
+        for cache_key in stale:
+            del _cache[cache_key]
+    return len(stale)
+
+
+def _tile_cache_stats() -> dict[str, tuple[int, int, int, int | None]]:
+    info = _load_tile_geometry.cache_info()
+    with _cache_lock:
+        return {
+            "vector_tiles": (_cache_hits, _cache_misses, len(_cache), get_max_entries()),
+            "vector_tile_geometry": (info.hits, info.misses, info.currsize, info.maxsize),
+        }
+
+
+register_cache_collector(_tile_cache_stats)
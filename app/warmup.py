@@ -0,0 +1,138 @@
+"""
+Startup warm-up and readiness tracking.
+
+The warm-up builds every data structure and response cache a request could
+otherwise pay for on first use. ``/api/ready`` reports 503 until it finishes so
+load balancers only route traffic to warm workers.
+
+Configuration (environment variables):
+    WARMUP_MODE              blocking (default), background, or off
+    WARMUP_TIMESERIES_FILES  number of district timeseries files to preload
+                             (defaults to the timeseries LRU capacity)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from app.services.real_climate import (
+    _load_district_timeseries_file,
+    _period_values_index,
+    list_district_timeseries_ids,
+    load_districts_geojson,
+    load_map_districts_geojson,
+    load_period_values,
+)
+
+WARMUP_MODES = {"blocking", "background", "off"}
+
+_state_lock = threading.Lock()
+_state: dict[str, Any] = {"status": "pending", "steps": {}}
+
+
+def get_warmup_mode() -> str:
+    mode = (os.getenv("WARMUP_MODE") or "blocking").strip().lower()
+    return mode if mode in WARMUP_MODES else "blocking"
+
+
+def get_timeseries_warmup_limit() -> int:
+    configured = os.getenv("WARMUP_TIMESERIES_FILES")
+    if configured:
+        try:
+            return max(int(configured), 0)
+        except ValueError:
+            pass
+    return _load_district_timeseries_file.cache_info().maxsize or 0
+
+
+def get_warmup_state() -> dict[str, Any]:
+    with _state_lock:
+        return {**_state, "steps": dict(_state["steps"])}
+
+
+def is_ready() -> bool:
+    with _state_lock:
+        return _state["status"] == "ready"
+
+
+def _update_state(**changes: Any) -> None:
+    with _state_lock:
+        _state.update(changes)
+
+
+def _record_step(name: str, started: float, result: Any) -> None:
+    with _state_lock:
+        _state["steps"][name] = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "result": result,
+        }
+
+
+def _warm_data() -> int:
+    rows = load_period_values()
+    _period_values_index()
+    load_districts_geojson()
+    load_map_districts_geojson()
+    return len(rows) if rows is not None else 0
+
+
+def _warm_timeseries() -> int:
+    limit = get_timeseries_warmup_limit()
+    district_ids = list_district_timeseries_ids()[:limit]
+    for district_id in district_ids:
+        _load_district_timeseries_file(district_id)
+    return len(district_ids)
+
+
+def prebuild_responses() -> int:
+    """Populate the response cache for every router that supports prebuilding."""
+    # Imported lazily: the routers import this package's services, not the other way round.
+    from app.routers import climate, districts
+
+    return districts.prebuild_responses() + climate.prebuild_responses()
+
+
+WARMUP_STEPS: tuple[tuple[str, Callable[[], int]], ...] = (
+    ("data", _warm_data),
+    ("timeseries", _warm_timeseries),
+    ("responses", prebuild_responses),
+)
+
+
+def run_warmup() -> None:
+    """Run every warm-up step in order, recording timings and the final status."""
+    _update_state(status="warming", started_at=time.time(), error=None, steps={})
+    try:
+        for name, step in WARMUP_STEPS:
+            started = time.perf_counter()
+            _record_step(name, started, step())
+    except Exception as exc:
+        _update_state(status="failed", finished_at=time.time(), error=repr(exc))
+        raise
+    _update_state(status="ready", finished_at=time.time())
+
+
+def _run_warmup_in_background() -> None:
+    try:
+        run_warmup()
+    except Exception:
+        # Already recorded in the readiness state; keep the worker alive so
+        # /api/health and /api/ready can report it.
+        pass
+
+
+def start_warmup() -> None:
+    """Start the warm-up according to ``WARMUP_MODE``."""
+    if is_ready():
+        # Already warmed in the gunicorn master before this worker was forked (app/preload.py).
+        return
+
+    mode = get_warmup_mode()
+    if mode == "off":
+        _update_state(status="ready", started_at=time.time(), finished_at=time.time())
+    elif mode == "background":
+        threading.Thread(target=_run_warmup_in_background, name="warmup", daemon=True).start()
+    else:
+        run_warmup()
@@ -0,0 +1,530 @@
+"""
+Load-test a running instance by replaying an access log or a synthetic traffic mix.
+
+Traffic sources:
+    --log PATH     replay the GET requests of a uvicorn or nginx access log, in order
+    (default)      a synthetic mix weighted toward the map, compare and timeseries calls
+                   a national-media spike produces; variables and districts are read
+                   from the target instance
+
+Reports throughput, p50/p95/p99 latency of 2xx responses (overall and per request
+kind), status codes and non-2xx counts, and the RSS/PSS of the server's processes
+sampled during the run. Give the server's master PID with --server-pid, or let the
+tool start gunicorn itself with --spawn-workers to compare worker counts for
+render.yaml.
+
+Usage:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --concurrency 32 --duration 60
+    python benchmarks/load_test.py --log uvicorn.log --server-pid 12345 --concurrency 16
+    python benchmarks/load_test.py --spawn-workers 4 --concurrency 64 --output load.json
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import urlencode, urlsplit
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+# Matches the request line in both uvicorn ("GET /path HTTP/1.1" 200) and nginx combined logs.
+LOG_REQUEST_RE = re.compile(r'"GET (?P<path>/\S*) HTTP/[\d.]+"')
+
+# (kind, weight) of the synthetic mix.
+SYNTHETIC_MIX = (
+    ("districts_map", 30),
+    ("compare", 25),
+    ("timeseries", 20),
+    ("climate", 15),
+    ("district_climate", 7),
+    ("range", 3),
+)
+PERIODS = ("2030", "2050", "2080")
+# Scenarios the API accepts per variable, as in _get_valid_scenarios (app/routers/climate.py).
+RCP_SCENARIOS = ("rcp45", "rcp85")
+SEA_LEVEL_SCENARIOS = ("ssp126", "ssp245", "ssp585")
+SEA_LEVEL_VARIABLE = "sea_level_rise"
+PERCENTILES = ("p10", "p50", "p90")
+
+
+@dataclass
+class Result:
+    kind: str
+    status: int
+    seconds: float
+    size: int
+
+
+@dataclass
+class ProcessSample:
+    peak_rss: int = 0
+    last_rss: int = 0
+    last_pss: int | None = None
+    cmdline: str = ""
+
+
+@dataclass
+class RunState:
+    results: list[Result] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(int(round(fraction * len(ordered))) - 1, 0))
+    return ordered[index]
+
+
+def latency_summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def classify(path: str) -> str:
+    """Group a request path into the kind used in the per-kind report."""
+    route = path.split("?", 1)[0].rstrip("/")
+    if route.endswith("/compare"):
+        return "compare"
+    if route.endswith("/timeseries"):
+        return "timeseries"
+    if route.endswith("/range"):
+        return "range"
+    if route == "/api/districts/map":
+        return "districts_map"
+    if route.startswith("/api/districts/") and route.endswith("/climate"):
+        return "district_climate"
+    if route.startswith("/api/climate/variables"):
+        return "variables"
+    if route.startswith("/api/climate/"):
+        return "climate"
+    if route.startswith("/api/districts"):
+        return "districts"
+    return "other"
+
+
+def read_log_paths(path: Path, include_all: bool = False) -> list[str]:
+    paths = []
+    with path.open("r", encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            match = LOG_REQUEST_RE.search(line)
+            if not match:
+                continue
+            request_path = match.group("path")
+            if include_all or request_path.startswith("/api/"):
+                paths.append(request_path)
+    if not paths:
+        raise SystemExit(f"No GET requests found in {path}")
+    return paths
+
+
+def fetch_json(base_url: str, path: str, required: bool = True) -> Any:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            if not required:
+                return None
+            raise SystemExit(f"GET {path} returned {response.status}")
+        return json.loads(body)
+    finally:
+        connection.close()
+
+
+def coastal_districts(base_url: str) -> list[str]:
+    """Districts with sea-level values; the importer only writes them where the grid reaches the coast."""
+    query = urlencode({"period": "2050", "scenario": "ssp245"})
+    payload = fetch_json(base_url, f"/api/climate/{SEA_LEVEL_VARIABLE}?{query}", required=False)
+    return [item["district_id"] for item in payload["data"]] if payload else []
+
+
+def synthetic_paths(base_url: str, seed: int) -> Iterator[str]:
+    """Yield an endless weighted mix of realistic request paths."""
+    variables = [item["id"] for item in fetch_json(base_url, "/api/climate/variables")]
+    districts = [item["id"] for item in fetch_json(base_url, "/api/districts/list")]
+    if not variables or not districts:
+        raise SystemExit("Target instance has no variables or districts to request")
+    # Sea-level timeseries exist for coastal districts only; inland ones return 404.
+    coastal = coastal_districts(base_url) if SEA_LEVEL_VARIABLE in variables else []
+    timeseries_variables = [variable for variable in variables if variable != SEA_LEVEL_VARIABLE or coastal]
+    if not timeseries_variables:
+        timeseries_variables = variables
+
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in SYNTHETIC_MIX]
+    weights = [weight for _, weight in SYNTHETIC_MIX]
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        variable = rng.choice(timeseries_variables if kind == "timeseries" else variables)
+        scenarios = SEA_LEVEL_SCENARIOS if variable == SEA_LEVEL_VARIABLE else RCP_SCENARIOS
+        query = {
+            "period": rng.choice(PERIODS),
+            "scenario": rng.choice(scenarios),
+            "percentile": rng.choice(PERCENTILES),
+        }
+        if kind == "districts_map":
+            yield "/api/districts/map"
+        elif kind == "compare":
+            yield f"/api/climate/{variable}/compare?{urlencode(query)}"
+        elif kind == "timeseries":
+            district = rng.choice(coastal if variable == SEA_LEVEL_VARIABLE and coastal else districts)
+            query = {"district_id": district, "scenario": query["scenario"]}
+            yield f"/api/climate/{variable}/timeseries?{urlencode(query)}"
+        elif kind == "climate":
+            yield f"/api/climate/{variable}?{urlencode(query)}"
+        elif kind == "district_climate":
+            yield f"/api/districts/{rng.choice(districts)}/climate?{urlencode({'variable': variable, **query})}"
+        else:
+            yield f"/api/climate/{variable}/range?{urlencode(query)}"
+
+
+def _process_tree(root_pid: int) -> dict[int, str]:
+    """Return {pid: cmdline} for ``root_pid`` and all of its descendants."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return {}
+        tree = {}
+        for process in processes:
+            try:
+                tree[process.pid] = " ".join(process.cmdline())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return tree
+
+    children: dict[int, list[int]] = defaultdict(list)
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # The command name in field 2 may contain spaces; the parent PID follows the closing paren.
+            stat = (entry / "stat").read_text()
+            parent = int(stat[stat.rindex(")") + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        children[parent].append(int(entry.name))
+
+    tree = {}
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        try:
+            tree[pid] = (Path("/proc") / str(pid) / "cmdline").read_bytes().replace(b"\0", b" ").decode().strip()
+        except OSError:
+            continue
+        pending.extend(children.get(pid, []))
+    return tree
+
+
+def _memory(pid: int) -> tuple[int, int | None] | None:
+    """Return (rss, pss) in bytes; PSS counts copy-on-write pages shared with the master once."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            info = psutil.Process(pid).memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        return info.rss, getattr(info, "pss", None)
+
+    proc = Path("/proc") / str(pid)
+    try:
+        status = (proc / "status").read_text()
+    except OSError:
+        return None
+    rss_match = re.search(r"^VmRSS:\s+(\d+) kB", status, re.MULTILINE)
+    if rss_match is None:
+        return None
+    pss = None
+    try:
+        pss_match = re.search(r"^Pss:\s+(\d+) kB", (proc / "smaps_rollup").read_text(), re.MULTILINE)
+        if pss_match:
+            pss = int(pss_match.group(1)) * 1024
+    except OSError:
+        pass
+    return int(rss_match.group(1)) * 1024, pss
+
+
+class MemorySampler(threading.Thread):
+    def __init__(self, root_pid: int, interval: float = 1.0):
+        super().__init__(name="memory-sampler", daemon=True)
+        self.root_pid = root_pid
+        self.interval = interval
+        self.samples: dict[int, ProcessSample] = {}
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        for pid, cmdline in _process_tree(self.root_pid).items():
+            memory = _memory(pid)
+            if memory is None:
+                continue
+            rss, pss = memory
+            entry = self.samples.setdefault(pid, ProcessSample(cmdline=cmdline))
+            entry.peak_rss = max(entry.peak_rss, rss)
+            entry.last_rss = rss
+            entry.last_pss = pss
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+def worker(
+    base_url: str,
+    paths: Iterator[str],
+    paths_lock: threading.Lock,
+    deadline: float,
+    budget: list[int],
+    state: RunState,
+    accept_encoding: str,
+) -> None:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    try:
+        while time.monotonic() < deadline:
+            with paths_lock:
+                if budget[0] == 0:
+                    return
+                budget[0] -= 1
+                try:
+                    path = next(paths)
+                except StopIteration:
+                    return
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                size = len(response.read())
+            except (OSError, http.client.HTTPException) as exc:
+                with state.lock:
+                    state.errors[type(exc).__name__] += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+                continue
+            elapsed = time.perf_counter() - started
+            with state.lock:
+                state.results.append(Result(classify(path), response.status, elapsed, size))
+    finally:
+        connection.close()
+
+
+def run_load(
+    base_url: str,
+    paths: Iterator[str],
+    *,
+    concurrency: int,
+    duration: float,
+    max_requests: int | None,
+    accept_encoding: str,
+) -> tuple[RunState, float]:
+    state = RunState()
+    paths_lock = threading.Lock()
+    # -1 never reaches zero, i.e. no request limit.
+    budget = [max_requests if max_requests is not None else -1]
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker, base_url, paths, paths_lock, deadline, budget, state, accept_encoding)
+    return state, time.perf_counter() - started
+
+
+def succeeded(result: Result) -> bool:
+    return 200 <= result.status < 300
+
+
+def build_report(state: RunState, elapsed: float, sampler: MemorySampler | None, args: argparse.Namespace) -> dict[str, Any]:
+    by_kind: dict[str, list[Result]] = defaultdict(list)
+    for result in state.results:
+        by_kind[result.kind].append(result)
+
+    report: dict[str, Any] = {
+        "target": args.url,
+        "source": str(args.log) if args.log else "synthetic",
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "requests": len(state.results),
+        "throughput_rps": round(len(state.results) / elapsed, 1) if elapsed else 0.0,
+        # Error responses are often answered early (400/404) and would flatter the percentiles.
+        "latency": latency_summary([result.seconds for result in state.results if succeeded(result)]),
+        "status_codes": dict(Counter(str(result.status) for result in state.results)),
+        "error_responses": sum(1 for result in state.results if not succeeded(result)),
+        "errors": dict(state.errors),
+        "bytes_received": sum(result.size for result in state.results),
+        "by_kind": {
+            kind: {
+                "requests": len(results),
+                "error_responses": sum(1 for result in results if not succeeded(result)),
+                **latency_summary([result.seconds for result in results if succeeded(result)]),
+            }
+            for kind, results in sorted(by_kind.items())
+        },
+    }
+    if sampler is not None:
+        report["processes"] = [
+            {
+                "pid": pid,
+                "role": "master" if pid == sampler.root_pid else "worker",
+                "peak_rss_mb": round(sample.peak_rss / 1024 / 1024, 1),
+                "rss_mb": round(sample.last_rss / 1024 / 1024, 1),
+                "pss_mb": round(sample.last_pss / 1024 / 1024, 1) if sample.last_pss is not None else None,
+            }
+            for pid, sample in sorted(sampler.samples.items())
+        ]
+    return report
+
+
+def print_report(report: dict[str, Any]) -> None:
+    latency = report["latency"]
+    print(
+        f"{report['requests']} requests in {report['elapsed_s']}s at concurrency {report['concurrency']}: "
+        f"{report['throughput_rps']} req/s, p50 {latency['p50_ms']} ms, "
+        f"p95 {latency['p95_ms']} ms, p99 {latency['p99_ms']} ms (2xx responses only)"
+    )
+    print(
+        f"status codes: {report['status_codes']}, non-2xx responses: {report['error_responses']}"
+        + (f", errors: {report['errors']}" if report["errors"] else "")
+    )
+    print(f"{'kind':<18}{'requests':>10}{'non-2xx':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, stats in report["by_kind"].items():
+        print(
+            f"{kind:<18}{stats['requests']:>10}{stats['error_responses']:>10}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    for process in report.get("processes", []):
+        pss = f", PSS {process['pss_mb']} MB" if process["pss_mb"] is not None else ""
+        print(f"{process['role']} {process['pid']}: RSS {process['rss_mb']} MB (peak {process['peak_rss_mb']} MB){pss}")
+
+
+def wait_until_ready(base_url: str, timeout: float, process: subprocess.Popen) -> None:
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode} before becoming ready")
+        try:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+            connection.request("GET", "/api/ready")
+            if connection.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.5)
+    raise SystemExit(f"Server not ready after {timeout:.0f}s")
+
+
+def spawn_server(base_url: str, workers: int) -> subprocess.Popen:
+    parts = urlsplit(base_url)
+    command = [
+        sys.executable, "-m", "gunicorn", "app.main:app",
+        "-c", "gunicorn.conf.py",
+        "--workers", str(workers),
+        "--bind", f"{parts.hostname}:{parts.port or 80}",
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_ROOT, env={**os.environ, "APP_ENV": "production"})
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic traffic against the API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the instance under test")
+    parser.add_argument("--log", type=Path, help="uvicorn/nginx access log to replay (default: synthetic mix)")
+    parser.add_argument("--include-non-api", action="store_true", help="Also replay logged paths outside /api/")
+    parser.add_argument("--shuffle", action="store_true", help="Shuffle the replayed log instead of keeping its order")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--accept-encoding", default="br, gzip", help="Accept-Encoding header ('' to disable)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server-pid", type=int, help="Master PID whose process tree is sampled for RSS")
+    parser.add_argument("--spawn-workers", type=int, help="Start gunicorn with this many workers at --url")
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    server = None
+    if args.spawn_workers:
+        server = spawn_server(args.url, args.spawn_workers)
+        args.server_pid = server.pid
+    try:
+        if server is not None:
+            wait_until_ready(args.url, args.ready_timeout, server)
+
+        if args.log:
+            logged = read_log_paths(args.log, args.include_non_api)
+            if args.shuffle:
+                random.Random(args.seed).shuffle(logged)
+            paths: Iterator[str] = cycle(logged)
+        else:
+            paths = synthetic_paths(args.url, args.seed)
+
+        sampler = MemorySampler(args.server_pid) if args.server_pid else None
+        if sampler is not None:
+            sampler.sample()
+            sampler.start()
+        state, elapsed = run_load(
+            args.url,
+            paths,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_requests=args.requests,
+            accept_encoding=args.accept_encoding,
+        )
+        if sampler is not None:
+            sampler.stop()
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    report = build_report(state, elapsed, sampler, args)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Benchmark the service layer and HTTP endpoints against synthetic production-scale data.
+
+Measures:
+    cold_start.*   fresh-process import of app.main plus the startup warm-up
+    load.*         CSV parse, period index build and full dataset build
+    service.*      each build_real_* / get_real_* function
+    endpoint.*     end-to-end latency through the ASGI app (in-process, no network),
+                   with the response cache warm ("cached") and cleared ("uncached")
+
+Results are written as JSON. Pass --compare with an earlier result to fail
+(exit status 1) when any median regresses by more than --max-regression.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --max-regression 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from synthetic_data import SyntheticParams, build_districts, generate  # noqa: E402
+
+DEFAULT_DATA_DIR = BACKEND_ROOT / ".bench" / "processed"
+SAMPLE_VARIABLE = "annual_mean_temp"
+
+COLD_START_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.warmup import get_warmup_state, run_warmup
+run_warmup()
+finished = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "warmup": finished - imported,
+    "total": finished - started,
+    "steps": {name: step["seconds"] for name, step in get_warmup_state()["steps"].items()},
+}))
+"""
+
+
+def summarize(samples: list[float]) -> dict[str, float | int]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, max(int(round(0.95 * len(ordered))) - 1, 0))
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[p95_index] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int, *, setup: Callable[[], Any] | None = None) -> dict[str, float | int]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def measure_async(
+    func: Callable[[], Awaitable[Any]],
+    repeat: int,
+    *,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, float | int]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def asgi_get(app: Any, path: str, query: str = "", headers: dict[str, str] | None = None) -> tuple[int, bytes]:
+    """Issue a GET request straight into an ASGI app and return (status, body)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "root_path": "",
+        "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (headers or {}).items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+    body = bytearray()
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, bytes(body)
+
+
+def endpoint_cases(district_id: str) -> dict[str, tuple[str, str]]:
+    return {
+        "districts_map": ("/api/districts/map", ""),
+        "districts": ("/api/districts", ""),
+        "climate": (f"/api/climate/{SAMPLE_VARIABLE}", "period=2050&scenario=rcp45&percentile=p50"),
+        "compare": (f"/api/climate/{SAMPLE_VARIABLE}/compare", "period=2050&scenario=rcp85&percentile=p50"),
+        "range": (f"/api/climate/{SAMPLE_VARIABLE}/range", "period=2050&scenario=rcp45"),
+        "timeseries": (f"/api/climate/{SAMPLE_VARIABLE}/timeseries", f"district_id={district_id}&scenario=rcp45"),
+        "district_climate": (
+            f"/api/districts/{district_id}/climate",
+            f"variable={SAMPLE_VARIABLE}&period=2050&scenario=rcp45&percentile=p50",
+        ),
+    }
+
+
+def bench_cold_start(env: dict[str, str], runs: int) -> dict[str, Any]:
+    results: dict[str, list[float]] = {}
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", COLD_START_SNIPPET],
+            cwd=BACKEND_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings = json.loads(completed.stdout.strip().splitlines()[-1])
+        for name in ("import", "warmup", "total"):
+            results.setdefault(name, []).append(timings[name])
+        for name, seconds in timings["steps"].items():
+            results.setdefault(f"warmup_{name}", []).append(seconds)
+    return {f"cold_start.{name}": summarize(samples) for name, samples in results.items()}
+
+
+def bench_load(repeat: int) -> dict[str, Any]:
+    from app.services import real_climate
+
+    rows = real_climate._read_period_values()
+    return {
+        "load.period_values_csv": measure(real_climate._read_period_values, repeat),
+        "load.period_values_index": measure(lambda: real_climate._build_period_values_index(rows), repeat),
+        "load.dataset": measure(real_climate.build_dataset, repeat),
+    }
+
+
+def bench_service(repeat: int, district_id: str, region: str) -> dict[str, Any]:
+    from app.services import real_climate
+
+    real_climate.activate_dataset(real_climate.build_dataset())
+    clear_timeseries = real_climate._load_district_timeseries_file.cache_clear
+    return {
+        "service.build_real_climate_response": measure(
+            lambda: real_climate.build_real_climate_response(SAMPLE_VARIABLE, "2050", "rcp45", "p50"), repeat
+        ),
+        "service.build_real_climate_comparison": measure(
+            lambda: real_climate.build_real_climate_comparison(SAMPLE_VARIABLE, "2050", "rcp45", "p50"), repeat
+        ),
+        "service.build_real_climate_timeseries.cold_file": measure(
+            lambda: real_climate.build_real_climate_timeseries(SAMPLE_VARIABLE, district_id, "rcp45"),
+            repeat,
+            setup=clear_timeseries,
+        ),
+        "service.build_real_climate_timeseries.warm_file": measure(
+            lambda: real_climate.build_real_climate_timeseries(SAMPLE_VARIABLE, district_id, "rcp45"), repeat
+        ),
+        "service.build_real_district_climate": measure(
+            lambda: real_climate.build_real_district_climate(district_id), repeat
+        ),
+        "service.get_real_grid_point_count": measure(
+            lambda: real_climate.get_real_grid_point_count(district_id, SAMPLE_VARIABLE, "2050", "rcp45", "p50"), repeat
+        ),
+        "service.get_real_district": measure(lambda: real_climate.get_real_district(district_id), repeat),
+        "service.get_real_district_feature_collection.region": measure(
+            lambda: real_climate.get_real_district_feature_collection(region), repeat
+        ),
+    }
+
+
+async def bench_endpoints(repeat: int, district_id: str) -> dict[str, Any]:
+    from app.main import app
+    from app.services.response_cache import clear_response_cache
+    from app.warmup import run_warmup
+
+    run_warmup()
+    headers = {"accept-encoding": "br, gzip"}
+    results: dict[str, Any] = {}
+    for name, (path, query) in endpoint_cases(district_id).items():
+        status, body = await asgi_get(app, path, query, headers)
+        if status != 200:
+            raise RuntimeError(f"{path}?{query} returned {status}: {body[:200]!r}")
+
+        async def call(path: str = path, query: str = query) -> None:
+            await asgi_get(app, path, query, headers)
+
+        results[f"endpoint.{name}.cached"] = {**await measure_async(call, repeat), "bytes": len(body)}
+        results[f"endpoint.{name}.uncached"] = await measure_async(call, repeat, setup=clear_response_cache)
+    return results
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    regressions = []
+    for name, stats in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        ratio = stats["median_ms"] / previous["median_ms"] - 1
+        if ratio > max_regression:
+            regressions.append(
+                f"{name}: median {previous['median_ms']:.3f} ms -> {stats['median_ms']:.3f} ms (+{ratio:.0%})"
+            )
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the climate service layer and endpoints.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Synthetic processed data directory")
+    parser.add_argument("--repeat", type=int, default=30, help="Iterations per in-process benchmark")
+    parser.add_argument("--load-repeat", type=int, default=3, help="Iterations for the data-loading benchmarks")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Fresh processes for the cold-start benchmark")
+    parser.add_argument("--only", choices=["cold_start", "load", "service", "endpoint"], action="append")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dataset_summary = generate(args.data_dir, SyntheticParams())
+
+    # Point the app at the synthetic data before any app module resolves its paths.
+    os.environ["CLIMATE_PROCESSED_DIR"] = str(args.data_dir)
+    for name in ("CLIMATE_DISTRICTS_PATH", "CLIMATE_MAP_DISTRICTS_PATH", "CLIMATE_PERIOD_VALUES_PATH",
+                 "CLIMATE_YEARLY_VALUES_PATH", "CLIMATE_DISTRICT_TIMESERIES_DIR"):
+        os.environ.pop(name, None)
+    os.environ["APP_ENV"] = "production"
+    os.environ["PROFILE_THRESHOLD_MS"] = "0"
+
+    # A mid-grid district: not coastal, and its region has a representative number of districts.
+    districts = build_districts(SyntheticParams())
+    sample_district = districts[len(districts) // 2]
+    suites = set(args.only or ["cold_start", "load", "service", "endpoint"])
+
+    results: dict[str, Any] = {}
+    if "cold_start" in suites:
+        results.update(bench_cold_start(dict(os.environ), args.cold_runs))
+    if "load" in suites:
+        results.update(bench_load(args.load_repeat))
+    if "service" in suites:
+        results.update(bench_service(args.repeat, sample_district.district_id, sample_district.region))
+    if "endpoint" in suites:
+        results.update(asyncio.run(bench_endpoints(args.repeat, sample_district.district_id)))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "dataset": dataset_summary,
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare_results(report, json.loads(args.compare.read_text(encoding="utf-8")), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
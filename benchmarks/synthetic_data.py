@@ -0,0 +1,357 @@
+"""
+Generate synthetic processed artifacts at production scale for benchmarking.
+
+The layout mirrors what scripts/import_real_climate_data.py and
+scripts/precompute_district_timeseries.py produce: one row set per RCP source
+file (so baseline/historical rows are repeated across scenarios exactly like the
+real import), coastal-only sea-level rows, ~1 MB of district GeoJSON with shared
+borders between neighbours, and one gzipped timeseries JSON per district.
+
+With the defaults this yields 259 districts, ~94k period rows and ~3.2M yearly
+rows. Output is deterministic for a given set of parameters and is reused when a
+matching generation already exists.
+
+Usage:
+    python benchmarks/synthetic_data.py --output-dir .bench/processed
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import json
+import math
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+CLIMATE_VARIABLES = {
+    "annual_mean_temp": "°C",
+    "annual_precipitation": "mm/year",
+    "mean_temp_apr_may_jun": "°C",
+    "mean_temp_dry_season": "°C",
+    "mean_temp_jul_aug_sep": "°C",
+    "mean_temp_sep_oct_nov": "°C",
+    "precipitation_apr_may_jun": "mm",
+    "precipitation_dec_jan_feb": "mm",
+    "precipitation_jul_aug_sep": "mm",
+    "precipitation_sep_oct_nov": "mm",
+}
+RCP_SCENARIOS = ("rcp26", "rcp45", "rcp85")
+SSP_SCENARIOS = ("ssp126", "ssp245", "ssp585")
+PERCENTILES = ("p10", "p50", "p90")
+FUTURE_PERIODS = ("2030", "2050", "2080")
+REGIONS = (
+    "Ahafo", "Ashanti", "Bono", "Bono East", "Central", "Eastern", "Greater Accra", "North East",
+    "Northern", "Oti", "Savannah", "Upper East", "Upper West", "Volta", "Western", "Western North",
+)
+# Ghana bounding box, as used by the mock geometry in app/routers/districts.py.
+MIN_LNG, MAX_LNG, MIN_LAT, MAX_LAT = -3.3, 1.2, 3.3, 11.2
+BASELINE_END_YEAR = 2020
+LAST_YEAR = 2100
+PERIOD_COLUMNS = (
+    "district_id", "district_name", "region", "value", "grid_point_count", "unit",
+    "variable", "period", "scenario", "percentile",
+)
+YEARLY_COLUMNS = (
+    "district_id", "district_name", "region", "value", "grid_point_count", "unit",
+    "variable", "year", "scenario", "percentile",
+)
+MARKER_NAME = ".synthetic.json"
+
+
+@dataclass(frozen=True)
+class SyntheticParams:
+    districts: int = 259
+    coastal_districts: int = 31
+    first_year: int = 1966
+    # Vertices per district edge; ~55 gives a ~1 MB districts.geojson for 259 districts.
+    edge_vertices: int = 55
+    map_vertex_step: int = 4
+    seed: int = 7
+
+
+@dataclass(frozen=True)
+class SyntheticDistrict:
+    index: int
+    district_id: str
+    name: str
+    region: str
+    coastal: bool
+
+
+def _noise(*parts: float) -> float:
+    """Cheap deterministic noise in [-1, 1]."""
+    value = math.sin(sum(part * (12.9898 + 4.1414 * position) for position, part in enumerate(parts)) + 78.233)
+    return math.modf(value * 43758.5453)[0]
+
+
+def _grid_shape(count: int) -> tuple[int, int]:
+    columns = max(math.ceil(math.sqrt(count * (MAX_LNG - MIN_LNG) / (MAX_LAT - MIN_LAT))), 1)
+    rows = math.ceil(count / columns)
+    return columns, rows
+
+
+def build_districts(params: SyntheticParams) -> list[SyntheticDistrict]:
+    districts = []
+    for index in range(params.districts):
+        region = REGIONS[index % len(REGIONS)]
+        name = f"Synthetic District {index + 1:03d}"
+        districts.append(
+            SyntheticDistrict(
+                index=index,
+                district_id=f"GH-{region[:3].upper()}-SYN{index + 1:03d}",
+                name=name,
+                region=region,
+                # The southern row of the grid stands in for the coast.
+                coastal=index < params.coastal_districts,
+            )
+        )
+    return districts
+
+
+def _edge(start: tuple[int, int], end: tuple[int, int], params: SyntheticParams, cell: tuple[float, float]) -> list[list[float]]:
+    """Jittered lattice edge from ``start`` to ``end`` (grid corner indices).
+
+    The jitter depends only on the lattice position, so neighbouring districts
+    produce identical coordinates for their shared border.
+    """
+    (x0, y0), (x1, y1) = start, end
+    width, height = cell
+    steps = params.edge_vertices
+    points = []
+    reverse = (x1, y1) < (x0, y0)
+    a, b = ((x1, y1), (x0, y0)) if reverse else ((x0, y0), (x1, y1))
+    for step in range(steps + 1):
+        t = step / steps
+        gx = a[0] + (b[0] - a[0]) * t
+        gy = a[1] + (b[1] - a[1]) * t
+        jitter = 0.0 if step in (0, steps) else _noise(gx * steps, gy * steps, params.seed) * 0.15
+        if a[0] == b[0]:
+            lng, lat = MIN_LNG + (gx + jitter) * width, MIN_LAT + gy * height
+        else:
+            lng, lat = MIN_LNG + gx * width, MIN_LAT + (gy + jitter) * height
+        points.append([round(lng, 5), round(lat, 5)])
+    return points[::-1] if reverse else points
+
+
+def build_geojson(districts: list[SyntheticDistrict], params: SyntheticParams, vertex_step: int = 1) -> dict:
+    columns, rows = _grid_shape(len(districts))
+    cell = ((MAX_LNG - MIN_LNG) / columns, (MAX_LAT - MIN_LAT) / rows)
+    features = []
+    for district in districts:
+        col, row = district.index % columns, district.index // columns
+        corners = [(col, row), (col + 1, row), (col + 1, row + 1), (col, row + 1)]
+        ring: list[list[float]] = []
+        for start, end in zip(corners, corners[1:] + corners[:1]):
+            ring.extend(_edge(start, end, params, cell)[:-1])
+        ring = ring[::vertex_step]
+        ring.append(ring[0])
+        centroid = [MIN_LNG + (col + 0.5) * cell[0], MIN_LAT + (row + 0.5) * cell[1]]
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {
+                    "id": district.district_id,
+                    "name": district.name,
+                    "region": district.region,
+                    "centroid": centroid,
+                },
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _base_value(variable: str, district: SyntheticDistrict) -> float:
+    if variable == "sea_level_rise":
+        return 0.0
+    if "temp" in variable:
+        return 26.0 + 2.5 * _noise(district.index, 1.0)
+    if variable == "annual_precipitation":
+        return 1200.0 + 300.0 * _noise(district.index, 2.0)
+    return 300.0 + 80.0 * _noise(district.index, 3.0, len(variable))
+
+
+def _trend(variable: str, scenario: str) -> float:
+    strength = {"rcp26": 0.5, "rcp45": 1.0, "rcp85": 2.0, "ssp126": 0.6, "ssp245": 1.0, "ssp585": 1.8}.get(scenario, 0.0)
+    if variable == "sea_level_rise":
+        return 0.6 * strength
+    if "temp" in variable:
+        return 0.025 * strength
+    return -0.4 * strength
+
+
+def _percentile_offset(variable: str, percentile: str) -> float:
+    spread = 0.6 if "temp" in variable else (3.0 if variable == "sea_level_rise" else 40.0)
+    return {"p10": -spread, "p50": 0.0, "p90": spread}[percentile]
+
+
+def value_for(variable: str, district: SyntheticDistrict, scenario: str, year: int, percentile: str) -> float:
+    years_ahead = max(year - BASELINE_END_YEAR, 0)
+    value = _base_value(variable, district) + _trend(variable, scenario) * years_ahead
+    value += _percentile_offset(variable, percentile) * (1 + years_ahead / 80)
+    if variable != "sea_level_rise":
+        value += _noise(district.index, year, len(variable)) * (0.3 if "temp" in variable else 25.0)
+    return round(value, 6)
+
+
+def _period_year(period: str) -> int:
+    return {"baseline": 2005, "2030": 2030, "2050": 2050, "2080": 2090}[period]
+
+
+def iter_period_rows(districts: list[SyntheticDistrict]):
+    # One block per RCP source file, each with its own baseline rows, as the importer emits them.
+    for variable, unit in CLIMATE_VARIABLES.items():
+        for source_scenario in RCP_SCENARIOS:
+            for period in ("baseline", *FUTURE_PERIODS):
+                scenario = "historical" if period == "baseline" else source_scenario
+                for percentile in PERCENTILES:
+                    for district in districts:
+                        value = value_for(variable, district, scenario, _period_year(period), percentile)
+                        yield (district.district_id, district.name, district.region, value, 64, unit,
+                               variable, period, scenario, percentile)
+
+    coastal = [district for district in districts if district.coastal]
+    for percentile in PERCENTILES:
+        for district in coastal:
+            yield (district.district_id, district.name, district.region, 0.0, "", "cm",
+                   "sea_level_rise", "baseline", "historical", percentile)
+    for scenario in SSP_SCENARIOS:
+        for percentile in PERCENTILES:
+            for period in FUTURE_PERIODS:
+                for district in coastal:
+                    value = value_for("sea_level_rise", district, scenario, _period_year(period), percentile)
+                    yield (district.district_id, district.name, district.region, value, 4, "cm",
+                           "sea_level_rise", period, scenario, percentile)
+
+
+def _yearly_series(params: SyntheticParams):
+    """Yield (variable, unit, source scenario, year, scenario label) in importer order."""
+    for variable, unit in CLIMATE_VARIABLES.items():
+        for source_scenario in RCP_SCENARIOS:
+            for year in range(params.first_year, LAST_YEAR + 1):
+                scenario = "historical" if year <= BASELINE_END_YEAR else source_scenario
+                yield variable, unit, year, scenario
+
+
+def iter_yearly_rows(districts: list[SyntheticDistrict], params: SyntheticParams):
+    for variable, unit, year, scenario in _yearly_series(params):
+        for percentile in PERCENTILES:
+            for district in districts:
+                value = value_for(variable, district, scenario, year, percentile)
+                yield (district.district_id, district.name, district.region, value, 64, unit,
+                       variable, year, scenario, percentile)
+
+    coastal = [district for district in districts if district.coastal]
+    for percentile in PERCENTILES:
+        for year in range(1991, BASELINE_END_YEAR + 1):
+            for district in coastal:
+                yield (district.district_id, district.name, district.region, 0.0, "", "cm",
+                       "sea_level_rise", year, "historical", percentile)
+    for scenario in SSP_SCENARIOS:
+        for percentile in PERCENTILES:
+            for year in range(BASELINE_END_YEAR + 1, LAST_YEAR + 1):
+                for district in coastal:
+                    value = value_for("sea_level_rise", district, scenario, year, percentile)
+                    yield (district.district_id, district.name, district.region, value, 4, "cm",
+                           "sea_level_rise", year, scenario, percentile)
+
+
+def build_timeseries_payload(district: SyntheticDistrict, params: SyntheticParams) -> dict:
+    variables: dict[str, dict[str, list[dict]]] = {}
+    series: list[tuple[str, str, tuple[str, ...], int]] = [
+        (variable, unit, RCP_SCENARIOS, params.first_year) for variable, unit in CLIMATE_VARIABLES.items()
+    ]
+    if district.coastal:
+        series.append(("sea_level_rise", "cm", SSP_SCENARIOS, 1991))
+
+    for variable, unit, scenarios, first_year in series:
+        block: dict[str, list[dict]] = {}
+        for scenario in ("historical", *scenarios):
+            years = (
+                range(first_year, BASELINE_END_YEAR + 1)
+                if scenario == "historical"
+                else range(BASELINE_END_YEAR + 1, LAST_YEAR + 1)
+            )
+            block[scenario] = [
+                {
+                    "year": year,
+                    **{p: value_for(variable, district, scenario, year, p) for p in PERCENTILES},
+                    "unit": unit,
+                }
+                for year in years
+            ]
+        variables[variable] = block
+    return {"district_id": district.district_id, "district_name": district.name, "variables": variables}
+
+
+def _write_csv(path: Path, columns: tuple[str, ...], rows, *, compress: bool) -> int:
+    opener = gzip.open(path, "wt", encoding="utf-8", newline="") if compress else path.open("w", encoding="utf-8", newline="")
+    count = 0
+    with opener as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def generate(output_dir: Path, params: SyntheticParams = SyntheticParams(), *, force: bool = False) -> dict:
+    """Write the synthetic processed directory and return its summary."""
+    marker = output_dir / MARKER_NAME
+    if not force and marker.exists():
+        summary = json.loads(marker.read_text(encoding="utf-8"))
+        if summary.get("params") == asdict(params):
+            return summary
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timeseries_dir = output_dir / "district_timeseries"
+    timeseries_dir.mkdir(exist_ok=True)
+    districts = build_districts(params)
+
+    (output_dir / "districts.geojson").write_text(
+        json.dumps(build_geojson(districts, params), separators=(",", ":")), encoding="utf-8"
+    )
+    (output_dir / "districts_map.geojson").write_text(
+        json.dumps(build_geojson(districts, params, params.map_vertex_step), separators=(",", ":")), encoding="utf-8"
+    )
+    period_rows = _write_csv(
+        output_dir / "climate_period_values.csv", PERIOD_COLUMNS, iter_period_rows(districts), compress=False
+    )
+    yearly_rows = _write_csv(
+        output_dir / "climate_yearly_values.csv.gz", YEARLY_COLUMNS, iter_yearly_rows(districts, params), compress=True
+    )
+    for district in districts:
+        with gzip.open(timeseries_dir / f"{district.district_id}.json.gz", "wt", encoding="utf-8") as handle:
+            json.dump(build_timeseries_payload(district, params), handle, separators=(",", ":"))
+
+    summary = {
+        "params": asdict(params),
+        "district_count": len(districts),
+        "period_rows": period_rows,
+        "yearly_rows": yearly_rows,
+        "districts_geojson_bytes": (output_dir / "districts.geojson").stat().st_size,
+        "districts_map_geojson_bytes": (output_dir / "districts_map.geojson").stat().st_size,
+    }
+    marker.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate synthetic processed climate artifacts.")
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument("--districts", type=int, default=SyntheticParams.districts)
+    parser.add_argument("--first-year", type=int, default=SyntheticParams.first_year)
+    parser.add_argument("--force", action="store_true", help="Regenerate even if matching output exists")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    params = SyntheticParams(districts=args.districts, first_year=args.first_year)
+    print(json.dumps(generate(args.output_dir, params, force=args.force), indent=2))
+
+
+if __name__ == "__main__":
+    main()
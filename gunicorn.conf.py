@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for production.
+
+The processed climate data is loaded once in the master (see app/preload.py)
+and shared copy-on-write with the workers, so adding workers costs far less
+memory than a full per-worker copy of the data.
+
+    gunicorn app.main:app -c gunicorn.conf.py --bind 0.0.0.0:$PORT
+"""
+import os
+
+from app.preload import prepare_master, prepare_worker, preload_shared_data
+
+# Each worker holds its own dataset; its watcher is what makes new imports and
+# POST /api/admin/reload (which only runs in one worker) reach all of them.
+os.environ.setdefault("CLIMATE_DATA_WATCH_INTERVAL", "10")
+
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120
+preload_app = True
+
+prepare_master()
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any worker is forked.
+    preload_shared_data()
+
+
+def post_fork(server, worker):
+    prepare_worker()
@@ -0,0 +1,353 @@
+"""
+Convert the district layer to TopoJSON: every border is stored once as a shared
+arc, coordinates are quantized to integers and delta-encoded.
+
+Shared borders are found the same way as in extract_coastline.py: ring edges are
+keyed by their rounded endpoints and indexed by the districts that own them. A
+vertex where the set of owning districts changes is a junction; rings are cut at
+junctions into arcs, and an arc traversed by two districts (in opposite
+directions) is stored once and referenced from both. Arcs are simplified with
+their junction endpoints fixed, so neighbouring districts can never drift apart.
+
+Douglas-Peucker on single arcs does not preserve topology, so the quantized
+result is decoded and checked with shapely: every arc of a district that comes
+out invalid (self-intersection, collapsed ring) is restored to full detail, and
+the check repeats until every district decodes to a valid polygon.
+
+Usage:
+    python backend/scripts/build_topojson.py [--tolerance 0.001] [--quantization 100000]
+
+Input:
+    backend/app/data/processed/districts.geojson
+
+Output:
+    backend/app/data/processed/districts.topojson
+"""
+
+import argparse
+import json
+import math
+import os
+from collections import defaultdict
+from pathlib import Path
+
+try:
+    from shapely.geometry import shape
+except ImportError:
+    print("ERROR: shapely is required. Install with: pip install shapely")
+    raise SystemExit(1)
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "app" / "data" / "processed"
+GEOJSON_PATH = DATA_DIR / "districts.geojson"
+TOPOJSON_PATH = DATA_DIR / "districts.topojson"
+
+TOLERANCE = 0.001        # same as districts_map.geojson; 0 keeps every vertex
+QUANTIZATION = 100_000   # grid steps across the bounding box (~1 m for Ghana)
+KEY_PRECISION = 6        # decimal places used to match vertices between districts
+
+
+def round_coord(c, precision=KEY_PRECISION):
+    """Round a coordinate to given decimal places for matching."""
+    return (round(c[0], precision), round(c[1], precision))
+
+
+def make_edge_key(a, b):
+    """Create a canonical edge key (sorted tuple) for deduplication."""
+    return tuple(sorted([a, b]))
+
+
+def polygons_of(geometry):
+    """The polygons (lists of rings) of a Polygon or MultiPolygon geometry."""
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def ring_points(ring):
+    """Rounded ring vertices without the closing duplicate or repeated points."""
+    points = []
+    for coord in ring:
+        point = round_coord(coord)
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+
+def find_junctions(rings, ring_owner):
+    """Vertices where the set of districts sharing consecutive edges changes."""
+    edge_owners = defaultdict(set)
+    for ring, owner in zip(rings, ring_owner):
+        for i, point in enumerate(ring):
+            edge_owners[make_edge_key(point, ring[(i + 1) % len(ring)])].add(owner)
+
+    junctions = set()
+    for ring in rings:
+        count = len(ring)
+        for i, point in enumerate(ring):
+            before = edge_owners[make_edge_key(ring[i - 1], point)]
+            after = edge_owners[make_edge_key(point, ring[(i + 1) % count])]
+            if before != after:
+                junctions.add(point)
+    return junctions
+
+
+def canonical_ring(points):
+    """Rotation- and direction-independent form of a ring with no junction (closed)."""
+    def rotated(sequence):
+        start = sequence.index(min(sequence))
+        return sequence[start:] + sequence[:start]
+
+    forward = rotated(points)
+    backward = rotated(points[::-1])
+    return (forward if forward <= backward else backward) + [min(points)]
+
+
+def split_ring(points, junctions):
+    """Cut a ring with at least one junction into arcs running from junction to junction."""
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    rotated = points[cuts[0]:] + points[:cuts[0]] + [points[cuts[0]]]
+    arcs = []
+    current = [rotated[0]]
+    for point in rotated[1:]:
+        current.append(point)
+        if point in junctions:
+            arcs.append(current)
+            current = [point]
+    return arcs
+
+
+def _segment_distance(point, start, end):
+    if start == end:
+        return math.dist(point, start)
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+def douglas_peucker(points, tolerance):
+    """Simplify an open line, always keeping both endpoints."""
+    if tolerance <= 0 or len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        farthest, distance = first, 0.0
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > distance:
+                farthest, distance = i, d
+        if distance > tolerance:
+            keep[farthest] = True
+            stack.extend([(first, farthest), (farthest, last)])
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def simplify_arc(points, tolerance):
+    if points[0] != points[-1]:
+        return douglas_peucker(points, tolerance)
+    # Closed arc (a whole ring): split at the vertex farthest from the start, then
+    # simplify both halves. A ring needs four points (three distinct), so small
+    # rings that would collapse further are kept as they are.
+    middle = max(range(len(points)), key=lambda i: math.dist(points[i], points[0]))
+    head = douglas_peucker(points[:middle + 1], tolerance)
+    tail = douglas_peucker(points[middle:], tolerance)
+    simplified = head + tail[1:]
+    return simplified if len(simplified) >= 4 else points
+
+
+def quantize_arc(points, origin, scale):
+    """Quantize to integer grid steps and delta-encode, dropping points that collapse together."""
+    encoded = []
+    previous = None
+    for x, y in points:
+        q = (round((x - origin[0]) / scale[0]), round((y - origin[1]) / scale[1]))
+        if q == previous:
+            continue
+        encoded.append(list(q) if previous is None else [q[0] - previous[0], q[1] - previous[1]])
+        previous = q
+    if len(encoded) == 1:
+        # Both endpoints fell on the same grid point; keep a (zero-length) arc.
+        encoded.append([0, 0])
+    return encoded
+
+
+def decode_arc(arc, transform):
+    """Absolute coordinates of a quantized, delta-encoded arc."""
+    (scale_x, scale_y), (translate_x, translate_y) = transform["scale"], transform["translate"]
+    x = y = 0
+    points = []
+    for dx, dy in arc:
+        x, y = x + dx, y + dy
+        points.append([x * scale_x + translate_x, y * scale_y + translate_y])
+    return points
+
+
+def decode_ring(references, arcs):
+    """Join the (decoded) arcs of a ring; each arc after the first repeats the previous end point."""
+    ring = []
+    for reference in references:
+        points = arcs[reference] if reference >= 0 else arcs[~reference][::-1]
+        ring.extend(points if not ring else points[1:])
+    return ring
+
+
+def geometry_arc_indexes(geometry):
+    """Indexes of every arc a TopoJSON geometry references."""
+    polygons = [geometry["arcs"]] if geometry["type"] == "Polygon" else geometry.get("arcs", [])
+    return {reference if reference >= 0 else ~reference for rings in polygons for ring in rings for reference in ring}
+
+
+def invalid_geometries(topology):
+    """Indexes of the district geometries that do not decode to valid polygons."""
+    arcs = [decode_arc(arc, topology["transform"]) for arc in topology["arcs"]]
+    invalid = []
+    for index, geometry in enumerate(topology["objects"]["districts"]["geometries"]):
+        if geometry["type"] is None:
+            continue
+        polygons = [geometry["arcs"]] if geometry["type"] == "Polygon" else geometry["arcs"]
+        coordinates = [[decode_ring(ring, arcs) for ring in rings] for rings in polygons]
+        try:
+            valid = shape({"type": "MultiPolygon", "coordinates": coordinates}).is_valid
+        except ValueError:  # e.g. a ring with fewer than four points
+            valid = False
+        if not valid:
+            invalid.append(index)
+    return invalid
+
+
+def build_topology(data, tolerance=TOLERANCE, quantization=QUANTIZATION):
+    features = data["features"]
+    rings = []
+    ring_owner = []
+    for index, feature in enumerate(features):
+        for polygon in polygons_of(feature["geometry"]):
+            for ring in polygon:
+                points = ring_points(ring)
+                if len(points) >= 3:
+                    rings.append(points)
+                    ring_owner.append(index)
+    junctions = find_junctions(rings, ring_owner)
+
+    arcs = []
+    arc_index = {}  # arc points tuple (in stored direction) -> index
+
+    def arc_reference(points):
+        key = tuple(points)
+        if key in arc_index:
+            return arc_index[key]
+        reverse_key = key[::-1]
+        if reverse_key in arc_index:
+            return ~arc_index[reverse_key]
+        arc_index[key] = len(arcs)
+        arcs.append(points)
+        return arc_index[key]
+
+    def ring_arcs(ring):
+        points = ring_points(ring)
+        if len(points) < 3:
+            return None
+        if not any(point in junctions for point in points):
+            # A ring without junctions is one closed arc, stored in canonical form;
+            # reference it reversed when this ring runs the other way round.
+            canonical = canonical_ring(points)
+            start = points.index(canonical[0])
+            reference = arc_reference(canonical)
+            forward = points[start:] + points[:start] + [canonical[0]]
+            return [reference if forward == canonical else ~reference]
+        return [arc_reference(arc) for arc in split_ring(points, junctions)]
+
+    geometries = []
+    for feature in features:
+        polygons = []
+        for polygon in polygons_of(feature["geometry"]):
+            encoded = [ring_arcs(ring) for ring in polygon]
+            if encoded and encoded[0] is not None:
+                polygons.append([ring for ring in encoded if ring is not None])
+        geometry = {"properties": feature.get("properties", {})}
+        if "id" in feature.get("properties", {}):
+            geometry["id"] = feature["properties"]["id"]
+        if len(polygons) == 1:
+            geometry.update(type="Polygon", arcs=polygons[0])
+        elif polygons:
+            geometry.update(type="MultiPolygon", arcs=polygons)
+        else:
+            geometry["type"] = None
+        geometries.append(geometry)
+
+    # The grid spans the full-detail arcs, so restoring an arc never moves it.
+    xs = [x for arc in arcs for x, _ in arc]
+    ys = [y for arc in arcs for _, y in arc]
+    bbox = [min(xs), min(ys), max(xs), max(ys)]
+    scale = [
+        (bbox[2] - bbox[0]) / (quantization - 1) or 1.0,
+        (bbox[3] - bbox[1]) / (quantization - 1) or 1.0,
+    ]
+    topology = {
+        "type": "Topology",
+        "bbox": bbox,
+        "transform": {"scale": scale, "translate": [bbox[0], bbox[1]]},
+        "objects": {"districts": {"type": "GeometryCollection", "geometries": geometries}},
+    }
+
+    simplified = [simplify_arc(arc, tolerance) for arc in arcs]
+    restored = set()
+    while True:
+        topology["arcs"] = [quantize_arc(arc, bbox[:2], scale) for arc in simplified]
+        invalid = invalid_geometries(topology)
+        # Restore the arcs of invalid districts (shared arcs fix the neighbour too).
+        to_restore = {index for district in invalid for index in geometry_arc_indexes(geometries[district])} - restored
+        if not to_restore:
+            break
+        for index in to_restore:
+            simplified[index] = arcs[index]
+        restored |= to_restore
+    topology["restored_arcs"] = len(restored)
+    topology["invalid_districts"] = [geometries[index].get("id", index) for index in invalid]
+    return topology
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a shared-arc TopoJSON of the district layer.")
+    parser.add_argument("--input", type=Path, default=GEOJSON_PATH)
+    parser.add_argument("--output", type=Path, default=TOPOJSON_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Arc simplification in degrees (0 = none)")
+    parser.add_argument("--quantization", type=int, default=QUANTIZATION)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"ERROR: {args.input} not found")
+        raise SystemExit(1)
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    topology = build_topology(data, args.tolerance, args.quantization)
+    # Build diagnostics, not part of the TopoJSON format.
+    restored = topology.pop("restored_arcs")
+    invalid = topology.pop("invalid_districts")
+    # Written atomically: the API may read districts.topojson while it is rebuilt.
+    temporary = args.output.with_name(f".{args.output.name}.{os.getpid()}.tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(topology, f, separators=(",", ":"))
+    os.replace(temporary, args.output)
+
+    input_size = args.input.stat().st_size
+    output_size = args.output.stat().st_size
+    print(f"Districts: {len(topology['objects']['districts']['geometries'])}")
+    print(f"Arcs: {len(topology['arcs'])} ({restored} kept at full detail to stay valid)")
+    if invalid:
+        print(f"WARNING: {len(invalid)} districts do not decode to valid polygons even at full detail: {invalid}")
+    print(f"Input:  {input_size / 1_000_000:.2f} MB")
+    print(f"Output: {output_size / 1_000_000:.2f} MB ({input_size / max(output_size, 1):.1f}x smaller)")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
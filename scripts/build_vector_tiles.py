@@ -0,0 +1,176 @@
+"""
+Pre-generate clipped, simplified district geometry for the vector tile endpoint.
+
+For every zoom level in [--min-zoom, --max-zoom] the districts are projected to
+Web Mercator tile coordinates, simplified once for the whole zoom (so adjacent
+tiles agree) and clipped to each tile plus a small buffer. Each non-empty tile is
+written as integer tile coordinates to
+
+    backend/app/data/processed/tiles/{z}/{x}/{y}.json.gz
+
+The API (app/services/vector_tiles.py) encodes these to Mapbox Vector Tiles on
+request, optionally adding the selected variable's values, and caches the result.
+Clients should set the source maxzoom to --max-zoom and overzoom beyond it.
+
+Usage:
+    python backend/scripts/build_vector_tiles.py [--min-zoom 4] [--max-zoom 10]
+"""
+
+import argparse
+import gzip
+import json
+import math
+import shutil
+from pathlib import Path
+
+try:
+    import numpy as np
+    from shapely import transform
+    from shapely.geometry import box, shape
+    from shapely.validation import make_valid
+except ImportError:
+    print("ERROR: shapely>=2.0 is required. Install with: pip install shapely")
+    raise SystemExit(1)
+
+try:
+    from shapely import coverage_is_valid, coverage_simplify
+except ImportError:  # shapely < 2.1: districts are simplified one at a time
+    coverage_is_valid = None
+    coverage_simplify = None
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "app" / "data" / "processed"
+GEOJSON_PATH = DATA_DIR / "districts.geojson"
+TILES_DIR = DATA_DIR / "tiles"
+
+EXTENT = 4096            # tile coordinate range, as in the MVT spec default
+BUFFER = 64              # clip margin in tile units, hides seams at tile edges
+SIMPLIFY_UNITS = 1.0     # simplification tolerance in tile units (1/4096 of a tile)
+MIN_ZOOM = 4
+MAX_ZOOM = 10
+MAX_LATITUDE = 85.0511287798
+
+
+def project(coords, zoom: int):
+    """Project lon/lat to global tile-unit coordinates (y grows southwards) at ``zoom``."""
+    size = EXTENT * 2 ** zoom
+    sin_lat = np.sin(np.radians(np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE)))
+    projected = np.empty_like(coords)
+    projected[:, 0] = (coords[:, 0] + 180.0) / 360.0 * size
+    projected[:, 1] = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * size
+    return projected
+
+
+def polygon_rings(geom, offset_x: float, offset_y: float):
+    """Integer rings of every polygon in ``geom`` relative to a tile origin; degenerate rings are dropped."""
+    if geom.is_empty:
+        return []
+    if geom.geom_type == "Polygon":
+        polygons = [geom]
+    else:
+        polygons = [part for part in getattr(geom, "geoms", []) if part.geom_type == "Polygon"]
+        if not polygons:
+            # GeometryCollections from clipping may nest polygons one level deeper.
+            polygons = [
+                inner
+                for part in getattr(geom, "geoms", [])
+                for inner in getattr(part, "geoms", [part])
+                if inner.geom_type == "Polygon"
+            ]
+
+    result = []
+    for polygon in polygons:
+        rings = []
+        for ring in [polygon.exterior, *polygon.interiors]:
+            points = []
+            for x, y in ring.coords[:-1]:
+                point = [round(x - offset_x), round(y - offset_y)]
+                if not points or points[-1] != point:
+                    points.append(point)
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            if len(points) >= 3:
+                rings.append(points)
+            elif not rings:
+                break  # the exterior collapsed; skip the polygon
+        if rings:
+            result.append(rings)
+    return result
+
+
+def build_zoom(features, geoms, zoom: int, output_dir: Path) -> int:
+    projected = [transform(geom, lambda coords, z=zoom: project(coords, z)) for geom in geoms]
+    # Simplifying the districts as one coverage keeps shared borders identical.
+    if coverage_simplify is not None and coverage_is_valid(projected):
+        simplified = list(coverage_simplify(projected, SIMPLIFY_UNITS))
+    else:
+        simplified = [geom.simplify(SIMPLIFY_UNITS, preserve_topology=True) for geom in projected]
+
+    tiles: dict[tuple[int, int], list[dict]] = {}
+    for index, (feature, geom) in enumerate(zip(features, simplified)):
+        if geom.is_empty:
+            continue
+        min_x, min_y, max_x, max_y = geom.bounds
+        for tile_x in range(int((min_x - BUFFER) // EXTENT), int((max_x + BUFFER) // EXTENT) + 1):
+            for tile_y in range(int((min_y - BUFFER) // EXTENT), int((max_y + BUFFER) // EXTENT) + 1):
+                origin_x, origin_y = tile_x * EXTENT, tile_y * EXTENT
+                clipped = geom.intersection(
+                    box(origin_x - BUFFER, origin_y - BUFFER, origin_x + EXTENT + BUFFER, origin_y + EXTENT + BUFFER)
+                )
+                polygons = polygon_rings(clipped, origin_x, origin_y)
+                if polygons:
+                    tiles.setdefault((tile_x, tile_y), []).append(
+                        {"id": index + 1, "properties": feature["properties"], "polygons": polygons}
+                    )
+
+    for (tile_x, tile_y), tile_features in tiles.items():
+        path = output_dir / str(zoom) / str(tile_x) / f"{tile_y}.json.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as out:
+            json.dump({"extent": EXTENT, "features": tile_features}, out, separators=(",", ":"))
+    return len(tiles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate district vector tile geometry.")
+    parser.add_argument("--input", type=Path, default=GEOJSON_PATH)
+    parser.add_argument("--output-dir", type=Path, default=TILES_DIR)
+    parser.add_argument("--min-zoom", type=int, default=MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"ERROR: {args.input} not found")
+        raise SystemExit(1)
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        features = json.load(f)["features"]
+    geoms = []
+    for feature in features:
+        geom = shape(feature["geometry"])
+        geoms.append(geom if geom.is_valid else make_valid(geom))
+
+    # Build next to the live directory and swap, so the API never serves a half-built pyramid.
+    staging = args.output_dir.with_name(f".{args.output_dir.name}.building")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    total = 0
+    for zoom in range(args.min_zoom, args.max_zoom + 1):
+        count = build_zoom(features, geoms, zoom, staging)
+        total += count
+        print(f"  zoom {zoom:>2}: {count} tiles")
+    (staging / "metadata.json").write_text(
+        json.dumps({"min_zoom": args.min_zoom, "max_zoom": args.max_zoom, "extent": EXTENT, "buffer": BUFFER}),
+        encoding="utf-8",
+    )
+
+    previous = args.output_dir.with_name(f".{args.output_dir.name}.old")
+    shutil.rmtree(previous, ignore_errors=True)
+    if args.output_dir.exists():
+        args.output_dir.rename(previous)
+    staging.rename(args.output_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    print(f"Wrote {total} tiles to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Layout, sort order and streaming writers for the processed climate tables.
+
+The importer writes each source file's rows to a sorted "run" file, then
+k-way merges the runs straight into the final CSV (gzip for the yearly table).
+Neither step holds more than one source file's rows in memory. Runs are kept
+between imports, so an unchanged source's run is merged again without
+reprocessing it.
+
+With pyarrow installed the merged rows can also be written as a Parquet
+dataset partitioned by variable and scenario (``variable=<v>/scenario=<s>/``),
+which app/services/real_climate.py reads with partition and row-group pruning.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import heapq
+import itertools
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for --format parquet
+    pa = None
+    pq = None
+
+RUN_COMPRESSLEVEL = 1
+OUTPUT_FORMATS = ("csv", "parquet", "both")
+PARTITION_COLUMNS = ("variable", "scenario")
+# Rows per Parquet row group; each carries min/max statistics for pruning.
+PARQUET_ROW_GROUP_SIZE = 65_536
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    columns: tuple[str, ...]
+    sort_columns: tuple[str, ...]
+    file_name: str
+    # Sort columns compared as integers instead of strings.
+    integer_columns: tuple[str, ...] = ()
+
+    @property
+    def compressed(self) -> bool:
+        return self.file_name.endswith(".gz")
+
+    @property
+    def dataset_name(self) -> str:
+        """Directory name of the Parquet dataset, e.g. ``climate_yearly_values``."""
+        return self.file_name.split(".", 1)[0]
+
+
+PERIOD_TABLE = TableSpec(
+    name="period",
+    columns=(
+        "district_id", "district_name", "region", "value", "grid_point_count",
+        "unit", "variable", "period", "scenario", "percentile",
+    ),
+    sort_columns=("variable", "scenario", "period", "percentile", "region", "district_name"),
+    file_name="climate_period_values.csv",
+)
+YEARLY_TABLE = TableSpec(
+    name="yearly",
+    columns=(
+        "district_id", "district_name", "region", "value", "grid_point_count",
+        "unit", "variable", "year", "scenario", "percentile",
+    ),
+    sort_columns=("variable", "scenario", "year", "percentile", "region", "district_name"),
+    file_name="climate_yearly_values.csv.gz",
+    integer_columns=("year",),
+)
+
+
+def open_text(path: Path, mode: str, compresslevel: int = 9):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="", compresslevel=compresslevel)
+    return path.open(mode, encoding="utf-8", newline="")
+
+
+def row_sort_key(table: TableSpec) -> Callable[[Sequence[str]], tuple[Any, ...]]:
+    """Sort key over formatted rows (lists of strings in ``table.columns`` order)."""
+    positions = [table.columns.index(column) for column in table.sort_columns]
+    integers = {table.columns.index(column) for column in table.integer_columns}
+
+    def key(row: Sequence[str]) -> tuple[Any, ...]:
+        return tuple(int(row[position]) if position in integers else row[position] for position in positions)
+
+    return key
+
+
+def format_row(table: TableSpec, row: dict[str, object]) -> list[str]:
+    formatted = []
+    for column in table.columns:
+        value = row.get(column)
+        if value is None or value == "":
+            formatted.append("")
+        elif column == "value":
+            formatted.append(repr(float(value)))
+        elif column in ("grid_point_count", "year"):
+            formatted.append(str(int(value)))
+        else:
+            formatted.append(str(value))
+    return formatted
+
+
+def write_run(path: Path, table: TableSpec, rows: Iterable[dict[str, object]]) -> int:
+    """Write ``rows`` sorted by the table's order to a gzip run file; returns the row count."""
+    formatted = sorted((format_row(table, row) for row in rows), key=row_sort_key(table))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Runs are kept between imports, so a crash must not leave a truncated one in place.
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with gzip.open(temporary, "wt", encoding="utf-8", newline="", compresslevel=RUN_COMPRESSLEVEL) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(table.columns)
+        writer.writerows(formatted)
+    os.replace(temporary, path)
+    return len(formatted)
+
+
+def read_rows(path: Path, table: TableSpec) -> Iterator[list[str]]:
+    """Yield the data rows of a run or table file, in ``table.columns`` order."""
+    with open_text(path, "r") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        if tuple(header) == table.columns:
+            yield from reader
+            return
+        # Files written by other tools may order (or omit) columns differently.
+        positions = [header.index(column) if column in header else None for column in table.columns]
+        for row in reader:
+            yield [row[position] if position is not None else "" for position in positions]
+
+
+def write_table(path: Path, table: TableSpec, rows: Iterable[Sequence[str]]) -> dict[str, Any]:
+    """
+    Write formatted ``rows`` (already in table order) to ``path`` atomically.
+
+    Returns the row count and the distinct variables and scenarios written.
+    """
+    variable_index = table.columns.index("variable")
+    scenario_index = table.columns.index("scenario")
+    variables: set[str] = set()
+    scenarios: set[str] = set()
+    count = 0
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp{''.join(path.suffixes[-1:])}")
+    with open_text(temporary, "w") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(table.columns)
+        for row in rows:
+            writer.writerow(row)
+            variables.add(row[variable_index])
+            scenarios.add(row[scenario_index])
+            count += 1
+    os.replace(temporary, path)
+    return {"rows": count, "variables": sorted(variables), "scenarios": sorted(scenarios)}
+
+
+def merge_runs(table: TableSpec, run_paths: Sequence[Path]) -> Iterator[list[str]]:
+    """K-way merge of sorted run files. Ties keep the order of ``run_paths``, so output is deterministic."""
+    return heapq.merge(*(read_rows(path, table) for path in run_paths), key=row_sort_key(table))
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def _parquet_schema(table: TableSpec) -> "pa.Schema":
+    types = {"value": pa.float64(), "grid_point_count": pa.int32(), "year": pa.int16()}
+    return pa.schema(
+        [
+            pa.field(column, types.get(column, pa.string()))
+            for column in table.columns
+            if column not in PARTITION_COLUMNS
+        ]
+    )
+
+
+def _parquet_column(column: str, values: list[str]) -> list[Any]:
+    if column == "value":
+        return [float(value) for value in values]
+    if column in ("grid_point_count", "year"):
+        return [int(value) if value != "" else None for value in values]
+    return values
+
+
+def write_parquet_dataset(directory: Path, table: TableSpec, rows: Iterable[Sequence[str]]) -> dict[str, Any]:
+    """
+    Write formatted ``rows`` (already in table order) as a Parquet dataset
+    partitioned by variable and scenario.
+
+    The table order groups rows by variable then scenario, so each partition is
+    written from one contiguous run and only one partition is in memory at a time.
+    The dataset is built next to ``directory`` and swapped in when complete.
+    """
+    if pq is None:
+        raise RuntimeError("Writing Parquet output requires pyarrow (pip install pyarrow).")
+
+    schema = _parquet_schema(table)
+    positions = {column: table.columns.index(column) for column in table.columns}
+    partition_positions = [positions[column] for column in PARTITION_COLUMNS]
+    variables: set[str] = set()
+    scenarios: set[str] = set()
+    count = 0
+
+    temporary = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(temporary, ignore_errors=True)
+    for (variable, scenario), group in itertools.groupby(
+        rows, key=lambda row: tuple(row[position] for position in partition_positions)
+    ):
+        partition_rows = list(group)
+        columns = list(zip(*partition_rows))
+        arrays = [
+            pa.array(_parquet_column(field.name, list(columns[positions[field.name]])), type=field.type)
+            for field in schema
+        ]
+        partition_dir = temporary / f"variable={variable}" / f"scenario={scenario}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_arrays(arrays, schema=schema),
+            partition_dir / "part-0.parquet",
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+            use_dictionary=True,
+            write_statistics=True,
+            compression="zstd",
+        )
+        variables.add(variable)
+        scenarios.add(scenario)
+        count += len(partition_rows)
+
+    temporary.mkdir(parents=True, exist_ok=True)
+    previous = directory.with_name(f".{directory.name}.{os.getpid()}.old")
+    if directory.exists():
+        os.replace(directory, previous)
+    os.replace(temporary, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return {"rows": count, "variables": sorted(variables), "scenarios": sorted(scenarios)}
+
+
+def replace_variable_rows(
+    path: Path,
+    table: TableSpec,
+    variable: str,
+    rows: Sequence[Sequence[str]],
+) -> dict[str, Any]:
+    """
+    Rewrite the table at ``path`` with ``variable``'s rows replaced by ``rows``
+    (formatted, in table order). Tables are sorted by variable first, so the old
+    rows form one block and the new ones are spliced in where it was, streaming
+    without re-sorting the rest of the table.
+    """
+    variable_index = table.columns.index("variable")
+    removed = 0
+
+    def spliced() -> Iterator[Sequence[str]]:
+        nonlocal removed
+        inserted = False
+        for row in read_rows(path, table):
+            if row[variable_index] == variable:
+                removed += 1
+                continue
+            if not inserted and row[variable_index] > variable:
+                yield from rows
+                inserted = True
+            yield row
+        if not inserted:
+            yield from rows
+
+    stats = write_table(path, table, spliced())
+    return {**stats, "removed": removed, "added": len(rows)}
+
+
+def replace_parquet_variable(
+    directory: Path,
+    table: TableSpec,
+    variable: str,
+    rows: Sequence[Sequence[str]],
+) -> dict[str, Any]:
+    """Replace only the ``variable=<variable>`` partition of a Parquet dataset written by ``write_parquet_dataset``."""
+    partition = directory / f"variable={variable}"
+    staging = directory.with_name(f".{directory.name}.{variable}.{os.getpid()}.patch")
+    previous = directory.with_name(f".{directory.name}.{variable}.{os.getpid()}.old")
+    stats = write_parquet_dataset(staging, table, rows)
+    if partition.exists():
+        os.replace(partition, previous)
+    if rows:
+        os.replace(staging / partition.name, partition)
+    shutil.rmtree(staging, ignore_errors=True)
+    shutil.rmtree(previous, ignore_errors=True)
+    return {"rows": stats["rows"], "scenarios": stats["scenarios"]}
@@ -1,18 +1,47 @@
 from __future__ import annotations
 
 import argparse
-import gzip
+import hashlib
 import json
+import os
 import re
+import shutil
+import sys
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 import xarray as xr
 from shapely.geometry import Point
 
+from climate_tables import (
+    OUTPUT_FORMATS,
+    PERIOD_TABLE,
+    YEARLY_TABLE,
+    TableSpec,
+    merge_runs,
+    parquet_available,
+    write_parquet_dataset,
+    write_run,
+    write_table,
+)
+from simplify_geojson import build_map_levels
+
+try:
+    from scipy import sparse
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; aggregation falls back to numpy reductions
+    sparse = None
+    cKDTree = None
+
 
 FILE_PATTERN = re.compile(
     r"(?P<indicator_id>10[12]|20[12])-qdm_CORDEX_Ghana0p0375_(?P<scenario>rcp26|rcp45|rcp85)_ensstats\.nc$",
@@ -88,6 +117,23 @@ COASTAL_DISTRICT_NAMES = {
 }
 ATLAS_PERIOD_ORDER = ("baseline", "2030", "2050", "2080")
 GRID_RESOLUTION_KM = 4.0
+GRID_RESOLUTION_DEGREES = 0.0375
+AGGREGATION_MODES = ("centroid", "area")
+# World Cylindrical Equal Area, for overlap areas in square metres.
+EQUAL_AREA_CRS = "EPSG:6933"
+# Bump when the lookup algorithms change, so stale cache files are not reused.
+GRID_LOOKUP_CACHE_VERSION = 1
+IMPORT_MANIFEST_NAME = "import_manifest.json"
+# Outside app/data/processed, which is deployed and tracked in git.
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".import_cache"
+# Bump when a change to the processing functions alters the rows they produce,
+# so the next run reprocesses every source instead of reusing stale runs.
+IMPORT_MANIFEST_VERSION = 1
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_BLOCK_MB = 256
+# A block is held as float64 several times during aggregation (read, unit
+# conversion, NaN-filled copy, validity mask); the memory cap accounts for that.
+BLOCK_WORKING_COPIES = 4
 SEASON_LENGTH_DAYS = {
     "annual": 365,
     "amj": 91,
@@ -107,6 +153,27 @@ class SourceFile:
     kind: str
 
 
+@dataclass(frozen=True)
+class ImportTask:
+    """One source file to aggregate; ``kind`` selects the processing function and output table."""
+
+    path: Path
+    kind: str  # "periods", "years", "sea_level_periods" or "sea_level_years"
+    source: SourceFile | None = None
+
+
+@dataclass(frozen=True)
+class ImportContext:
+    """Inputs shared by every task, sent once to each worker process."""
+
+    districts: gpd.GeoDataFrame
+    zonal: ZonalWeights | None
+    period_mapping: dict[str, str]
+    aggregation: str = "centroid"
+    cache_dir: Path | None = None
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_MB * 1024 * 1024
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Aggregate NetCDF climate outputs to districts.")
     parser.add_argument("--temperature-dir", action="append", type=Path, default=[])
@@ -128,6 +195,43 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--districts", required=True, type=Path, help="District GeoJSON or vector file")
     parser.add_argument("--periods-file", required=True, type=Path, help="Path to config/periods.tsv")
     parser.add_argument("--output-dir", required=True, type=Path)
+    parser.add_argument(
+        "--aggregation",
+        choices=AGGREGATION_MODES,
+        default="centroid",
+        help="centroid: mean of cells whose centre lies in the district; "
+        "area: mean weighted by each cell's overlap with the district.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory for cached grid lookups and weights (default: backend/.import_cache). "
+        "Entries are keyed by the grid axes and district geometries; delete it to force a rebuild.",
+    )
+    parser.add_argument(
+        "--max-block-mb",
+        type=int,
+        default=DEFAULT_MAX_BLOCK_MB,
+        help="Approximate memory per worker for the NetCDF blocks being aggregated.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for aggregating source files (0 = one per CPU core).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="csv: climate_*_values.csv[.gz]; parquet: climate_*_values/ datasets partitioned by "
+        "variable and scenario (requires pyarrow); both: write each.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Reprocess every source instead of only those changed since the last run ({IMPORT_MANIFEST_NAME}).",
+    )
     return parser.parse_args()
 
 
@@ -326,6 +430,168 @@ def build_nearest_cell_lookup(
     return lookup
 
 
+def grid_geometry_key(latitudes: np.ndarray, longitudes: np.ndarray, districts: gpd.GeoDataFrame) -> str:
+    """Hash of the grid axes and district geometries; lookups derived from them can be cached under it."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(latitudes, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(longitudes, dtype=np.float64).tobytes())
+    for district_id, geometry in zip(districts["district_id"], districts.geometry):
+        digest.update(str(district_id).encode("utf-8"))
+        digest.update(geometry.wkb)
+    return digest.hexdigest()
+
+
+def _cell_edges(centers: np.ndarray) -> np.ndarray:
+    """Cell boundaries halfway between the centres, extended by half a cell at both ends."""
+    centers = np.asarray(centers, dtype=float)
+    if len(centers) == 1:
+        return np.array([centers[0] - 0.5 * GRID_RESOLUTION_DEGREES, centers[0] + 0.5 * GRID_RESOLUTION_DEGREES])
+    midpoints = (centers[:-1] + centers[1:]) / 2
+    return np.concatenate(
+        [[centers[0] - (midpoints[0] - centers[0])], midpoints, [centers[-1] + (centers[-1] - midpoints[-1])]]
+    )
+
+
+def build_area_weight_lookup(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    districts: gpd.GeoDataFrame,
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """
+    Cells overlapping each district with the overlap area (m², equal-area projection) as weight.
+
+    Returns ``(cell_lookup, weight_lookup)``: cell_lookup has the same (lat_idx, lon_idx)
+    layout as ``build_grid_lookup`` and weight_lookup the matching weights.
+    """
+    lat_edges = _cell_edges(latitudes)
+    lon_edges = _cell_edges(longitudes)
+    lat_idx = np.repeat(np.arange(len(latitudes)), len(longitudes))
+    lon_idx = np.tile(np.arange(len(longitudes)), len(latitudes))
+    cells = gpd.GeoDataFrame(
+        {"lat_idx": lat_idx, "lon_idx": lon_idx},
+        geometry=shapely.box(
+            np.minimum(lon_edges[lon_idx], lon_edges[lon_idx + 1]),
+            np.minimum(lat_edges[lat_idx], lat_edges[lat_idx + 1]),
+            np.maximum(lon_edges[lon_idx], lon_edges[lon_idx + 1]),
+            np.maximum(lat_edges[lat_idx], lat_edges[lat_idx + 1]),
+        ),
+        crs="EPSG:4326",
+    ).to_crs(EQUAL_AREA_CRS)
+    district_shapes = districts[["district_id", "geometry"]].reset_index(drop=True).to_crs(EQUAL_AREA_CRS)
+
+    joined = gpd.sjoin(cells, district_shapes, predicate="intersects", how="inner")
+    overlap = shapely.area(
+        shapely.intersection(
+            cells.geometry.values[joined.index.to_numpy()],
+            district_shapes.geometry.values[joined["index_right"].to_numpy()],
+        )
+    )
+    joined = joined.assign(weight=overlap)
+    joined = joined[joined["weight"] > 0]
+
+    cell_lookup: dict[str, np.ndarray] = {}
+    weight_lookup: dict[str, np.ndarray] = {}
+    for district_id, frame in joined.groupby("district_id"):
+        cell_lookup[district_id] = frame[["lat_idx", "lon_idx"]].to_numpy(dtype=int)
+        weight_lookup[district_id] = frame["weight"].to_numpy(dtype=float)
+    return cell_lookup, weight_lookup
+
+
+def _save_grid_lookups(
+    path: Path,
+    cell_lookup: dict[str, np.ndarray],
+    nearest_cell_lookup: dict[str, tuple[int, int]],
+    weight_lookup: dict[str, np.ndarray] | None,
+) -> None:
+    district_ids = sorted(cell_lookup)
+    nearest_ids = sorted(nearest_cell_lookup)
+    arrays = {
+        "district_ids": np.array(district_ids, dtype=str),
+        "indptr": np.cumsum([0, *(len(cell_lookup[district_id]) for district_id in district_ids)]),
+        "cells": np.concatenate(
+            [np.asarray(cell_lookup[district_id], dtype=np.int64).reshape(-1, 2) for district_id in district_ids]
+            or [np.zeros((0, 2), dtype=np.int64)]
+        ),
+        "nearest_ids": np.array(nearest_ids, dtype=str),
+        "nearest_cells": np.array([nearest_cell_lookup[district_id] for district_id in nearest_ids], dtype=np.int64)
+        .reshape(-1, 2),
+    }
+    if weight_lookup is not None:
+        arrays["weights"] = np.concatenate(
+            [weight_lookup[district_id] for district_id in district_ids] or [np.zeros(0, dtype=float)]
+        )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so parallel import workers never read a partial cache file.
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        np.savez_compressed(handle, **arrays)
+    os.replace(temporary, path)
+
+
+def _load_grid_lookups(
+    path: Path,
+) -> tuple[dict[str, np.ndarray], dict[str, tuple[int, int]], dict[str, np.ndarray] | None]:
+    with np.load(path) as cached:
+        bounds = cached["indptr"]
+        district_ids = [str(district_id) for district_id in cached["district_ids"]]
+        cell_lookup = {
+            district_id: cached["cells"][bounds[index]:bounds[index + 1]]
+            for index, district_id in enumerate(district_ids)
+        }
+        weight_lookup = None
+        if "weights" in cached.files:
+            weight_lookup = {
+                district_id: cached["weights"][bounds[index]:bounds[index + 1]]
+                for index, district_id in enumerate(district_ids)
+            }
+        nearest_cell_lookup = {
+            str(district_id): (int(lat_idx), int(lon_idx))
+            for district_id, (lat_idx, lon_idx) in zip(cached["nearest_ids"], cached["nearest_cells"])
+        }
+    return cell_lookup, nearest_cell_lookup, weight_lookup
+
+
+def build_grid_zonal_weights(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    districts: gpd.GeoDataFrame,
+    aggregation: str = "centroid",
+    cache_dir: Path | None = None,
+) -> ZonalWeights:
+    """
+    Zonal weights for a grid. ``centroid`` counts every cell whose centre lies in the
+    district; ``area`` weights cells by their overlap with it, so small districts
+    average the cells they actually cover instead of falling back to the nearest one.
+
+    The lookups behind the weights (the spatial join and the nearest-cell fallback)
+    are cached in ``cache_dir`` under ``grid_geometry_key`` and reused by later runs
+    while neither the grid nor the district boundaries change.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        key = grid_geometry_key(latitudes, longitudes, districts)
+        cache_path = cache_dir / f"grid_lookup_v{GRID_LOOKUP_CACHE_VERSION}_{aggregation}_{key}.npz"
+        if cache_path.exists():
+            try:
+                cell_lookup, nearest_cell_lookup, weight_lookup = _load_grid_lookups(cache_path)
+            except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+                # Unreadable (e.g. truncated) cache files are rebuilt.
+                cache_path.unlink(missing_ok=True)
+            else:
+                return build_zonal_weights(districts, cell_lookup, nearest_cell_lookup, latitudes, longitudes, weight_lookup)
+
+    nearest_cell_lookup = build_nearest_cell_lookup(latitudes, longitudes, districts)
+    weight_lookup = None
+    if aggregation == "area":
+        cell_lookup, weight_lookup = build_area_weight_lookup(latitudes, longitudes, districts)
+    else:
+        cell_lookup = build_grid_lookup(latitudes, longitudes, districts)
+    if cache_path is not None:
+        _save_grid_lookups(cache_path, cell_lookup, nearest_cell_lookup, weight_lookup)
+    return build_zonal_weights(districts, cell_lookup, nearest_cell_lookup, latitudes, longitudes, weight_lookup)
+
+
 def parse_period_definitions(path: Path) -> dict[str, str]:
     frame = pd.read_csv(path, sep="\t")
     columns = {col.lower(): col for col in frame.columns}
@@ -389,86 +655,275 @@ def convert_units(variable: str, values: np.ndarray, units: str, season: str) ->
     return values, units
 
 
-def aggregate_values_for_districts(
-    data_array: xr.DataArray,
+@dataclass(frozen=True)
+class ZonalWeights:
+    """
+    District x grid-cell weight matrix in CSR form, compiled once from the grid lookups.
+
+    Row ``d`` lists the flattened cell indices (``lat_idx * n_lon + lon_idx``) of
+    district ``d`` in ``cells[indptr[d]:indptr[d + 1]]`` with their ``weights``.
+    """
+
+    districts: list[dict[str, str]]  # district_id, district_name, region, in output order
+    grid_shape: tuple[int, int]
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    indptr: np.ndarray
+    cells: np.ndarray
+    weights: np.ndarray
+    nearest_cells: np.ndarray  # flattened nearest cell per district, -1 when unknown
+    matrix: Any = None  # scipy.sparse CSR matrix of the same weights, when scipy is installed
+
+
+def build_zonal_weights(
     districts: gpd.GeoDataFrame,
     grid_lookup: dict[str, np.ndarray],
     nearest_cell_lookup: dict[str, tuple[int, int]],
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    weight_lookup: dict[str, np.ndarray] | None = None,
+) -> ZonalWeights:
+    """Compile the lookups into a ``ZonalWeights``; cells weigh 1 unless ``weight_lookup`` gives weights."""
+    grid_shape = (len(latitudes), len(longitudes))
+    n_lon = grid_shape[1]
+    meta: list[dict[str, str]] = []
+    indptr = [0]
+    cell_blocks: list[np.ndarray] = []
+    weight_blocks: list[np.ndarray] = []
+    nearest_cells: list[int] = []
+    for district in districts.to_dict("records"):
+        district_id = district["district_id"]
+        meta.append(
+            {"district_id": district_id, "district_name": district["district_name"], "region": district["region"]}
+        )
+        cell_indices = grid_lookup.get(district_id)
+        if cell_indices is not None and len(cell_indices) > 0:
+            cell_blocks.append(cell_indices[:, 0] * n_lon + cell_indices[:, 1])
+            weight_blocks.append(
+                weight_lookup[district_id] if weight_lookup is not None else np.ones(len(cell_indices), dtype=float)
+            )
+            indptr.append(indptr[-1] + len(cell_indices))
+        else:
+            indptr.append(indptr[-1])
+        nearest = nearest_cell_lookup.get(district_id)
+        nearest_cells.append(nearest[0] * n_lon + nearest[1] if nearest is not None else -1)
+
+    cells = np.concatenate(cell_blocks).astype(np.int64) if cell_blocks else np.zeros(0, dtype=np.int64)
+    weights = np.concatenate(weight_blocks).astype(float) if weight_blocks else np.zeros(0, dtype=float)
+    indptr_array = np.asarray(indptr, dtype=np.int64)
+    matrix = None
+    if sparse is not None:
+        matrix = sparse.csr_matrix(
+            (weights, cells, indptr_array),
+            shape=(len(meta), grid_shape[0] * grid_shape[1]),
+        )
+    return ZonalWeights(
+        districts=meta,
+        grid_shape=grid_shape,
+        latitudes=np.asarray(latitudes, dtype=float),
+        longitudes=np.asarray(longitudes, dtype=float),
+        indptr=indptr_array,
+        cells=cells,
+        weights=weights,
+        nearest_cells=np.asarray(nearest_cells, dtype=np.int64),
+        matrix=matrix,
+    )
+
+
+def _district_sums(zonal: ZonalWeights, values: np.ndarray, weighted: bool = True) -> np.ndarray:
+    """Per-district sums of ``values`` (slices x cells), returned as slices x districts."""
+    if zonal.matrix is not None:
+        matrix = zonal.matrix
+        if not weighted:
+            matrix = matrix.copy()
+            matrix.data[:] = 1.0
+        return np.asarray((matrix @ values.T).T)
+
+    sums = np.zeros((values.shape[0], len(zonal.districts)), dtype=float)
+    starts = zonal.indptr[:-1]
+    non_empty = starts < zonal.indptr[1:]
+    if non_empty.any():
+        gathered = values[:, zonal.cells]
+        if weighted:
+            gathered = gathered * zonal.weights
+        # Empty districts contribute no cells, so reducing at the non-empty starts
+        # sums exactly each district's own run of cells.
+        sums[:, non_empty] = np.add.reduceat(gathered, starts[non_empty], axis=1)
+    return sums
+
+
+def _cell_unit_vectors(zonal: ZonalWeights, cells: np.ndarray) -> np.ndarray:
+    """3-D unit vectors of flattened cell centres; their chord distance orders cells by great-circle distance."""
+    lat = np.radians(zonal.latitudes[cells // zonal.grid_shape[1]])
+    lon = np.radians(zonal.longitudes[cells % zonal.grid_shape[1]])
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def _nearest_valid_cells(zonal: ZonalWeights, valid_cells: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """For each target cell, the geographically nearest of ``valid_cells``."""
+    candidates = _cell_unit_vectors(zonal, valid_cells)
+    queries = _cell_unit_vectors(zonal, targets)
+    if cKDTree is not None:
+        _, positions = cKDTree(candidates).query(queries)
+        return valid_cells[positions]
+    # Without scipy: the largest dot product is the smallest great-circle distance.
+    positions = np.concatenate(
+        [np.argmax(candidates @ queries[start:start + 64].T, axis=0) for start in range(0, len(queries), 64)]
+    )
+    return valid_cells[positions]
+
+
+def _apply_nearest_cell_fallback(values: np.ndarray, means: np.ndarray, counts: np.ndarray, zonal: ZonalWeights) -> None:
+    """
+    Fill districts without valid cells from their nearest cell or, when that cell is
+    NaN too, from the geographically nearest valid cell to it.
+
+    The nearest-valid search builds one KD-tree per distinct NaN mask (slices of a
+    file usually share the land/sea mask) and resolves all its districts in one query.
+    """
+    slice_indices, district_indices = np.nonzero(counts == 0)
+    nearest = zonal.nearest_cells[district_indices]
+    known = nearest >= 0
+    slice_indices, district_indices, nearest = slice_indices[known], district_indices[known], nearest[known]
+    if not len(slice_indices):
+        return
+
+    direct = values[slice_indices, nearest]
+    resolved = ~np.isnan(direct)
+    means[slice_indices[resolved], district_indices[resolved]] = direct[resolved]
+    counts[slice_indices[resolved], district_indices[resolved]] = 1
+
+    pending = np.flatnonzero(~resolved)
+    slices_by_mask: dict[bytes, list[int]] = defaultdict(list)
+    for slice_index in np.unique(slice_indices[pending]):
+        mask = np.packbits(np.isnan(values[slice_index])).tobytes()
+        slices_by_mask[hashlib.blake2b(mask, digest_size=16).digest()].append(int(slice_index))
+
+    for mask_slices in slices_by_mask.values():
+        valid_cells = np.flatnonzero(~np.isnan(values[mask_slices[0]]))
+        if not len(valid_cells):
+            continue
+        selected = pending[np.isin(slice_indices[pending], mask_slices)]
+        sources = _nearest_valid_cells(zonal, valid_cells, nearest[selected])
+        means[slice_indices[selected], district_indices[selected]] = values[slice_indices[selected], sources]
+        counts[slice_indices[selected], district_indices[selected]] = 1
+
+
+def aggregate_cube(values: np.ndarray, zonal: ZonalWeights) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a ``(..., lat, lon)`` cube to per-district means in one matrix product.
+
+    Returns ``(means, grid_point_counts)`` shaped ``(..., districts)``. NaN cells are
+    excluded from both the sum and the normalization; districts with no valid cell
+    take their nearest cell's value (count 1), and stay NaN when there is none.
+    """
+    leading_shape = values.shape[:-2]
+    flat = values.reshape(-1, zonal.grid_shape[0] * zonal.grid_shape[1]).astype(float, copy=False)
+    valid = ~np.isnan(flat)
+
+    sums = _district_sums(zonal, np.where(valid, flat, 0.0))
+    valid_weights = _district_sums(zonal, valid.astype(float))
+    counts = np.rint(_district_sums(zonal, valid.astype(float), weighted=False)).astype(np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(valid_weights > 0, sums / valid_weights, np.nan)
+
+    _apply_nearest_cell_fallback(flat, means, counts, zonal)
+    district_count = len(zonal.districts)
+    return means.reshape(*leading_shape, district_count), counts.reshape(*leading_shape, district_count)
+
+
+def district_rows(zonal: ZonalWeights, means: np.ndarray, counts: np.ndarray, unit: str) -> list[dict[str, object]]:
+    """Turn one slice of ``aggregate_cube`` output into rows, skipping districts without a value."""
+    return [
+        {**district, "value": float(value), "grid_point_count": int(count), "unit": unit}
+        for district, value, count in zip(zonal.districts, means.tolist(), counts.tolist())
+        if not np.isnan(value)
+    ]
+
+
+def aggregate_values_for_districts(
+    data_array: xr.DataArray,
+    zonal: ZonalWeights,
     variable: str,
     season: str,
 ) -> list[dict[str, object]]:
-    raw = data_array.to_numpy()
     units = data_array.attrs.get("units", "")
-    converted, unit = convert_units(variable, raw, units, season)
-    valid_positions = np.argwhere(~np.isnan(converted))
-    results: list[dict[str, object]] = []
+    converted, unit = convert_units(variable, data_array.to_numpy(), units, season)
+    means, counts = aggregate_cube(converted, zonal)
+    return district_rows(zonal, means, counts, unit)
 
-    for district in districts.to_dict("records"):
-        cell_indices = grid_lookup.get(district["district_id"])
-        valid = np.array([], dtype=float)
-        if cell_indices is not None and len(cell_indices) > 0:
-            values = converted[cell_indices[:, 0], cell_indices[:, 1]]
-            valid = values[~np.isnan(values)]
-            grid_point_count = int(len(valid))
-        else:
-            grid_point_count = 0
-
-        if not len(valid):
-            nearest_cell = nearest_cell_lookup.get(district["district_id"])
-            fallback_value: float | None = None
-            if nearest_cell is not None:
-                nearest_lat_idx, nearest_lon_idx = nearest_cell
-                nearest_value = converted[nearest_lat_idx, nearest_lon_idx]
-                if not np.isnan(nearest_value):
-                    fallback_value = float(nearest_value)
-                elif len(valid_positions):
-                    deltas = valid_positions - np.array([nearest_lat_idx, nearest_lon_idx])
-                    nearest_valid_idx = int(np.argmin((deltas[:, 0] ** 2) + (deltas[:, 1] ** 2)))
-                    fallback_row, fallback_col = valid_positions[nearest_valid_idx]
-                    fallback_value = float(converted[fallback_row, fallback_col])
-            if fallback_value is None:
-                continue
-            valid = np.array([fallback_value], dtype=float)
-            grid_point_count = 1
 
-        results.append(
-            {
-                "district_id": district["district_id"],
-                "district_name": district["district_name"],
-                "region": district["region"],
-                "value": float(valid.mean()),
-                "grid_point_count": grid_point_count,
-                "unit": unit,
-            }
-        )
-    return results
+def _block_length(data_array: xr.DataArray, dim: str, step_bytes: int, max_block_bytes: int) -> int:
+    """Steps of ``dim`` per block: as many as fit the budget, rounded down to whole on-disk chunks."""
+    length = max(int(max_block_bytes // max(step_bytes, 1)), 1)
+    chunk_sizes = data_array.encoding.get("chunksizes")
+    if chunk_sizes:
+        chunk = int(chunk_sizes[data_array.dims.index(dim)])
+        if length >= chunk:
+            length -= length % chunk
+    return min(length, data_array.sizes[dim])
+
+
+def aggregate_indicator_blocks(
+    source: SourceFile,
+    zonal: ZonalWeights,
+    outer_dim: str,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_MB * 1024 * 1024,
+) -> tuple[np.ndarray, list[int], np.ndarray, np.ndarray, str]:
+    """
+    Aggregate the file's ``indicator`` to districts, reading it in a few large blocks.
+
+    Each block holds all ``outer_dim`` steps (periods or years) that fit in
+    ``max_block_bytes`` for one percentile, aligned to the variable's on-disk chunks,
+    so the file is decompressed in large sequential reads instead of one slice at a
+    time. Returns ``(outer_values, percentiles, means, counts, unit)`` with means and
+    counts shaped ``(outer, percentile, district)``.
+    """
+    district_count = len(zonal.districts)
+    with xr.open_dataset(source.path) as dataset:
+        outer_values = dataset[outer_dim].values
+        percentiles = [int(item) for item in dataset["percentiles"].values.tolist()]
+        indicator = dataset["indicator"]
+        units = indicator.attrs.get("units", "")
+        step_bytes = zonal.grid_shape[0] * zonal.grid_shape[1] * 8 * BLOCK_WORKING_COPIES
+        block_length = _block_length(indicator, outer_dim, step_bytes, max_block_bytes)
+
+        means = np.full((len(outer_values), len(percentiles), district_count), np.nan)
+        counts = np.zeros((len(outer_values), len(percentiles), district_count), dtype=np.int64)
+        unit = units
+        for percentile_index, percentile in enumerate(dataset["percentiles"].values):
+            for start in range(0, len(outer_values), block_length):
+                block = (
+                    indicator
+                    .sel(percentiles=percentile)
+                    .isel({outer_dim: slice(start, start + block_length)})
+                    .transpose(outer_dim, ...)
+                )
+                converted, unit = convert_units(source.variable, block.to_numpy(), units, source.season)
+                block_means, block_counts = aggregate_cube(converted, zonal)
+                means[start:start + block_length, percentile_index] = block_means
+                counts[start:start + block_length, percentile_index] = block_counts
+    return outer_values, percentiles, means, counts, unit
 
 
 def process_period_file(
     source: SourceFile,
-    districts: gpd.GeoDataFrame,
-    grid_lookup: dict[str, np.ndarray],
-    nearest_cell_lookup: dict[str, tuple[int, int]],
+    zonal: ZonalWeights,
     period_mapping: dict[str, str],
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_MB * 1024 * 1024,
 ) -> list[dict[str, object]]:
-    dataset = xr.open_dataset(source.path)
+    period_ids, percentiles, means, counts, unit = aggregate_indicator_blocks(
+        source, zonal, "periodID", max_block_bytes
+    )
     rows: list[dict[str, object]] = []
-    percentiles = [int(item) for item in dataset["percentiles"].values.tolist()]
-
-    for period_id in dataset["periodID"].values.tolist():
+    for period_index, period_id in enumerate(period_ids.tolist()):
         atlas_period = period_mapping[str(period_id)]
         scenario = "historical" if atlas_period == "baseline" else source.scenario
-        for percentile in percentiles:
+        for percentile_index, percentile in enumerate(percentiles):
             percentile_name = PERCENTILE_MAPPING[int(percentile)]
-            selection = dataset["indicator"].sel(periodID=period_id, percentiles=percentile)
-            for row in aggregate_values_for_districts(
-                selection,
-                districts,
-                grid_lookup,
-                nearest_cell_lookup,
-                source.variable,
-                source.season,
-            ):
+            slice_means = means[period_index, percentile_index]
+            slice_counts = counts[period_index, percentile_index]
+            for row in district_rows(zonal, slice_means, slice_counts, unit):
                 rows.append(
                     {
                         **row,
@@ -478,35 +933,27 @@ def process_period_file(
                         "percentile": percentile_name,
                     }
                 )
-    dataset.close()
     return rows
 
 
 def process_yearly_file(
     source: SourceFile,
-    districts: gpd.GeoDataFrame,
-    grid_lookup: dict[str, np.ndarray],
-    nearest_cell_lookup: dict[str, tuple[int, int]],
+    zonal: ZonalWeights,
     baseline_end_year: int = 2020,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_MB * 1024 * 1024,
 ) -> list[dict[str, object]]:
-    dataset = xr.open_dataset(source.path)
+    timestamps, percentiles, means, counts, unit = aggregate_indicator_blocks(
+        source, zonal, "time", max_block_bytes
+    )
     rows: list[dict[str, object]] = []
-    percentiles = [int(item) for item in dataset["percentiles"].values.tolist()]
-
-    for time_index, timestamp in enumerate(dataset["time"].values):
+    for time_index, timestamp in enumerate(timestamps):
         year = pd.Timestamp(timestamp).year
         scenario = "historical" if year <= baseline_end_year else source.scenario
-        for percentile in percentiles:
+        for percentile_index, percentile in enumerate(percentiles):
             percentile_name = PERCENTILE_MAPPING[int(percentile)]
-            selection = dataset["indicator"].isel(time=time_index).sel(percentiles=percentile)
-            for row in aggregate_values_for_districts(
-                selection,
-                districts,
-                grid_lookup,
-                nearest_cell_lookup,
-                source.variable,
-                source.season,
-            ):
+            slice_means = means[time_index, percentile_index]
+            slice_counts = counts[time_index, percentile_index]
+            for row in district_rows(zonal, slice_means, slice_counts, unit):
                 rows.append(
                     {
                         **row,
@@ -516,7 +963,6 @@ def process_yearly_file(
                         "percentile": percentile_name,
                     }
                 )
-    dataset.close()
     return rows
 
 
@@ -526,31 +972,65 @@ def _normalize_sea_level_units(values: np.ndarray) -> tuple[np.ndarray, str]:
     return values / 10.0, "cm"
 
 
+def coastal_districts(districts: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """The directly coastal districts, resolved once per file rather than per aggregated row."""
+    mask = districts["district_name"].astype(str).map(is_direct_coastal_district).to_numpy(dtype=bool)
+    return districts[mask]
+
+
+def aggregate_sea_level_cube(
+    dataset: xr.Dataset,
+    zonal: ZonalWeights,
+    years: list[object],
+) -> tuple[list[str], list[str], np.ndarray, np.ndarray, str]:
+    """
+    Reduce every available scenario x quantile x ``years`` slice of ``sea_level_change``
+    to district means with a single ``aggregate_cube`` call.
+
+    Returns ``(scenario_keys, percentile_names, means, counts, unit)`` with means and
+    counts shaped ``(scenario, quantile, year, district)``.
+    """
+    scenarios = {name: key for name, key in SEA_LEVEL_SCENARIOS.items() if name in dataset["scenarios"].values}
+    quantiles = {
+        value: name for value, name in SEA_LEVEL_PERCENTILE_MAPPING.items() if value in dataset["quantiles"].values
+    }
+    shape = (len(scenarios), len(quantiles), len(years), len(zonal.districts))
+    if not all(shape):
+        return list(scenarios.values()), list(quantiles.values()), np.full(shape, np.nan), np.zeros(shape, np.int64), "cm"
+
+    cube = (
+        dataset["sea_level_change"]
+        .sel(scenarios=list(scenarios), quantiles=list(quantiles), years=years)
+        .transpose("scenarios", "quantiles", "years", "lat", "lon")
+        .to_numpy()
+    )
+    converted, unit = _normalize_sea_level_units(cube)
+    means, counts = aggregate_cube(converted, zonal)
+    return list(scenarios.values()), list(quantiles.values()), means, counts, unit
+
+
 def process_sea_level_file(
     path: Path,
     districts: gpd.GeoDataFrame,
+    aggregation: str = "centroid",
+    cache_dir: Path | None = None,
 ) -> list[dict[str, object]]:
-    dataset = xr.open_dataset(path)
-    rows: list[dict[str, object]] = []
-    data_array = dataset["sea_level_change"]
-    latitudes = dataset["lat"].values
-    longitudes = dataset["lon"].values
-    grid_lookup = build_grid_lookup(latitudes, longitudes, districts)
-    nearest_cell_lookup = build_nearest_cell_lookup(latitudes, longitudes, districts)
+    coastal = coastal_districts(districts)
+    if coastal.empty:
+        return []
 
-    coastal_districts = [
-        district
-        for district in districts.to_dict("records")
-        if is_direct_coastal_district(str(district["district_name"]))
-    ]
+    with xr.open_dataset(path) as dataset:
+        # Weights cover the coastal districts only, so no inland district is ever aggregated.
+        zonal = build_grid_zonal_weights(dataset["lat"].values, dataset["lon"].values, coastal, aggregation, cache_dir)
+        year_labels = [label for label in SEA_LEVEL_PERIOD_MAPPING if label in dataset["years"].values]
+        scenario_keys, percentile_names, means, counts, unit = aggregate_sea_level_cube(dataset, zonal, year_labels)
 
+    rows: list[dict[str, object]] = []
     for percentile_name in SEA_LEVEL_PERCENTILE_MAPPING.values():
-        for district in coastal_districts:
+        for district in zonal.districts:
             rows.append(
                 {
-                    "district_id": district["district_id"],
-                    "district_name": district["district_name"],
-                    "region": district["region"],
+                    **district,
                     "value": 0.0,
                     "grid_point_count": None,
                     "unit": "cm",
@@ -559,58 +1039,30 @@ def process_sea_level_file(
                     "scenario": "historical",
                     "percentile": percentile_name,
                 }
-                )
-
-    for scenario_name, scenario_key in SEA_LEVEL_SCENARIOS.items():
-        if scenario_name not in dataset["scenarios"].values:
-            continue
-        for quantile_value, percentile_name in SEA_LEVEL_PERCENTILE_MAPPING.items():
-            if quantile_value not in dataset["quantiles"].values:
-                continue
-            for year_label, atlas_period in SEA_LEVEL_PERIOD_MAPPING.items():
-                if year_label not in dataset["years"].values:
-                    continue
-
-                selection = (
-                    data_array
-                    .sel(scenarios=scenario_name, quantiles=quantile_value, years=year_label)
-                    .transpose("lat", "lon")
-                )
-                converted, unit = _normalize_sea_level_units(selection.to_numpy())
-                normalized_selection = xr.DataArray(
-                    converted,
-                    coords={"lat": selection["lat"].values, "lon": selection["lon"].values},
-                    dims=("lat", "lon"),
-                    attrs={"units": unit},
-                )
+            )
 
-                for row in aggregate_values_for_districts(
-                    normalized_selection,
-                    districts,
-                    grid_lookup,
-                    nearest_cell_lookup,
-                    "sea_level_rise",
-                    "annual",
-                ):
-                    if not is_direct_coastal_district(str(row["district_name"])):
-                        continue
+    for scenario_index, scenario_key in enumerate(scenario_keys):
+        for percentile_index, percentile_name in enumerate(percentile_names):
+            for year_index, year_label in enumerate(year_labels):
+                slice_index = (scenario_index, percentile_index, year_index)
+                for row in district_rows(zonal, means[slice_index], counts[slice_index], unit):
                     rows.append(
                         {
                             **row,
                             "variable": "sea_level_rise",
-                            "period": atlas_period,
+                            "period": SEA_LEVEL_PERIOD_MAPPING[year_label],
                             "scenario": scenario_key,
                             "percentile": percentile_name,
                         }
                     )
-
-    dataset.close()
     return rows
 
 
 def process_sea_level_yearly_file(
     path: Path,
     districts: gpd.GeoDataFrame,
+    aggregation: str = "centroid",
+    cache_dir: Path | None = None,
 ) -> list[dict[str, object]]:
     """Aggregate yearly SLR projections per coastal district.
 
@@ -620,28 +1072,26 @@ def process_sea_level_yearly_file(
       2. One row per (year, scenario, percentile, district) for the SSP scenarios,
          capped at SEA_LEVEL_YEARLY_END to match the chart x-axis.
     """
-    dataset = xr.open_dataset(path)
-    rows: list[dict[str, object]] = []
-    data_array = dataset["sea_level_change"]
-    latitudes = dataset["lat"].values
-    longitudes = dataset["lon"].values
-    grid_lookup = build_grid_lookup(latitudes, longitudes, districts)
-    nearest_cell_lookup = build_nearest_cell_lookup(latitudes, longitudes, districts)
+    coastal = coastal_districts(districts)
+    if coastal.empty:
+        return []
 
-    coastal_districts = [
-        district
-        for district in districts.to_dict("records")
-        if is_direct_coastal_district(str(district["district_name"]))
-    ]
+    with xr.open_dataset(path) as dataset:
+        zonal = build_grid_zonal_weights(dataset["lat"].values, dataset["lon"].values, coastal, aggregation, cache_dir)
+        years = [
+            int(year)
+            for year in dataset["years"].values.tolist()
+            if SEA_LEVEL_YEARLY_BASELINE_END < int(year) <= SEA_LEVEL_YEARLY_END
+        ]
+        scenario_keys, percentile_names, means, counts, unit = aggregate_sea_level_cube(dataset, zonal, years)
 
+    rows: list[dict[str, object]] = []
     for percentile_name in SEA_LEVEL_PERCENTILE_MAPPING.values():
         for year in range(SEA_LEVEL_YEARLY_BASELINE_START, SEA_LEVEL_YEARLY_BASELINE_END + 1):
-            for district in coastal_districts:
+            for district in zonal.districts:
                 rows.append(
                     {
-                        "district_id": district["district_id"],
-                        "district_name": district["district_name"],
-                        "region": district["region"],
+                        **district,
                         "value": 0.0,
                         "grid_point_count": None,
                         "unit": "cm",
@@ -652,54 +1102,190 @@ def process_sea_level_yearly_file(
                     }
                 )
 
-    available_years = [int(y) for y in dataset["years"].values.tolist()]
-    for scenario_name, scenario_key in SEA_LEVEL_SCENARIOS.items():
-        if scenario_name not in dataset["scenarios"].values:
-            continue
-        for quantile_value, percentile_name in SEA_LEVEL_PERCENTILE_MAPPING.items():
-            if quantile_value not in dataset["quantiles"].values:
-                continue
-            for year_value in available_years:
-                if year_value <= SEA_LEVEL_YEARLY_BASELINE_END or year_value > SEA_LEVEL_YEARLY_END:
-                    continue
-
-                selection = (
-                    data_array
-                    .sel(scenarios=scenario_name, quantiles=quantile_value, years=year_value)
-                    .transpose("lat", "lon")
-                )
-                converted, unit = _normalize_sea_level_units(selection.to_numpy())
-                normalized_selection = xr.DataArray(
-                    converted,
-                    coords={"lat": selection["lat"].values, "lon": selection["lon"].values},
-                    dims=("lat", "lon"),
-                    attrs={"units": unit},
-                )
-
-                for row in aggregate_values_for_districts(
-                    normalized_selection,
-                    districts,
-                    grid_lookup,
-                    nearest_cell_lookup,
-                    "sea_level_rise",
-                    "annual",
-                ):
-                    if not is_direct_coastal_district(str(row["district_name"])):
-                        continue
+    for scenario_index, scenario_key in enumerate(scenario_keys):
+        for percentile_index, percentile_name in enumerate(percentile_names):
+            for year_index, year in enumerate(years):
+                slice_index = (scenario_index, percentile_index, year_index)
+                for row in district_rows(zonal, means[slice_index], counts[slice_index], unit):
                     rows.append(
                         {
                             **row,
                             "variable": "sea_level_rise",
-                            "year": year_value,
+                            "year": year,
                             "scenario": scenario_key,
                             "percentile": percentile_name,
                         }
                     )
-
-    dataset.close()
     return rows
 
 
+def file_content_hash(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def import_settings_key(districts: gpd.GeoDataFrame, period_mapping: dict[str, str], aggregation: str) -> str:
+    """Hash of everything besides the source files that the produced rows depend on."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{IMPORT_MANIFEST_VERSION}:{aggregation}\n".encode("utf-8"))
+    digest.update(json.dumps(period_mapping, sort_keys=True).encode("utf-8"))
+    for district_id, district_name, region, geometry in zip(
+        districts["district_id"], districts["district_name"], districts["region"], districts.geometry
+    ):
+        digest.update(f"{district_id}\0{district_name}\0{region}\0".encode("utf-8"))
+        digest.update(geometry.wkb)
+    return digest.hexdigest()
+
+
+def load_import_manifest(path: Path, settings_key: str) -> dict[str, dict[str, object]]:
+    """Per-source entries of the previous run, or ``{}`` if missing, unreadable or built with other settings."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("settings_key") != settings_key:
+        return {}
+    return manifest.get("sources", {})
+
+
+def write_import_manifest(path: Path, settings_key: str, sources: dict[str, dict[str, object]]) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    payload = {"version": IMPORT_MANIFEST_VERSION, "settings_key": settings_key, "sources": sources}
+    temporary.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def run_namespace(cache_dir: Path, output_dir: Path, settings_key: str) -> Path:
+    """
+    Run directory for one output directory and settings. The manifest that vouches
+    for the runs lives in the output directory and covers only its own settings,
+    so runs are never shared with (or overwritten by) another output or setting.
+    """
+    output_key = hashlib.blake2b(str(output_dir.resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return cache_dir / "runs" / f"{output_key}-{output_dir.name}" / settings_key
+
+
+def source_run_path(run_dir: Path, task: ImportTask) -> Path:
+    """Stable run file for a source, so later runs can find and replace it."""
+    path_key = hashlib.blake2b(str(task.path.resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return run_dir / f"{path_key}-{task.path.stem}.csv.gz"
+
+
+def reusable_manifest_entry(
+    task: ImportTask,
+    entry: dict[str, object] | None,
+    run_path: Path,
+) -> tuple[dict[str, object], bool]:
+    """
+    Return the manifest entry describing ``task``'s source and whether its
+    previous run can be reused. Files whose size and mtime are unchanged are
+    trusted without hashing; otherwise the content hash decides, so a touched
+    but identical file is not reprocessed.
+    """
+    stat = task.path.stat()
+    current: dict[str, object] = {
+        "kind": task.kind,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "run": run_path.name,
+    }
+    usable = entry is not None and entry.get("kind") == task.kind and run_path.exists()
+    if usable and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return {**current, "hash": entry["hash"], "rows": entry["rows"]}, True
+
+    current["hash"] = file_content_hash(task.path)
+    if usable and entry.get("hash") == current["hash"]:
+        return {**current, "rows": entry["rows"]}, True
+    return current, False
+
+
+def build_import_tasks(
+    files: list[SourceFile],
+    sea_level_files: list[Path],
+    sea_level_yearly_files: list[Path],
+) -> list[ImportTask]:
+    return [
+        *(ImportTask(path=source.path, kind=source.kind, source=source) for source in files),
+        *(ImportTask(path=path, kind="sea_level_periods") for path in sea_level_files),
+        *(ImportTask(path=path, kind="sea_level_years") for path in sea_level_yearly_files),
+    ]
+
+
+def task_table(task: ImportTask) -> TableSpec:
+    return PERIOD_TABLE if task.kind in {"periods", "sea_level_periods"} else YEARLY_TABLE
+
+
+def run_import_task(task: ImportTask, context: ImportContext) -> list[dict[str, object]]:
+    if task.kind == "periods":
+        return process_period_file(task.source, context.zonal, context.period_mapping, context.max_block_bytes)
+    if task.kind == "years":
+        return process_yearly_file(task.source, context.zonal, max_block_bytes=context.max_block_bytes)
+    if task.kind == "sea_level_periods":
+        return process_sea_level_file(task.path, context.districts, context.aggregation, context.cache_dir)
+    return process_sea_level_yearly_file(task.path, context.districts, context.aggregation, context.cache_dir)
+
+
+_worker_context: ImportContext | None = None
+
+
+def _init_worker(context: ImportContext) -> None:
+    global _worker_context
+    _worker_context = context
+
+
+def _run_worker_task(task: ImportTask, run_path: Path) -> tuple[int, float]:
+    """Aggregate one source into a sorted run file; only the row count crosses the process boundary."""
+    started = time.perf_counter()
+    row_count = write_run(run_path, task_table(task), run_import_task(task, _worker_context))
+    return row_count, time.perf_counter() - started
+
+
+def run_import_tasks(
+    tasks: list[ImportTask],
+    context: ImportContext,
+    jobs: int,
+    run_paths: list[Path],
+) -> list[tuple[int, float]]:
+    """
+    Process ``tasks`` on ``jobs`` processes into the matching ``run_paths``.
+    Row counts and timings are returned in task order, not completion order.
+    """
+    results: list[tuple[int, float] | None] = [None] * len(tasks)
+
+    def report(index: int) -> None:
+        row_count, seconds = results[index]
+        print(
+            f"[{sum(item is not None for item in results)}/{len(tasks)}] "
+            f"{tasks[index].path.name}: {row_count} rows in {seconds:.1f}s",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    if jobs <= 1 or len(tasks) <= 1:
+        _init_worker(context)
+        for index, task in enumerate(tasks):
+            results[index] = _run_worker_task(task, run_paths[index])
+            report(index)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)),
+            initializer=_init_worker,
+            initargs=(context,),
+        ) as pool:
+            futures = {
+                pool.submit(_run_worker_task, task, run_paths[index]): index for index, task in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                report(index)
+
+    return results
+
+
 def main() -> None:
     args = parse_args()
     source_directories = collect_source_directories(args)
@@ -708,64 +1294,111 @@ def main() -> None:
     sea_level_yearly_files = collect_sea_level_yearly_files(args)
     if not files and not sea_level_files and not sea_level_yearly_files:
         raise SystemExit("No matching NetCDF files found.")
+    if args.format != "csv" and not parquet_available():
+        raise SystemExit("--format parquet requires pyarrow (pip install pyarrow).")
 
     districts = load_districts(args.districts)
     period_mapping = parse_period_definitions(args.periods_file)
 
-    grid_lookup: dict[str, np.ndarray] = {}
-    nearest_cell_lookup: dict[str, tuple[int, int]] = {}
-    if files:
-        sample_dataset = xr.open_dataset(files[0].path)
-        grid_lookup = build_grid_lookup(sample_dataset["lat"].values, sample_dataset["lon"].values, districts)
-        nearest_cell_lookup = build_nearest_cell_lookup(
-            sample_dataset["lat"].values,
-            sample_dataset["lon"].values,
-            districts,
-        )
-        sample_dataset.close()
-
-    period_rows: list[dict[str, object]] = []
-    yearly_rows: list[dict[str, object]] = []
-
-    for source in files:
-        if source.kind == "periods":
-            period_rows.extend(process_period_file(source, districts, grid_lookup, nearest_cell_lookup, period_mapping))
-        else:
-            yearly_rows.extend(process_yearly_file(source, districts, grid_lookup, nearest_cell_lookup))
-    for sea_level_file in sea_level_files:
-        period_rows.extend(process_sea_level_file(sea_level_file, districts))
-    for sea_level_yearly_file in sea_level_yearly_files:
-        yearly_rows.extend(process_sea_level_yearly_file(sea_level_yearly_file, districts))
-
+    cache_dir = args.cache_dir or DEFAULT_CACHE_DIR
     output_dir = args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    period_frame = pd.DataFrame(period_rows)
-    if not period_frame.empty:
-        period_frame = period_frame.sort_values(
-            ["variable", "scenario", "period", "percentile", "region", "district_name"]
-        )
-
-    yearly_frame = pd.DataFrame(yearly_rows)
-    if not yearly_frame.empty:
-        yearly_frame = yearly_frame.sort_values(
-            ["variable", "scenario", "year", "percentile", "region", "district_name"]
-        )
-
-    period_frame.to_csv(output_dir / "climate_period_values.csv", index=False)
-    yearly_csv_path = output_dir / "climate_yearly_values.csv"
-    yearly_frame.to_csv(yearly_csv_path, index=False)
-    with yearly_csv_path.open("rb") as src, gzip.open(output_dir / "climate_yearly_values.csv.gz", "wb") as dst:
-        dst.writelines(src)
+    manifest_path = output_dir / IMPORT_MANIFEST_NAME
+    settings_key = import_settings_key(districts, period_mapping, args.aggregation)
+    run_dir = run_namespace(cache_dir, output_dir, settings_key)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    previous_sources = {} if args.full else load_import_manifest(manifest_path, settings_key)
+
+    tasks = build_import_tasks(files, sea_level_files, sea_level_yearly_files)
+    run_paths = [source_run_path(run_dir, task) for task in tasks]
+    sources: dict[str, dict[str, object]] = {}
+    pending: list[int] = []
+    for index, task in enumerate(tasks):
+        source_key = str(task.path.resolve())
+        sources[source_key], reusable = reusable_manifest_entry(task, previous_sources.get(source_key), run_paths[index])
+        if not reusable:
+            pending.append(index)
+    print(f"{len(pending)} of {len(tasks)} sources changed since the last import.", file=sys.stderr, flush=True)
+
+    zonal: ZonalWeights | None = None
+    if any(tasks[index].kind in {"periods", "years"} for index in pending):
+        with xr.open_dataset(files[0].path) as sample_dataset:
+            latitudes = sample_dataset["lat"].values
+            longitudes = sample_dataset["lon"].values
+        zonal = build_grid_zonal_weights(latitudes, longitudes, districts, args.aggregation, cache_dir)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    context = ImportContext(
+        districts,
+        zonal,
+        period_mapping,
+        args.aggregation,
+        cache_dir,
+        args.max_block_mb * 1024 * 1024,
+    )
+    started = time.perf_counter()
+    processed = run_import_tasks(
+        [tasks[index] for index in pending], context, jobs, [run_paths[index] for index in pending]
+    )
+    aggregation_seconds = time.perf_counter() - started
+    seconds_by_task = {index: seconds for index, (_, seconds) in zip(pending, processed)}
+    for index, (row_count, _) in zip(pending, processed):
+        sources[str(tasks[index].path.resolve())]["rows"] = row_count
+
+    # Splice: the new runs and the kept runs of unchanged sources are merged into fresh outputs.
+    tables: dict[str, dict[str, object]] = {}
+    for table in (PERIOD_TABLE, YEARLY_TABLE):
+        table_runs = [run_path for task, run_path in zip(tasks, run_paths) if task_table(task) is table]
+        # Each output is a fresh merge of the same runs, so "both" never buffers the merged rows.
+        if args.format in ("csv", "both"):
+            tables[table.name] = write_table(output_dir / table.file_name, table, merge_runs(table, table_runs))
+        if args.format in ("parquet", "both"):
+            tables[table.name] = write_parquet_dataset(
+                output_dir / table.dataset_name, table, merge_runs(table, table_runs)
+            )
+        # The API prefers a Parquet dataset over the CSV (and reads the CSV without
+        # pyarrow), so an output this run did not write must not linger with old data.
+        if args.format == "csv":
+            shutil.rmtree(output_dir / table.dataset_name, ignore_errors=True)
+        elif args.format == "parquet":
+            (output_dir / table.file_name).unlink(missing_ok=True)
     export_district_geojson(districts, output_dir / "districts.geojson")
+    # Only districts whose geometry changed are simplified again (see simplify_geojson.py).
+    map_levels = build_map_levels(output_dir / "districts.geojson", output_dir, cache_dir, jobs)
+
+    write_import_manifest(manifest_path, settings_key, sources)
+    # Runs of sources that were removed (or renamed) since the last import, and runs
+    # of this output directory built with earlier settings; other outputs' runs are untouched.
+    kept_runs = {run_path.name for run_path in run_paths}
+    for stale_run in run_dir.glob("*.csv.gz"):
+        if stale_run.name not in kept_runs:
+            stale_run.unlink(missing_ok=True)
+    for stale_settings in run_dir.parent.iterdir():
+        if stale_settings != run_dir and stale_settings.is_dir():
+            shutil.rmtree(stale_settings, ignore_errors=True)
 
     summary = {
-        "period_rows": len(period_frame),
-        "yearly_rows": len(yearly_frame),
+        "period_rows": tables["period"]["rows"],
+        "yearly_rows": tables["yearly"]["rows"],
         "district_count": int(districts["district_id"].nunique()),
         "grid_resolution_km": GRID_RESOLUTION_KM,
-        "variables": sorted(period_frame["variable"].unique().tolist()),
-        "scenarios": sorted(period_frame["scenario"].unique().tolist()),
+        "variables": tables["period"]["variables"],
+        "scenarios": tables["period"]["scenarios"],
+        "aggregation": args.aggregation,
+        "format": args.format,
+        "jobs": jobs,
+        "aggregation_seconds": round(aggregation_seconds, 2),
+        "reprocessed_sources": len(pending),
+        "map_levels": {level["level"]: level["simplified"] for level in map_levels},
+        "source_files": [
+            {
+                "file": task.path.name,
+                "rows": sources[str(task.path.resolve())]["rows"],
+                "seconds": round(seconds_by_task[index], 2) if index in seconds_by_task else None,
+                "reused": index not in seconds_by_task,
+            }
+            for index, task in enumerate(tasks)
+        ],
     }
     (output_dir / "import_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
     print(json.dumps(summary, indent=2))
@@ -0,0 +1,153 @@
+"""
+Replace one variable's rows in the processed climate tables without a full rebuild.
+
+The processed tables are sorted by variable first, so a variable's rows form one
+contiguous block. This script splices new rows in place of that block in the
+CSV table, replaces only the ``variable=<id>`` partition of the Parquet dataset
+(when either exists), and for the yearly table rewrites only the district
+timeseries files whose entry for the variable changed.
+
+The new rows come from a CSV (optionally gzipped) in the table's columns, for
+example a run file from ``<cache-dir>/runs/<output dir>/<settings>/``:
+
+    python scripts/patch_climate_variable.py --table yearly --variable sea_level_rise --rows rows.csv.gz
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+from climate_tables import (
+    PERIOD_TABLE,
+    YEARLY_TABLE,
+    TableSpec,
+    format_row,
+    parquet_available,
+    read_rows,
+    replace_parquet_variable,
+    replace_variable_rows,
+    row_sort_key,
+)
+from precompute_district_timeseries import add_row, new_district_points, variable_series, write_district_file
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+PROCESSED_DIR = BACKEND_ROOT / "app" / "data" / "processed"
+TABLES = {table.name: table for table in (PERIOD_TABLE, YEARLY_TABLE)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replace one variable in the processed climate tables.")
+    parser.add_argument("--table", choices=sorted(TABLES), required=True)
+    parser.add_argument("--variable", required=True)
+    parser.add_argument(
+        "--rows",
+        type=Path,
+        required=True,
+        help="CSV or CSV.gz with the table's columns; rows of other variables are rejected.",
+    )
+    parser.add_argument("--processed-dir", type=Path, default=PROCESSED_DIR)
+    parser.add_argument(
+        "--skip-timeseries",
+        action="store_true",
+        help="Do not refresh district_timeseries/ (yearly table only).",
+    )
+    return parser.parse_args()
+
+
+def prepare_rows(table: TableSpec, variable: str, rows: Iterable[dict[str, object]]) -> list[list[str]]:
+    """Format ``rows`` for ``table`` and sort them into table order."""
+    formatted = [format_row(table, row) for row in rows]
+    variable_index = table.columns.index("variable")
+    others = {row[variable_index] for row in formatted} - {variable}
+    if others:
+        raise ValueError(f"Rows for other variables supplied while replacing {variable!r}: {sorted(others)}")
+    return sorted(formatted, key=row_sort_key(table))
+
+
+def refresh_district_timeseries(timeseries_dir: Path, variable: str, rows: list[list[str]]) -> int:
+    """
+    Replace ``variable`` in each district's timeseries file. Files whose entry is
+    unchanged are left alone; returns the number of files written.
+    """
+    per_district = new_district_points()
+    district_names: dict[str, str] = {}
+    for row in rows:
+        add_row(per_district, district_names, dict(zip(YEARLY_TABLE.columns, row)))
+
+    timeseries_dir.mkdir(parents=True, exist_ok=True)
+    existing = {path.name.removesuffix(".json.gz") for path in timeseries_dir.glob("*.json.gz")}
+    written = 0
+    for district_id in sorted(existing | set(per_district)):
+        path = timeseries_dir / f"{district_id}.json.gz"
+        if district_id in existing:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        else:
+            payload = {"district_id": district_id, "district_name": district_names[district_id], "variables": {}}
+
+        series = variable_series(per_district[district_id][variable]) if district_id in per_district else {}
+        if payload["variables"].get(variable) == (series or None):
+            continue
+        if series:
+            payload["variables"][variable] = series
+        else:
+            payload["variables"].pop(variable, None)
+        write_district_file(path, payload)
+        written += 1
+    return written
+
+
+def replace_variable(
+    processed_dir: Path,
+    table: TableSpec,
+    variable: str,
+    rows: list[list[str]],
+    *,
+    refresh_timeseries: bool = True,
+) -> dict[str, Any]:
+    """Splice ``rows`` (from ``prepare_rows``) into every output of ``table`` present in ``processed_dir``."""
+    result: dict[str, Any] = {"variable": variable, "table": table.name}
+    csv_path = processed_dir / table.file_name
+    dataset_path = processed_dir / table.dataset_name
+    if not csv_path.exists() and not dataset_path.is_dir():
+        raise FileNotFoundError(f"No {table.name} table in {processed_dir}")
+
+    if csv_path.exists():
+        print(f"Splicing {variable} into {csv_path.name}...")
+        result["csv"] = replace_variable_rows(csv_path, table, variable, rows)
+    if dataset_path.is_dir():
+        if not parquet_available():
+            raise RuntimeError(f"{dataset_path} exists but pyarrow is not installed to update it.")
+        print(f"Replacing the variable={variable} partition of {dataset_path.name}/...")
+        result["parquet"] = replace_parquet_variable(dataset_path, table, variable, rows)
+    if table is YEARLY_TABLE and refresh_timeseries:
+        result["timeseries_files_written"] = refresh_district_timeseries(
+            processed_dir / "district_timeseries", variable, rows
+        )
+    return result
+
+
+def main() -> None:
+    args = parse_args()
+    table = TABLES[args.table]
+    if not args.rows.exists():
+        raise SystemExit(f"Missing rows file: {args.rows}")
+
+    rows = prepare_rows(table, args.variable, (dict(zip(table.columns, row)) for row in read_rows(args.rows, table)))
+    if not rows:
+        print(f"{args.rows} has no rows; {args.variable} will be removed.")
+    result = replace_variable(
+        args.processed_dir,
+        table,
+        args.variable,
+        rows,
+        refresh_timeseries=not args.skip_timeseries,
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,93 +11,207 @@ This script pre-computes one gzipped JSON file per district containing all
 the endpoint reads only the single file for the requested district — fast and
 memory-efficient.
 
+The CSV is read in one streaming pass that spills each district's rows to its
+own temporary file; a process pool then builds and writes the district files.
+Each file is written to a temporary name and renamed into place, so a running
+server never reads a half-written file.
+
 Run once after `climate_yearly_values.csv.gz` is updated:
-    python scripts/precompute_district_timeseries.py
+    python scripts/precompute_district_timeseries.py [--jobs N]
 """
 from __future__ import annotations
 
+import argparse
 import csv
 import gzip
 import json
+import os
+import shutil
+import sys
+import tempfile
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 YEARLY_CSV = BACKEND_ROOT / "app" / "data" / "processed" / "climate_yearly_values.csv.gz"
 OUTPUT_DIR = BACKEND_ROOT / "app" / "data" / "processed" / "district_timeseries"
+PERCENTILES = {"p10", "p50", "p90"}
+# Columns kept in the per-district spill files.
+SPILL_COLUMNS = ("district_name", "variable", "scenario", "percentile", "year", "value", "unit")
+# Buffered rows across all districts before they are appended to the spill files.
+SPILL_BUFFER_ROWS = 200_000
+# The files are read per request, so decompression speed matters more than size.
+TIMESERIES_COMPRESSLEVEL = 6
+
+# district_id -> variable -> scenario -> year -> {p10, p50, p90, year, unit}
+DistrictPoints = dict[str, dict[str, dict[str, dict[int, dict]]]]
+
+
+def new_district_points() -> DistrictPoints:
+    return defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+
+
+def add_row(per_district: DistrictPoints, district_names: dict[str, str], row: dict[str, str]) -> None:
+    """Fold one yearly CSV row into ``per_district``; rows that can't be charted are skipped."""
+    district_id = row["district_id"]
+    district_names[district_id] = row["district_name"]
+    percentile = row["percentile"].lower()
+    if percentile not in PERCENTILES:
+        return
+    try:
+        year = int(row["year"])
+        value = float(row["value"])
+    except (TypeError, ValueError):
+        return
+    point = per_district[district_id][row["variable"]][row["scenario"].lower()].setdefault(
+        year, {"year": year, "unit": row["unit"]}
+    )
+    point[percentile] = value
+
+
+def scenario_points(year_map: dict[int, dict]) -> list[dict]:
+    """Chart points for one (variable, scenario), keeping only years with all three percentiles."""
+    points = []
+    for year in sorted(year_map):
+        p = year_map[year]
+        if PERCENTILES.issubset(p):
+            points.append(
+                {
+                    "year": year,
+                    "p10": p["p10"],
+                    "p50": p["p50"],
+                    "p90": p["p90"],
+                    "unit": p["unit"],
+                }
+            )
+    return points
+
+
+def variable_series(scenarios: dict[str, dict[int, dict]]) -> dict[str, list[dict]]:
+    series = {}
+    for scenario, year_map in scenarios.items():
+        points = scenario_points(year_map)
+        if points:
+            series[scenario] = points
+    return series
+
+
+def write_district_file(path: Path, payload: dict) -> int:
+    """Atomically write one district's timeseries file; returns its size in bytes."""
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=TIMESERIES_COMPRESSLEVEL) as out:
+        json.dump(payload, out, separators=(",", ":"))
+    os.replace(temporary, path)
+    return path.stat().st_size
+
+
+def spill_by_district(yearly_csv: Path, spill_dir: Path) -> tuple[dict[str, Path], int]:
+    """
+    Stream ``yearly_csv`` once, appending each row to its district's spill file.
+    Rows are buffered and flushed in batches so only one spill file is open at a time.
+    """
+    spill_paths: dict[str, Path] = {}
+    buffers: dict[str, list[list[str]]] = defaultdict(list)
+    buffered = 0
+    row_count = 0
+
+    def flush() -> None:
+        for district_id, rows in buffers.items():
+            path = spill_paths.setdefault(district_id, spill_dir / f"{len(spill_paths):05d}.csv")
+            with path.open("a", encoding="utf-8", newline="") as handle:
+                csv.writer(handle).writerows(rows)
+        buffers.clear()
+
+    with gzip.open(yearly_csv, "rt", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        district_position = header.index("district_id")
+        positions = [header.index(column) for column in SPILL_COLUMNS]
+        for row in reader:
+            buffers[row[district_position]].append([row[position] for position in positions])
+            buffered += 1
+            row_count += 1
+            if buffered >= SPILL_BUFFER_ROWS:
+                flush()
+                buffered = 0
+                print(f"  read {row_count:,} rows", file=sys.stderr, flush=True)
+    flush()
+    return spill_paths, row_count
+
+
+def build_district_file(district_id: str, spill_path: Path, output_dir: Path) -> int:
+    """Build one district's payload from its spill file and write it; returns the bytes written."""
+    per_district = new_district_points()
+    district_names: dict[str, str] = {}
+    with spill_path.open("r", encoding="utf-8", newline="") as handle:
+        for values in csv.reader(handle):
+            row = dict(zip(SPILL_COLUMNS, values))
+            row["district_id"] = district_id
+            add_row(per_district, district_names, row)
+
+    payload: dict = {
+        "district_id": district_id,
+        "district_name": district_names[district_id],
+        "variables": {
+            variable: variable_series(scenarios) for variable, scenarios in per_district[district_id].items()
+        },
+    }
+    return write_district_file(output_dir / f"{district_id}.json.gz", payload)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pre-compute per-district yearly timeseries JSON files.")
+    parser.add_argument("--input", type=Path, default=YEARLY_CSV)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = one per CPU core).")
+    return parser.parse_args()
 
 
 def main() -> None:
-    if not YEARLY_CSV.exists():
-        raise SystemExit(f"Missing input: {YEARLY_CSV}")
-
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    args = parse_args()
+    if not args.input.exists():
+        raise SystemExit(f"Missing input: {args.input}")
+
+    output_dir = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    # Next to the output, so spills land on the same disk rather than a possibly small /tmp.
+    spill_dir = Path(tempfile.mkdtemp(prefix=".timeseries_spill_", dir=output_dir.parent))
+
+    try:
+        print(f"Reading {args.input}...")
+        started = time.perf_counter()
+        spill_paths, row_count = spill_by_district(args.input, spill_dir)
+        read_seconds = time.perf_counter() - started
+
+        print(f"Found {len(spill_paths)} districts. Writing output on {jobs} processes...")
+        started = time.perf_counter()
+        district_ids = list(spill_paths)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            sizes = list(
+                pool.map(
+                    build_district_file,
+                    district_ids,
+                    [spill_paths[district_id] for district_id in district_ids],
+                    [output_dir] * len(district_ids),
+                )
+            )
+        write_seconds = time.perf_counter() - started
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
 
-    # district_id -> variable -> scenario -> year -> {p10, p50, p90, district_name, unit}
-    per_district: dict[str, dict[str, dict[str, dict[int, dict]]]] = defaultdict(
-        lambda: defaultdict(lambda: defaultdict(dict))
+    total_bytes = sum(sizes)
+    print(
+        f"Read {row_count:,} rows in {read_seconds:.1f}s "
+        f"({row_count / max(read_seconds, 1e-9):,.0f} rows/s)"
     )
-    district_names: dict[str, str] = {}
-
-    print(f"Reading {YEARLY_CSV}...")
-    with gzip.open(YEARLY_CSV, "rt", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        for i, row in enumerate(reader):
-            if i % 500_000 == 0:
-                print(f"  processed {i:,} rows")
-            district_id = row["district_id"]
-            district_names[district_id] = row["district_name"]
-            variable = row["variable"]
-            scenario = row["scenario"].lower()
-            percentile = row["percentile"].lower()
-            if percentile not in {"p10", "p50", "p90"}:
-                continue
-            try:
-                year = int(row["year"])
-                value = float(row["value"])
-            except (TypeError, ValueError):
-                continue
-            unit = row["unit"]
-            point = per_district[district_id][variable][scenario].setdefault(
-                year, {"year": year, "unit": unit}
-            )
-            point[percentile] = value
-
-    print(f"Found {len(per_district)} districts. Writing output...")
-
-    for district_id, variables in per_district.items():
-        payload: dict = {
-            "district_id": district_id,
-            "district_name": district_names[district_id],
-            "variables": {},
-        }
-        for variable, scenarios in variables.items():
-            payload["variables"][variable] = {}
-            for scenario, year_map in scenarios.items():
-                points = []
-                for year in sorted(year_map):
-                    p = year_map[year]
-                    if {"p10", "p50", "p90"}.issubset(p):
-                        points.append(
-                            {
-                                "year": year,
-                                "p10": p["p10"],
-                                "p50": p["p50"],
-                                "p90": p["p90"],
-                                "unit": p["unit"],
-                            }
-                        )
-                if points:
-                    payload["variables"][variable][scenario] = points
-
-        out_path = OUTPUT_DIR / f"{district_id}.json.gz"
-        with gzip.open(out_path, "wt", encoding="utf-8") as out:
-            json.dump(payload, out, separators=(",", ":"))
-
-    total_bytes = sum(p.stat().st_size for p in OUTPUT_DIR.glob("*.json.gz"))
     print(
-        f"Wrote {len(per_district)} files to {OUTPUT_DIR} "
-        f"({total_bytes / 1024 / 1024:.1f} MB total)"
+        f"Wrote {len(sizes)} files to {output_dir} "
+        f"({total_bytes / 1024 / 1024:.1f} MB total) in {write_seconds:.1f}s "
+        f"({len(sizes) / max(write_seconds, 1e-9):,.1f} files/s, "
+        f"{total_bytes / 1024 / 1024 / max(write_seconds, 1e-9):.1f} MB/s)"
     )
 
 
@@ -1,99 +1,277 @@
 """
-Create a simplified district GeoJSON for map rendering without mutating the
+Create simplified district GeoJSON for map rendering without mutating the
 existing full-detail runtime artifact.
 
+Several levels are written, one per zoom band the map serves (see
+MAP_LEVELS in app/services/real_climate.py):
+
+    national  whole-country view       districts_map_national.geojson
+    region    region-level zoom        districts_map_region.geojson
+    district  district-level zoom      districts_map.geojson
+
+With shapely >= 2.1 all districts are simplified together as one coverage, so
+a border shared by two districts is simplified once and both sides keep the
+same vertices (no gaps or overlaps between neighbours). Older shapely versions
+fall back to simplifying each district on its own.
+
+Levels are simplified in parallel worker processes, and coordinates are rounded
+as whole arrays. A cache in ``<cache-dir>/simplify_cache.json`` records, per
+output file, each feature's geometry hash and the hash of the file written: a
+level whose input and output file are unchanged is not rewritten, and in
+per-district mode only changed features are simplified again.
+A coverage is simplified as a whole, so any changed district re-runs its level.
+The importer calls ``build_map_levels`` after writing districts.geojson.
+
 Usage:
-    python backend/scripts/simplify_geojson.py
+    python backend/scripts/simplify_geojson.py [--jobs 0] [--full]
 
 Input:
     backend/app/data/processed/districts.geojson
 
 Output:
-    backend/app/data/processed/districts_map.geojson
+    backend/app/data/processed/districts_map*.geojson
 """
 
+import argparse
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
+    import numpy as np
+    import shapely
     from shapely.geometry import shape, mapping
-    from shapely.validation import make_valid
 except ImportError:
-    print("ERROR: shapely is required. Install with: pip install shapely")
+    print("ERROR: shapely>=2.0 is required. Install with: pip install shapely")
     raise SystemExit(1)
 
+try:
+    from shapely import coverage_is_valid, coverage_simplify
+except ImportError:  # shapely < 2.1: districts are simplified one at a time
+    coverage_is_valid = None
+    coverage_simplify = None
+
 TOLERANCE = 0.001  # ~110m at equator — good for choropleth display
 PRECISION = 5      # 5 decimal places ≈ 1.1m accuracy
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "app" / "data" / "processed"
 GEOJSON_PATH = DATA_DIR / "districts.geojson"
 SIMPLIFIED_PATH = DATA_DIR / "districts_map.geojson"
+# Shared with the importer; outside the deployed processed/ directory.
+CACHE_DIR = Path(__file__).resolve().parents[1] / ".import_cache"
 
+SIMPLIFY_CACHE_NAME = "simplify_cache.json"
+SIMPLIFY_CACHE_VERSION = 2
+# Features per worker task when districts are simplified individually.
+CHUNK_SIZE = 64
 
-def truncate_coords(coords, precision: int):
-    """Recursively truncate coordinate precision."""
-    if isinstance(coords[0], (int, float)):
-        return [round(c, precision) for c in coords]
-    return [truncate_coords(c, precision) for c in coords]
+# (level, tolerance in degrees, coordinate precision, output file name), lightest first.
+# Tolerances stay below one screen pixel at the highest zoom each level serves.
+LEVELS = (
+    ("national", 0.01, 3, "districts_map_national.geojson"),
+    ("region", 0.003, 4, "districts_map_region.geojson"),
+    ("district", TOLERANCE, PRECISION, SIMPLIFIED_PATH.name),
+)
 
 
-def simplify_feature(feature: dict) -> dict:
-    """Simplify a single GeoJSON feature's geometry."""
-    geom = shape(feature["geometry"])
+def geometry_hash(geometry: dict) -> str:
+    """Stable hash of a GeoJSON geometry, independent of key order."""
+    encoded = json.dumps(geometry, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
-    # Ensure valid geometry
-    if not geom.is_valid:
-        geom = make_valid(geom)
 
-    # Simplify with Douglas-Peucker, preserving topology
-    simplified = geom.simplify(TOLERANCE, preserve_topology=True)
+def file_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
-    # Convert back to GeoJSON and truncate precision
-    geojson_geom = mapping(simplified)
-    geojson_geom["coordinates"] = truncate_coords(
-        geojson_geom["coordinates"], PRECISION
-    )
 
-    return {
-        "type": feature["type"],
-        "properties": feature["properties"],
-        "geometry": geojson_geom,
-    }
+def properties_key(features: list[dict]) -> str:
+    encoded = json.dumps([feature.get("properties") for feature in features], sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
 
-def main():
-    if not GEOJSON_PATH.exists():
-        print(f"ERROR: {GEOJSON_PATH} not found")
-        raise SystemExit(1)
+def load_geometries(features: list[dict]) -> np.ndarray:
+    """Shapely geometries of ``features`` as an array, with invalid ones repaired in one vectorized call."""
+    geoms = np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+    return geoms
+
+
+def simplify_geometries(geoms: np.ndarray, tolerance: float, precision: int, coverage: bool) -> tuple[list[dict], str]:
+    """
+    Simplify ``geoms`` (as one coverage when ``coverage`` and it is a valid one)
+    and return GeoJSON geometries with rounded coordinates, plus the method used.
+    Runs in a worker process.
+    """
+    if coverage and coverage_simplify is not None and coverage_is_valid(geoms):
+        simplified, method = coverage_simplify(geoms, tolerance), "coverage"
+    else:
+        simplified, method = shapely.simplify(geoms, tolerance, preserve_topology=True), "per-district"
+    # Rounds every coordinate of every geometry as one array.
+    rounded = shapely.transform(simplified, lambda coords: np.round(coords, precision))
+    return [mapping(geom) for geom in rounded], method
+
+
+def load_simplify_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != SIMPLIFY_CACHE_VERSION:
+        return {}
+    return cache.get("outputs", {})
 
-    original_size = GEOJSON_PATH.stat().st_size
-    print(f"Original: {original_size / 1_000_000:.1f} MB")
 
-    # Load and simplify
-    with open(GEOJSON_PATH, "r", encoding="utf-8") as f:
+def write_json(path: Path, payload: dict) -> int:
+    """Write ``payload`` compactly and atomically; returns the file size."""
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(temporary, path)
+    return path.stat().st_size
+
+
+def previous_geometries(entry: dict | None, settings: dict, path: Path) -> dict[str, dict] | None:
+    """
+    Geometries of the last output of a level by input geometry hash, or ``None``
+    unless ``path`` is still the file written with ``settings`` (checked by hash).
+    """
+    if not entry or entry.get("settings") != settings:
+        return None
+    try:
+        raw = path.read_bytes()
+        if file_hash(raw) != entry.get("file_hash"):
+            return None
+        features = json.loads(raw)["features"]
+    except (OSError, ValueError, KeyError):
+        return None
+    hashes = entry.get("geometry_hashes", [])
+    if len(features) != len(hashes):
+        return None
+    return {digest: feature["geometry"] for digest, feature in zip(hashes, features)}
+
+
+def build_map_levels(
+    input_path: Path = GEOJSON_PATH,
+    output_dir: Path = DATA_DIR,
+    cache_dir: Path = CACHE_DIR,
+    jobs: int = 0,
+    full: bool = False,
+) -> list[dict]:
+    """Write every simplification level of ``input_path``; returns a summary per level."""
+    with open(input_path, "r", encoding="utf-8") as f:
         data = json.load(f)
+    features = data["features"]
+    hashes = [geometry_hash(feature["geometry"]) for feature in features]
+    features_key = properties_key(features)
+    cache_path = cache_dir / SIMPLIFY_CACHE_NAME
+    cache = {} if full else load_simplify_cache(cache_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    coverage = coverage_simplify is not None
+
+    # Work out, per level, which features need simplifying before starting any workers.
+    plans = []
+    for level, tolerance, precision, file_name in LEVELS:
+        # Keyed by the resolved output path: other --output-dir runs keep their own entries.
+        path = (output_dir / file_name).resolve()
+        settings = {"tolerance": tolerance, "precision": precision, "coverage": coverage}
+        entry = cache.get(str(path))
+        previous = previous_geometries(entry, settings, path)
+        if previous is not None and coverage and entry.get("geometry_hashes") != hashes:
+            previous = {}  # shared borders: one changed district re-simplifies the whole coverage
+        pending = [index for index, digest in enumerate(hashes) if digest not in (previous or {})]
+        unchanged = previous is not None and not pending and entry.get("features_key") == features_key
+        plans.append((level, tolerance, precision, path, settings, entry, previous or {}, pending, unchanged))
+
+    geoms = load_geometries(features) if any(plan[7] for plan in plans) else None
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for level, tolerance, precision, _, _, _, _, pending, _ in plans:
+            if not pending:
+                continue
+            if coverage:
+                chunks = [pending]
+            else:
+                chunks = [pending[start:start + CHUNK_SIZE] for start in range(0, len(pending), CHUNK_SIZE)]
+            futures[level] = [
+                (chunk, executor.submit(simplify_geometries, geoms[chunk], tolerance, precision, coverage))
+                for chunk in chunks
+            ]
 
-    original_count = len(data["features"])
-    print(f"Districts: {original_count}")
+        summary = []
+        new_cache = dict(cache)
+        for level, tolerance, _, path, settings, entry, previous, pending, unchanged in plans:
+            method = (entry or {}).get("method", "coverage" if coverage else "per-district")
+            geometries = [previous.get(digest) for digest in hashes]
+            for chunk, future in futures.get(level, []):
+                simplified, method = future.result()
+                for index, geometry in zip(chunk, simplified):
+                    geometries[index] = geometry
 
-    simplified_features = []
-    for i, feature in enumerate(data["features"]):
-        simplified_features.append(simplify_feature(feature))
-        if (i + 1) % 50 == 0:
-            print(f"  Simplified {i + 1}/{original_count} features...")
+            if unchanged:
+                size = path.stat().st_size
+                written_hash = entry["file_hash"]
+            else:
+                level_features = [
+                    {"type": feature["type"], "properties": feature["properties"], "geometry": geometry}
+                    for feature, geometry in zip(features, geometries)
+                ]
+                size = write_json(path, {**data, "features": level_features})
+                written_hash = file_hash(path.read_bytes())
+            new_cache[str(path)] = {
+                "level": level,
+                "settings": settings,
+                "method": method,
+                "features_key": features_key,
+                "geometry_hashes": hashes,
+                "file_hash": written_hash,
+            }
+            summary.append(
+                {
+                    "level": level,
+                    "file": path.name,
+                    "bytes": size,
+                    "tolerance": tolerance,
+                    "method": method,
+                    "simplified": len(pending),
+                    "written": not unchanged,
+                }
+            )
 
-    data["features"] = simplified_features
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    write_json(cache_path, {"version": SIMPLIFY_CACHE_VERSION, "outputs": new_cache})
+    return summary
 
-    # Write simplified GeoJSON (compact, no extra whitespace)
-    with open(SIMPLIFIED_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, separators=(",", ":"))
 
-    new_size = SIMPLIFIED_PATH.stat().st_size
-    reduction = (1 - new_size / original_size) * 100
-    print(f"\nSimplified: {new_size / 1_000_000:.1f} MB")
-    print(f"Reduction: {reduction:.0f}%")
-    print(f"Features: {len(data['features'])} (should be {original_count})")
-    print(f"Wrote {SIMPLIFIED_PATH}")
+def main():
+    parser = argparse.ArgumentParser(description="Write the simplified district map levels.")
+    parser.add_argument("--input", type=Path, default=GEOJSON_PATH)
+    parser.add_argument("--output-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = one per CPU core).")
+    parser.add_argument("--full", action="store_true", help=f"Ignore {SIMPLIFY_CACHE_NAME} and simplify everything.")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"ERROR: {args.input} not found")
+        raise SystemExit(1)
+
+    original_size = args.input.stat().st_size
+    print(f"Original: {original_size / 1_000_000:.1f} MB")
+    if coverage_simplify is None:
+        print("shapely < 2.1: simplifying districts individually (shared borders may not match)")
+
+    for level in build_map_levels(args.input, args.output_dir, args.cache_dir, args.jobs, args.full):
+        reduction = (1 - level["bytes"] / original_size) * 100
+        status = f"{level['simplified']} simplified" if level["written"] else "unchanged"
+        print(
+            f"{level['level']:>9}: {level['bytes'] / 1_000_000:.2f} MB ({reduction:.0f}% smaller, "
+            f"tolerance {level['tolerance']}, {level['method']}, {status}) -> {level['file']}"
+        )
 
 
 if __name__ == "__main__":